@@ -1,11 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.database.connection import get_database
+from app.database.connection import get_async_database
 from app.core.security import verify_token
-from app.users.models import User
+from app.users.cache import UserSnapshot, get_user_snapshot
 
 # Security scheme
 security = HTTPBearer()
@@ -13,8 +13,8 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_database)
-) -> User:
+    db: AsyncSession = Depends(get_async_database)
+) -> UserSnapshot:
     """
     Obtener usuario actual desde token JWT
     """
@@ -34,8 +34,8 @@ async def get_current_user(
     except Exception:
         raise credentials_exception
     
-    # Buscar usuario en la base de datos
-    user = db.query(User).filter(User.id == user_id).first()
+    # Buscar usuario (cache de snapshots, luego base de datos)
+    user = await get_user_snapshot(db, user_id)
     if user is None:
         raise credentials_exception
         
@@ -50,8 +50,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
     """
     Obtener usuario actual y verificar que esté activo
     """
@@ -64,8 +64,8 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
     """
     Obtener usuario actual y verificar que sea admin
     """
@@ -79,8 +79,8 @@ async def get_current_admin_user(
 
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_database)
-) -> Optional[User]:
+    db: AsyncSession = Depends(get_async_database)
+) -> Optional[UserSnapshot]:
     """
     Obtener usuario actual opcional (sin requerir autenticación)
     """
@@ -93,7 +93,7 @@ async def get_optional_current_user(
         if user_id is None:
             return None
             
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await get_user_snapshot(db, user_id)
         return user if user and user.is_active else None
         
     except Exception:
@@ -104,7 +104,7 @@ def require_roles(*allowed_roles: str):
     """
     Decorator para requerir roles específicos
     """
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    def role_checker(current_user: UserSnapshot = Depends(get_current_user)) -> UserSnapshot:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
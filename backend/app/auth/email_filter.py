@@ -0,0 +1,152 @@
+# backend/app/auth/email_filter.py
+"""
+Filtro de Bloom de emails registrados.
+
+Permite rechazar un login con email desconocido sin consultar la base de
+datos: si el filtro dice que el email no existe, es seguro (sin falsos
+negativos); si dice que puede existir, se consulta la tabla como siempre.
+
+El filtro se carga completo al iniciar y luego se actualiza de forma
+incremental: los usuarios creados en este proceso se agregan al
+insertarlos y los creados por otros procesos se leen cada
+`EMAIL_FILTER_REFRESH_SECONDS` (por `created_at`). `created_at` se fija
+al hacer flush, no al hacer commit: cada recarga vuelve a leer
+`EMAIL_FILTER_REFRESH_OVERLAP_SECONDS` hacia atrás para no perder
+usuarios cuyo commit llegó después de otros más nuevos. Los emails
+eliminados quedan como falsos positivos hasta la siguiente reconstrucción
+completa, que ocurre cuando el filtro supera su capacidad.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+import asyncio
+import hashlib
+import logging
+import math
+import os
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.connection import AsyncSessionLocal
+from app.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre un bytearray (doble hashing con BLAKE2b)"""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        # Clave aleatoria por proceso: los falsos positivos no son predecibles desde afuera
+        self._key = os.urandom(16)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16, key=self._key).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str) -> bool:
+        """Agregar un valor; retorna False si ya estaba (no cuenta para la capacidad)"""
+        added = False
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class KnownEmailFilter:
+    """Emails registrados (filtro de Bloom) con recarga incremental"""
+
+    def __init__(self, false_positive_rate: float, min_capacity: int):
+        self.false_positive_rate = false_positive_rate
+        self.min_capacity = min_capacity
+        self._filter: Optional[BloomFilter] = None
+        self._watermark: Optional[datetime] = None  # Mayor created_at ya cargado
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_exist(self, email: str) -> bool:
+        """False solo si el email seguro no está registrado (sin filtro cargado: True)"""
+        if self._filter is None:
+            return True
+        return email.lower() in self._filter
+
+    def add(self, email: str) -> None:
+        """Agregar un email recién creado en este proceso"""
+        if self._filter is not None:
+            self._filter.add(email.lower())
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Cargar los usuarios nuevos (o reconstruir si superó su capacidad); retorna cuántos se leyeron"""
+        async with self._lock:
+            bloom = self._filter
+            if bloom is None or bloom.count > bloom.capacity:
+                total = (await db.execute(select(func.count(User.id)))).scalar_one()
+                bloom = BloomFilter(max(self.min_capacity, total * 2), self.false_positive_rate)
+                watermark = None
+            else:
+                watermark = self._watermark
+
+            statement = select(User.email, User.created_at)
+            if watermark is not None:
+                # Releer hacia atrás: un usuario con created_at anterior al
+                # último leído pudo hacer commit después (los ya cargados
+                # no vuelven a contar)
+                overlap = timedelta(seconds=settings.EMAIL_FILTER_REFRESH_OVERLAP_SECONDS)
+                statement = statement.where(User.created_at >= watermark - overlap)
+
+            loaded = 0
+            result = await db.stream(statement.execution_options(yield_per=5000))
+            async for email, created_at in result:
+                bloom.add(email.lower())
+                if watermark is None or created_at > watermark:
+                    watermark = created_at
+                loaded += 1
+
+            rebuilt = bloom is not self._filter
+            self._filter, self._watermark = bloom, watermark
+            if rebuilt:
+                logger.info(
+                    "Filtro de emails cargado",
+                    extra={"emails": loaded, "capacity": bloom.capacity, "bytes": len(bloom._bits)}
+                )
+            return loaded
+
+
+known_email_filter = KnownEmailFilter(
+    false_positive_rate=settings.EMAIL_FILTER_FALSE_POSITIVE_RATE,
+    min_capacity=settings.EMAIL_FILTER_MIN_CAPACITY
+)
+
+
+@event.listens_for(User, "after_insert")
+def _user_after_insert(mapper, connection, target: User) -> None:
+    known_email_filter.add(target.email)
+
+
+async def run_email_filter_refresh() -> None:
+    """Carga inicial y recarga periódica del filtro (lifespan)"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await known_email_filter.refresh(db)
+        except Exception:
+            logger.exception("Error actualizando el filtro de emails")
+        await asyncio.sleep(settings.EMAIL_FILTER_REFRESH_SECONDS)
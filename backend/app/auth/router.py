@@ -1,44 +1,87 @@
 # backend/app/auth/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import get_database
+from app.database.connection import get_async_database
 from app.auth.service import AuthService
 from app.auth.schemas import LoginRequest, LoginResponse, UserResponse
-from app.auth.dependencies import get_current_user
-from app.users.models import User
+from app.auth.dependencies import get_current_user, get_current_admin_user
+from app.core.metrics import LOGIN_ATTEMPTS
+from app.core.rate_limit import LOGIN_PER_EMAIL, LOGIN_PER_IP, rate_limiter
+from app.core.security import PasswordHasherBusy, token_cache
+from app.core.serialization import FastJSONResponse, PreEncodedJSONResponse
+from app.users.cache import UserSnapshot, user_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+async def check_login_rate_limit(request: Request, login_data: LoginRequest) -> None:
+    """
+    Rechazar con 429 antes de consultar la base de datos o ejecutar bcrypt
+    si la IP o la cuenta superaron los intentos permitidos.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = await rate_limiter.hit(LOGIN_PER_IP, client_ip)
+    if retry_after is None:
+        retry_after = await rate_limiter.hit(LOGIN_PER_EMAIL, login_data.email)
+    if retry_after is not None:
+        LOGIN_ATTEMPTS.inc("rate_limited")
+        logger.warning("Login bloqueado por rate limit", extra={"email": login_data.email, "client_ip": client_ip})
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos de inicio de sesión, intente más tarde",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
 @router.post("/login", response_model=LoginResponse)
 async def login(
+    request: Request,
     login_data: LoginRequest,  # ← Recibir datos del request
-    db: Session = Depends(get_database)
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Endpoint de login"""
+    await check_login_rate_limit(request, login_data)
     try:
         # Crear instancia del servicio
         auth_service = AuthService()
         
         # Llamar al método login con todos los parámetros necesarios
-        result = auth_service.login(
+        result = await auth_service.login(
             db=db, 
             login_data=login_data  # ← Pasar los datos recibidos
         )
         
         if not result:
+            LOGIN_ATTEMPTS.inc("invalid_credentials")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Credenciales incorrectas"
             )
         
-        return result
+        LOGIN_ATTEMPTS.inc("success")
+        # Los intentos fallidos previos de la cuenta ya no cuentan
+        await rate_limiter.reset(LOGIN_PER_EMAIL, login_data.email)
+        
+        # Serializar directo: LoginResponse ya viene armado por el servicio
+        return FastJSONResponse(dict(result))
         
     except HTTPException:
         # Re-lanzar HTTPExceptions
         raise
-    except Exception as e:
-        print(f"Error en login endpoint: {e}")
+    except PasswordHasherBusy:
+        # Cola de bcrypt llena: rechazar rápido para no afectar al resto de la API
+        LOGIN_ATTEMPTS.inc("busy")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servicio de autenticación ocupado, intente nuevamente",
+            headers={"Retry-After": "1"}
+        )
+    except Exception:
+        LOGIN_ATTEMPTS.inc("error")
+        logger.exception("Error en login endpoint")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error interno del servidor"
@@ -46,20 +89,21 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Obtener información del usuario actual"""
     try:
-        return UserResponse(**current_user.to_dict())
-    except Exception as e:
-        print(f"Error obteniendo usuario actual: {e}")
+        # JSON cacheado en el snapshot: sin dict -> modelo -> dict por request
+        return PreEncodedJSONResponse(current_user.to_json())
+    except Exception:
+        logger.exception("Error obteniendo usuario actual")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error obteniendo información del usuario"
         )
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: UserSnapshot = Depends(get_current_user)):
     """Endpoint de logout"""
     return {
         "message": "Logout exitoso",
@@ -68,27 +112,36 @@ async def logout(current_user: User = Depends(get_current_user)):
 
 @router.post("/refresh")
 async def refresh_token(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_database)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
 ):
     """Refrescar token de acceso"""
     try:
         auth_service = AuthService()
-        result = auth_service.refresh_token(db=db, user_id=current_user.id)
+        result = auth_service.refresh_token(db=db, user=current_user)
         
         if not result:
+            LOGIN_ATTEMPTS.inc("invalid_credentials")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="No se pudo refrescar el token"
             )
             
-        return result
+        return FastJSONResponse(dict(result))
         
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error refrescando token: {e}")
+    except Exception:
+        logger.exception("Error refrescando token")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error interno del servidor"
-        )
\ No newline at end of file
+        )
+
+@router.get("/cache-stats")
+async def get_cache_stats(current_user: UserSnapshot = Depends(get_current_admin_user)):
+    """Estadísticas de los caches de autenticación (solo admin)"""
+    return {
+        "tokenCache": token_cache.stats(),
+        "userCache": user_cache.stats()
+    }
@@ -3,6 +3,17 @@ from typing import Optional
 from datetime import datetime
 
 
+# Dominios de email institucionales aceptados
+ALLOWED_EMAIL_DOMAINS = ['@municipalidad.gob.cl', '@admin.cl']
+
+
+def validate_institutional_email(v: str) -> str:
+    """Validar que sea email institucional (retorna el email en minúsculas)"""
+    if not any(v.endswith(domain) for domain in ALLOWED_EMAIL_DOMAINS):
+        raise ValueError('Debe usar un email institucional')
+    return v.lower()
+
+
 class LoginRequest(BaseModel):
     """Schema para request de login"""
     email: EmailStr = Field(..., description="Email del usuario")
@@ -11,10 +22,7 @@ class LoginRequest(BaseModel):
     @validator('email')
     def validate_email_domain(cls, v):
         """Validar que sea email institucional"""
-        allowed_domains = ['@municipalidad.gob.cl', '@admin.cl']
-        if not any(v.endswith(domain) for domain in allowed_domains):
-            raise ValueError('Debe usar un email institucional')
-        return v.lower()
+        return validate_institutional_email(v)
 
 
 class LoginResponse(BaseModel):
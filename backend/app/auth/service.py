@@ -1,53 +1,92 @@
 # backend/app/auth/service.py
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Optional, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
+import logging
+import random
 
-from app.core.security import verify_password, create_access_token, get_password_hash
+from app.core.config import settings
+from app.core.security import (
+    verify_password_async,
+    dummy_verify_password_async,
+    create_access_token,
+    get_password_hash_async,
+    PasswordHasherBusy,
+)
 from app.users.models import User
+from app.users.cache import UserSnapshot, get_user_snapshot, cache_user, invalidate_user
 from app.auth.schemas import LoginRequest, LoginResponse
+from app.auth.email_filter import known_email_filter
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
     
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-        """Autenticar usuario con email y contraseña"""
+    async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+        """
+        Autenticar usuario con email y contraseña.
+
+        Todo rechazo cuesta una verificación bcrypt (real o ficticia), de
+        modo que el tiempo de respuesta no revela si el email existe.
+        """
         try:
+            # Email que seguro no existe: sin consultar la base de datos. Una
+            # fracción de los rechazos se verifica igual: si el filtro quedó
+            # atrasado, el usuario no queda bloqueado hasta la reconstrucción
+            filter_miss = settings.EMAIL_FILTER_ENABLED and not known_email_filter.might_exist(email)
+            if filter_miss and random.random() >= settings.EMAIL_FILTER_MISS_RECHECK_RATE:
+                await dummy_verify_password_async()
+                logger.info("Login rechazado: usuario no encontrado", extra={"email": email})
+                return None
+            
             # Buscar usuario por email (case insensitive)
-            user = db.query(User).filter(User.email == email.lower()).first()
+            result = await db.execute(select(User).where(User.email == email.lower()))
+            user = result.scalar_one_or_none()
+            
+            if user is not None and filter_miss:
+                logger.warning("Usuario ausente del filtro de emails", extra={"email": email})
+                known_email_filter.add(user.email)
             
             if not user:
-                print(f"Usuario no encontrado: {email}")
+                await dummy_verify_password_async()
+                logger.info("Login rechazado: usuario no encontrado", extra={"email": email})
                 return None
                 
             if not user.is_active:
-                print(f"Usuario inactivo: {email}")
+                await dummy_verify_password_async()
+                logger.info("Login rechazado: usuario inactivo", extra={"email": email})
                 return None
                 
-            # Verificar contraseña
-            if not verify_password(password, user.password_hash):
-                print(f"Contraseña incorrecta para: {email}")
+            # Verificar contraseña (bcrypt en el executor dedicado)
+            if not await verify_password_async(password, user.password_hash):
+                logger.info("Login rechazado: contraseña incorrecta", extra={"email": email})
                 return None
                 
             # Actualizar último login
             user.last_login = datetime.utcnow()
-            db.commit()
+            await db.commit()
+            cache_user(user)
             
-            print(f"Usuario autenticado exitosamente: {email}")
+            logger.debug("Usuario autenticado", extra={"email": email})
             return user
             
-        except Exception as e:
-            print(f"Error en authenticate_user: {e}")
-            db.rollback()
+        except PasswordHasherBusy:
+            raise
+        except Exception:
+            logger.exception("Error en authenticate_user")
+            await db.rollback()
             return None
     
     @staticmethod
-    def create_login_response(user: User) -> LoginResponse:
+    def create_login_response(user: Union[User, UserSnapshot]) -> LoginResponse:
         """Crear respuesta de login con token JWT"""
         try:
             # Crear token JWT con datos del usuario
             token_data = {
+                "sub": user.id,
                 "user_id": user.id,
                 "email": user.email,
                 "role": user.role.value if user.role else "user"
@@ -55,56 +94,56 @@ class AuthService:
             
             access_token = create_access_token(data=token_data)
             
-            # Crear respuesta completa
-            return LoginResponse(
+            # Crear respuesta completa (campos ya válidos: sin re-validar)
+            return LoginResponse.model_construct(
                 access_token=access_token,
                 token_type="bearer",
                 expires_in=3600,  # 1 hora en segundos
                 user=user.to_dict()
             )
             
-        except Exception as e:
-            print(f"Error creando login response: {e}")
+        except Exception:
+            logger.exception("Error creando login response")
             raise Exception("Error interno creando token")
     
     @staticmethod
-    def login(db: Session, login_data: LoginRequest) -> Optional[LoginResponse]:
+    async def login(db: AsyncSession, login_data: LoginRequest) -> Optional[LoginResponse]:
         """Proceso completo de login"""
         try:
-            print(f"Intento de login para: {login_data.email}")
+            logger.debug("Intento de login", extra={"email": login_data.email})
             
             # Autenticar usuario
-            user = AuthService.authenticate_user(
+            user = await AuthService.authenticate_user(
                 db=db, 
                 email=login_data.email, 
                 password=login_data.password
             )
             
             if not user:
-                print("Autenticación fallida")
                 return None
                 
             # Crear respuesta con token
             response = AuthService.create_login_response(user)
-            print("Login exitoso")
+            logger.info("Login exitoso", extra={"user_id": user.id})
             return response
             
-        except Exception as e:
-            print(f"Error en proceso de login: {e}")
+        except PasswordHasherBusy:
+            raise
+        except Exception:
+            logger.exception("Error en proceso de login")
             return None
     
     @staticmethod
-    def get_current_user(db: Session, user_id: str) -> Optional[User]:
+    async def get_current_user(db: AsyncSession, user_id: str) -> Optional[UserSnapshot]:
         """Obtener usuario actual por ID"""
         try:
-            user = db.query(User).filter(User.id == user_id).first()
-            return user
-        except Exception as e:
-            print(f"Error obteniendo usuario actual: {e}")
+            return await get_user_snapshot(db, user_id)
+        except Exception:
+            logger.exception("Error obteniendo usuario actual")
             return None
     
     @staticmethod
-    def refresh_token(db: Session, user: User) -> Optional[LoginResponse]:
+    def refresh_token(db: AsyncSession, user: Union[User, UserSnapshot]) -> Optional[LoginResponse]:
         """Refrescar token de usuario"""
         try:
             if not user or not user.is_active:
@@ -112,26 +151,29 @@ class AuthService:
                 
             return AuthService.create_login_response(user)
             
-        except Exception as e:
-            print(f"Error refrescando token: {e}")
+        except Exception:
+            logger.exception("Error refrescando token")
             return None
     
     @staticmethod
-    def change_password(db: Session, user: User, current_password: str, new_password: str) -> bool:
+    async def change_password(db: AsyncSession, user: User, current_password: str, new_password: str) -> bool:
         """Cambiar contraseña del usuario"""
         try:
             # Verificar contraseña actual
-            if not verify_password(current_password, user.password_hash):
+            if not await verify_password_async(current_password, user.password_hash):
                 return False
             
             # Actualizar con nueva contraseña
-            user.password_hash = get_password_hash(new_password)
-            db.commit()
+            user.password_hash = await get_password_hash_async(new_password)
+            await db.commit()
+            invalidate_user(user.id)
             
-            print(f"Contraseña cambiada para usuario: {user.email}")
+            logger.info("Contraseña cambiada", extra={"user_id": user.id})
             return True
             
-        except Exception as e:
-            print(f"Error cambiando contraseña: {e}")
-            db.rollback()
+        except PasswordHasherBusy:
+            raise
+        except Exception:
+            logger.exception("Error cambiando contraseña")
+            await db.rollback()
             return False
\ No newline at end of file
@@ -0,0 +1,86 @@
+# backend/app/core/cache.py
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+import threading
+import time
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Cache LRU acotado en memoria con expiración por entrada.
+
+    Cada entrada guarda su instante de expiración (epoch en segundos);
+    las entradas vencidas se descartan al leerlas y, cuando se alcanza
+    el tamaño máximo, se expulsa la menos usada recientemente.
+    """
+
+    def __init__(self, max_size: int, default_ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Obtener valor vigente o None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, expires_at: Optional[float] = None) -> None:
+        """Guardar valor hasta `expires_at` (o según el TTL por defecto)"""
+        if expires_at is None:
+            if self.default_ttl is None:
+                raise ValueError("Se requiere expires_at o un TTL por defecto")
+            expires_at = time.time() + self.default_ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Invalidar una entrada"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vaciar el cache"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso del cache"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hitRate": round(self.hits / total, 4) if total else 0.0,
+        }
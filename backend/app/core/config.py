@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
 
 
 class Settings(BaseSettings):
@@ -14,11 +15,56 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str
+    DB_DIALECT: str = "mysql"  # "mysql" o "sqlite" (sustituto local para pruebas)
+    DB_ASYNC_DRIVER: str = "aiomysql"  # "aiomysql" o "asyncmy"
+    SQLITE_PATH: str = "intranet.db"
+    DB_ECHO: bool = False  # Loguear cada query SQL (solo para depuración puntual)
+    DB_POOL_SIZE: int = 10  # Conexiones persistentes por proceso
+    DB_MAX_OVERFLOW: int = 20  # Conexiones adicionales por proceso en picos
+    DB_CONNECTION_BUDGET: int = 0  # Conexiones máximas de la API entre todos los workers (0 = sin tope global)
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # Espera máxima por una conexión libre antes de error
+    DB_POOL_RECYCLE_SECONDS: int = 3600  # Reabrir conexiones más antiguas (menor que wait_timeout de MySQL)
+    DB_POOL_PRE_PING: bool = True  # SELECT 1 en cada checkout (una ida y vuelta más por request)
+    DB_POOL_LIVENESS_PROBE_SECONDS: float = 15.0  # Sin pre-ping: intervalo del sondeo en segundo plano (0 = ninguno)
+    AUTO_CREATE_TABLES: bool = False  # Solo desarrollo: create_all al iniciar en lugar de migraciones
+    SCHEMA_CHECK_ENABLED: bool = True  # Verificar al iniciar que la base tenga la última migración
     
     # JWT Configuration
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 horas
+    TOKEN_CACHE_MAX_SIZE: int = 10000  # Tokens verificados en memoria (LRU)
+    
+    # Cache de usuarios autenticados
+    USER_CACHE_MAX_SIZE: int = 5000
+    USER_CACHE_TTL_SECONDS: int = 30  # Staleness máxima en otros workers (p. ej. cuentas desactivadas, departamento renombrado)
+    
+    # Password hashing (bcrypt fuera del event loop)
+    PASSWORD_HASH_WORKERS: int = 4  # Hilos dedicados a bcrypt
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32  # Operaciones en espera antes de responder 503
+    
+    # Rate limiting de login (ventana deslizante)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (por proceso) o "database" (compartido entre procesos)
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100000  # Claves en memoria antes de descartar las más antiguas
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 300
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5  # Intentos por cuenta en la ventana (un login exitoso reinicia)
+    LOGIN_RATE_LIMIT_PER_IP: int = 50  # Intentos por IP en la ventana (oficinas detrás de un mismo NAT)
+    
+    # Filtro de emails conocidos (rechazo de logins sin consultar la base de datos)
+    EMAIL_FILTER_ENABLED: bool = True
+    EMAIL_FILTER_REFRESH_SECONDS: int = 30  # Usuarios creados por otros procesos tardan esto en poder ingresar
+    EMAIL_FILTER_FALSE_POSITIVE_RATE: float = 0.01
+    EMAIL_FILTER_MIN_CAPACITY: int = 10000
+    EMAIL_FILTER_REFRESH_OVERLAP_SECONDS: int = 300  # Relectura hacia atrás: usuarios con commit posterior a su created_at
+    EMAIL_FILTER_MISS_RECHECK_RATE: float = 0.05  # Fracción de rechazos del filtro que igual se verifican en la base
+    
+    # Servidor de producción (run_production.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # Procesos de la API (0 = número de CPUs)
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 60  # Espera a requests en curso (uploads) al detener
+    SERVER_BACKLOG: int = 2048
     
     # CORS Configuration
     ALLOWED_ORIGINS: List[str] = [
@@ -27,14 +73,79 @@ class Settings(BaseSettings):
         "http://127.0.0.1:3000"
     ]
     
+    # Logging Configuration
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {  # Niveles por módulo
+        "sqlalchemy.engine": "WARNING",
+        "uvicorn.access": "WARNING",
+    }
+    LOG_JSON: bool = False  # Una línea JSON por registro
+    LOG_SAMPLE_INTERVAL_SECONDS: float = 10.0  # Muestreo de eventos frecuentes
+
+    # Métricas (/metrics, formato Prometheus)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None  # Si se define, /metrics exige "Authorization: Bearer <token>"
+
+    # Verificación de disponibilidad (/api/health/ready)
+    HEALTH_CACHE_SECONDS: float = 2.0  # Reutilizar el resultado entre probes de balanceadores
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0  # Por dependencia
+    HEALTH_MIN_FREE_DISK_MB: int = 1024  # Bajo esto el disco de uploads se reporta con error
+    
     # Upload Configuration
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 52428800  # 50MB
-    
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB por escritura a disco
+    BATCH_UPLOAD_MAX_FILES: int = 20  # Archivos por request de upload en lote
+    RESUMABLE_CHUNK_SIZE: int = 5242880  # Tamaño de chunk sugerido a los clientes (5MB)
+    RESUMABLE_UPLOAD_TTL_SECONDS: int = 86400  # Sesiones sin actividad se eliminan tras 24h
+    RESUMABLE_UPLOAD_GC_INTERVAL_SECONDS: int = 3600
+    RESUMABLE_MAX_SESSIONS_PER_USER: int = 10  # Sesiones abiertas simultáneas por usuario
+    RESUMABLE_MAX_RANGES: int = 256  # Rangos no contiguos registrados por sesión
+    RESUMABLE_WRITE_LEASE_SECONDS: int = 300  # Un PATCH sin escribir por este tiempo deja de bloquear `complete`
+
+    # Departamentos
+    DEPARTMENT_COUNT_RECONCILE_INTERVAL_SECONDS: int = 86400  # 0 = sin reconciliación periódica
+    DEPARTMENT_CACHE_CHECK_SECONDS: float = 5.0  # Verificación de cambios del directorio en memoria
+
+    # Trabajos en segundo plano (extracción de texto y miniaturas)
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 2  # Procesos para trabajo CPU-intensivo
+    JOB_CONCURRENCY: int = 4  # Trabajos en ejecución simultánea por proceso de la API
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 30  # Base del backoff exponencial entre reintentos
+    JOB_POLL_INTERVAL_SECONDS: float = 5.0  # Sondeo de la cola cuando no hay avisos locales
+    JOB_LOCK_TIMEOUT_SECONDS: int = 600  # Trabajos "running" más antiguos se consideran huérfanos
+    JOB_TASK_TIMEOUT_SECONDS: float = 300  # Máximo por tarea del pool de procesos (menor que JOB_LOCK_TIMEOUT_SECONDS)
+    THUMBNAIL_SIZE: int = 256  # Lado máximo de la miniatura en píxeles
+    MAX_EXTRACTED_TEXT_CHARS: int = 1000000  # Texto indexado por documento
+
+    # Importación masiva de usuarios (CSV)
+    USER_IMPORT_BATCH_SIZE: int = 500  # Filas por INSERT / commit
+    USER_IMPORT_HASH_WORKERS: int = 0  # Procesos para bcrypt (0 = número de CPUs)
+    USER_IMPORT_MAX_ROWS: int = 50000  # Filas por archivo; el resto no se procesa
+
+    # Avatares de usuario
+    AVATAR_MAX_FILE_SIZE: int = 5242880  # 5MB por imagen subida
+    AVATAR_MAX_DIMENSION: int = 512  # Lado máximo de la imagen almacenada
+    AVATAR_SIZES: List[int] = [32, 64, 128, 256, 512]  # Tamaños servidos (cache en disco)
+
     @property
     def DATABASE_URL(self) -> str:
-        """Construir URL de conexión a la base de datos"""
-        return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        """Construir URL de conexión a la base de datos (driver síncrono)"""
+        return self._build_database_url(mysql_driver="pymysql", sqlite_driver=None)
+    
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Construir URL de conexión a la base de datos (driver asíncrono)"""
+        return self._build_database_url(mysql_driver=self.DB_ASYNC_DRIVER, sqlite_driver="aiosqlite")
+    
+    def _build_database_url(self, mysql_driver: str, sqlite_driver: Optional[str]) -> str:
+        if self.DB_DIALECT == "sqlite":
+            scheme = f"sqlite+{sqlite_driver}" if sqlite_driver else "sqlite"
+            return f"{scheme}:///{self.SQLITE_PATH}"
+        # La contraseña puede contener caracteres reservados de URL (?, <, |)
+        password = quote_plus(self.DB_PASSWORD)
+        return f"mysql+{mysql_driver}://{self.DB_USER}:{password}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,158 @@
+# backend/app/core/health.py
+"""
+Verificación de disponibilidad (readiness) de la API.
+
+Comprueba en paralelo y sin bloquear el event loop:
+- base de datos: `SELECT 1` con el engine asíncrono,
+- directorio de uploads: escritura y borrado de un archivo temporal,
+- espacio libre en el disco de uploads.
+
+El endpoint no requiere autenticación: una falla se informa como "error"
+(o con el mensaje de `CheckFailed`, pensado para publicarse) y el detalle
+de la excepción solo queda en el log.
+
+El resultado se reutiliza durante `HEALTH_CACHE_SECONDS` y las consultas
+simultáneas esperan la misma verificación en curso: los probes de varios
+balanceadores cuestan a lo más una ida y vuelta a la base por intervalo.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logging_config import SampledLogger
+from app.database.connection import async_engine
+from app.documents.storage import document_storage
+
+logger = logging.getLogger(__name__)
+sampled_logger = SampledLogger(logger, interval=settings.LOG_SAMPLE_INTERVAL_SECONDS)
+
+
+class CheckFailed(Exception):
+    """Falla de una verificación cuyo mensaje se puede mostrar en la respuesta"""
+
+
+@dataclass
+class CheckResult:
+    """Resultado de la verificación de una dependencia"""
+    ok: bool
+    latency_ms: float
+    error: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        data = {"status": "ok" if self.ok else "error", "latencyMs": self.latency_ms}
+        if self.error is not None:
+            data["error"] = self.error
+        data.update(self.details)
+        return data
+
+
+@dataclass
+class ReadinessReport:
+    """Resultado de todas las verificaciones"""
+    checks: Dict[str, CheckResult]
+    checked_at: float  # time.time() de la verificación
+
+    @property
+    def ready(self) -> bool:
+        return all(check.ok for check in self.checks.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "checkedAt": self.checked_at,
+            "ageSeconds": round(time.time() - self.checked_at, 3),
+            "checks": {name: check.to_dict() for name, check in self.checks.items()},
+        }
+
+
+async def check_database() -> Dict[str, Any]:
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return {}
+
+
+def _check_upload_dir_sync() -> Dict[str, Any]:
+    # Mismo directorio donde se escriben los uploads en curso
+    with tempfile.NamedTemporaryFile(dir=document_storage.temp_dir, prefix=".health-") as probe:
+        probe.write(b"ok")
+        probe.flush()
+    return {}
+
+
+async def check_upload_dir() -> Dict[str, Any]:
+    return await asyncio.to_thread(_check_upload_dir_sync)
+
+
+async def check_disk_space() -> Dict[str, Any]:
+    usage = await asyncio.to_thread(shutil.disk_usage, document_storage.root)
+    free_mb = usage.free // (1024 * 1024)
+    if free_mb < settings.HEALTH_MIN_FREE_DISK_MB:
+        raise CheckFailed(f"Espacio libre bajo el mínimo ({settings.HEALTH_MIN_FREE_DISK_MB} MB)")
+    return {"freeMb": free_mb, "freePercent": round(usage.free / usage.total * 100, 1)}
+
+
+class ReadinessChecker:
+    """Verificaciones con cache de corta duración y una sola ejecución a la vez"""
+
+    def __init__(self, checks: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]], cache_seconds: float, timeout: float):
+        self.checks = checks
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self._report: Optional[ReadinessReport] = None
+        self._expires_at = 0.0
+        self._running: Optional[asyncio.Task] = None
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable[Dict[str, Any]]]) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), timeout=self.timeout)
+            ok, error = True, None
+        except asyncio.TimeoutError:
+            details, ok, error = {}, False, f"Sin respuesta en {self.timeout} s"
+            # Con una dependencia caída esto ocurre en cada verificación: muestreado
+            sampled_logger.warning(f"health_{name}", "Verificación de salud fallida (%s): %s", name, error)
+        except CheckFailed as e:
+            details, ok, error = {}, False, str(e)
+            sampled_logger.warning(f"health_{name}", "Verificación de salud fallida (%s): %s", name, error)
+        except Exception:
+            # El detalle (host, rutas, credenciales) solo va al log
+            details, ok, error = {}, False, "error"
+            sampled_logger.warning(f"health_{name}", "Verificación de salud fallida (%s)", name, exc_info=True)
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        return CheckResult(ok=ok, latency_ms=latency_ms, error=error, details=details)
+
+    async def _run_all(self) -> ReadinessReport:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name, self.checks[name]) for name in names))
+        report = ReadinessReport(checks=dict(zip(names, results)), checked_at=time.time())
+        self._report = report
+        self._expires_at = time.monotonic() + self.cache_seconds
+        return report
+
+    async def check(self) -> ReadinessReport:
+        """Último resultado vigente o una verificación nueva (compartida)"""
+        if self._report is not None and time.monotonic() < self._expires_at:
+            return self._report
+        if self._running is None or self._running.done():
+            self._running = asyncio.create_task(self._run_all())
+        # shield: si un cliente se desconecta no se cancela la verificación de los demás
+        return await asyncio.shield(self._running)
+
+
+readiness_checker = ReadinessChecker(
+    checks={
+        "database": check_database,
+        "uploads": check_upload_dir,
+        "disk": check_disk_space,
+    },
+    cache_seconds=settings.HEALTH_CACHE_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS
+)
@@ -0,0 +1,144 @@
+# backend/app/core/logging_config.py
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+from app.core.config import settings
+
+# Atributos estándar de LogRecord (todo lo demás se considera campo estructurado)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formatea registros como texto `clave=valor` o JSON por línea"""
+
+    def __init__(self, as_json: bool = False):
+        super().__init__()
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {
+            key: value for key, value in vars(record).items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        }
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+
+        if self.as_json:
+            entry = {
+                "ts": f"{timestamp}.{int(record.msecs):03d}Z",
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields,
+            }
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str, ensure_ascii=False)
+
+        line = f"{timestamp} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def setup_logging() -> None:
+    """
+    Configurar logging de la aplicación.
+
+    Los registros se encolan desde el hilo que loguea (QueueHandler) y un
+    hilo de fondo (QueueListener) los escribe en stdout, de modo que los
+    requests nunca esperan por I/O de la consola.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(StructuredFormatter(as_json=settings.LOG_JSON))
+
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    # uvicorn instala sus propios handlers; se redirigen a la cola
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers[:] = []
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork() -> None:
+    # El hilo del QueueListener no existe en un proceso hijo (fork): crear
+    # cola y listener propios para que sus registros se escriban
+    global _listener
+    if _listener is not None:
+        _listener = None
+        setup_logging()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def shutdown_logging() -> None:
+    """Vaciar la cola, detener el hilo de escritura y volver a escribir directo"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        # Sin el listener la cola ya no se lee: los registros posteriores
+        # (p. ej. al terminar el proceso) van directo a la salida
+        logging.getLogger().handlers[:] = list(_listener.handlers)
+        _listener = None
+
+
+class SampledLogger:
+    """
+    Logger muestreado para eventos de alta frecuencia.
+
+    Emite como máximo un registro por clave cada `interval` segundos e
+    informa cuántos se omitieron desde el último emitido.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float):
+        self.logger = logger
+        self.interval = interval
+        self._last_emit: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, msg: str, *args, exc_info: bool = False) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_emit.get(key)
+            if last is not None and now - last < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return
+            self._last_emit[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+
+        self.logger.log(level, msg, *args, exc_info=exc_info, extra={"event": key, "suppressed": suppressed})
+
+    def warning(self, key: str, msg: str, *args, exc_info: bool = False) -> None:
+        self.log(logging.WARNING, key, msg, *args, exc_info=exc_info)
+
+    def info(self, key: str, msg: str, *args) -> None:
+        self.log(logging.INFO, key, msg, *args)
@@ -0,0 +1,326 @@
+# backend/app/core/metrics.py
+"""
+Métricas en formato de texto de Prometheus.
+
+Registro mínimo en memoria (contadores, gauges e histogramas con labels),
+sin dependencias externas. Cada métrica guarda sus series en un dict por
+tupla de labels protegido por un lock propio: registrar una observación
+cuesta un acceso a dict y, en histogramas, una búsqueda binaria.
+
+`MetricsMiddleware` registra las métricas HTTP; los componentes agregan
+las suyas (login, bcrypt, tokens, caches, pool de conexiones).
+
+Las métricas son por proceso. Con varios workers (run_production.py)
+cada scrape responde un worker cualquiera, por lo que todas las series
+llevan el label `worker` (pid): así los contadores de cada proceso siguen
+siendo monótonos y se suman en la consulta (`sum by (...)`).
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+import os
+import threading
+import time
+
+LabelValues = Tuple[str, ...]
+
+# Buckets por defecto (segundos): de 5 ms a 10 s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric(ABC):
+    """Base: nombre, descripción, tipo y nombres de labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, LabelValues, Sequence[str], float]]:
+        """(nombre, valores de labels, nombres de labels extra, valor) de cada serie"""
+
+    def render(self, worker: str) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, values, extra_names, value in self.samples():
+            labels = _format_labels(("worker",) + self.labelnames + tuple(extra_names), (worker,) + tuple(values))
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Valor que solo aumenta"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, values, (), value) for values, value in items]
+
+
+class Gauge(Metric):
+    """Valor que sube y baja"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, values, (), value) for values, value in items]
+
+
+class Histogram(Metric):
+    """Distribución de observaciones en buckets acumulativos"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [conteo por bucket (no acumulado, último = +Inf), suma]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(values, list(counts), total[0]) for values, (counts, total) in self._series.items()]
+        result = []
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for values, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                result.append((f"{self.name}_bucket", values + (bound,), ("le",), cumulative))
+            result.append((f"{self.name}_sum", values, (), total))
+            result.append((f"{self.name}_count", values, (), cumulative))
+        return result
+
+
+class CallbackMetric(Metric):
+    """
+    Métrica leída al momento del scrape desde otro componente (p. ej.
+    contadores de un cache o del pool de conexiones).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]]
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def samples(self):
+        return [(self.name, tuple(values), (), value) for values, value in self.callback()]
+
+
+class Registry:
+    """Conjunto de métricas exportadas por /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]]
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, kind, labelnames, callback))
+
+    def render(self) -> str:
+        """Exposición en formato de texto 0.0.4"""
+        worker = str(os.getpid())
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render(worker))
+        lines.append("")
+        return "\n".join(lines)
+
+
+registry = Registry()
+
+_process_start_time = time.time()
+_caches: Dict[str, Any] = {}  # nombre -> cache con stats() (TTLCache)
+
+
+def _reset_after_fork() -> None:
+    # Cada worker reporta su propio inicio
+    global _process_start_time
+    _process_start_time = time.time()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Exportar los contadores de un cache (`stats()` de TTLCache)"""
+    _caches[name] = cache
+
+
+def _cache_stat(key: str) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    return lambda: [((name,), cache.stats()[key]) for name, cache in _caches.items()]
+
+
+registry.callback(
+    "process_start_time_seconds", "Inicio del proceso (epoch)", "gauge", (),
+    lambda: [((), _process_start_time)]
+)
+registry.callback("cache_hits_total", "Lecturas encontradas en cache", "counter", ("cache",), _cache_stat("hits"))
+registry.callback("cache_misses_total", "Lecturas no encontradas en cache", "counter", ("cache",), _cache_stat("misses"))
+registry.callback("cache_evictions_total", "Entradas expulsadas por tamaño", "counter", ("cache",), _cache_stat("evictions"))
+registry.callback("cache_entries", "Entradas en cache", "gauge", ("cache",), _cache_stat("size"))
+
+# Métricas de dominio
+LOGIN_ATTEMPTS = registry.counter(
+    "auth_login_attempts_total", "Intentos de login por resultado", ("result",)
+)
+PASSWORD_HASH_SECONDS = registry.histogram(
+    "auth_password_hash_seconds", "Duración de operaciones bcrypt", ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+TOKEN_VERIFICATIONS = registry.counter(
+    "auth_token_verifications_total", "Verificaciones de tokens JWT por resultado", ("result",)
+)
+
+# Métricas HTTP (MetricsMiddleware)
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Requests por ruta, método y código de estado", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Latencia de requests por ruta", ("method", "route")
+)
+HTTP_RESPONSE_BYTES = registry.histogram(
+    "http_response_size_bytes", "Tamaño del cuerpo de las respuestas por ruta", ("method", "route"),
+    buckets=BYTES_BUCKETS
+)
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "Requests en curso")
+
+# Label de rutas no encontradas (evita una serie por cada URL inexistente)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra conteo, latencia y tamaño de respuesta por
+    ruta. La ruta es la plantilla (`/api/documents/{document_id}`), que
+    Starlette deja en el scope tras el enrutamiento: la cardinalidad queda
+    acotada por el número de endpoints.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500  # Si la aplicación falla antes de responder
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, path, str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method, path)
+            HTTP_RESPONSE_BYTES.observe(size, method, path)
@@ -0,0 +1,135 @@
+# backend/app/core/pagination.py
+"""
+Paginación por cursor (keyset) sobre `(created_at, id)`.
+
+Cada página continúa donde terminó la anterior con
+`WHERE (created_at, id) < (cursor)` sobre un índice compuesto, así que
+el costo de una página no depende de su profundidad (a diferencia de
+OFFSET, que recorre y descarta todas las filas anteriores).
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import base64
+import binascii
+import json
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+
+class InvalidCursor(ValueError):
+    """Cursor malformado o de otro listado"""
+
+
+class InvalidFields(ValueError):
+    """Campos solicitados que el listado no ofrece"""
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Cursor opaco para continuar después de una fila"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Posición `(created_at, id)` codificada en un cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor()
+
+
+async def paginate(
+    db: AsyncSession,
+    statement: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Ejecutar una página de `statement` (más reciente primero).
+    Retorna las filas y el cursor de la página siguiente (None si es la última).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # El `created_at <= cursor` redundante acota el rango del índice
+        # (created_at, id); el OR solo desempata filas del mismo instante
+        statement = statement.where(
+            model.created_at <= created_at,
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id)
+            )
+        )
+
+    # Una fila extra indica si hay otra página sin COUNT(*)
+    result = await db.execute(
+        statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    )
+    rows = list(result.scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+@dataclass(frozen=True)
+class ListField:
+    """Campo de un listado: columnas que requiere y cómo obtener su valor"""
+    columns: Sequence[Any]
+    value: Callable[[Any], Any]
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def column_field(column: Any) -> ListField:
+    """Campo que expone una columna tal cual"""
+    return ListField((column,), lambda row: getattr(row, column.key))
+
+
+def datetime_field(column: Any) -> ListField:
+    """Campo de fecha serializado en ISO 8601"""
+    return ListField((column,), lambda row: _isoformat(getattr(row, column.key)))
+
+
+class FieldSelection:
+    """
+    Selección de campos (`?fields=id,email`) de un listado.
+
+    Solo se cargan de la base de datos las columnas de los campos pedidos
+    (`load_only`), de modo que columnas grandes fuera de la selección no
+    se leen ni se serializan.
+    """
+
+    def __init__(self, fields: Dict[str, ListField], default: Iterable[str], required: Sequence[Any]):
+        self.fields = fields
+        self.default = list(default)
+        self.required = list(required)  # Columnas siempre cargadas (p. ej. las del cursor)
+
+    def parse(self, requested: Optional[str]) -> List[str]:
+        """Campos solicitados, en el orden del listado"""
+        if not requested:
+            return self.default
+        names = {name.strip() for name in requested.split(",") if name.strip()}
+        unknown = names - self.fields.keys()
+        if unknown:
+            raise InvalidFields(f"Campos no disponibles: {', '.join(sorted(unknown))}")
+        return [name for name in self.fields if name in names]
+
+    def load_options(self, names: Iterable[str]) -> Any:
+        """Opción de carga con solo las columnas necesarias"""
+        columns = {column.key: column for column in self.required}
+        for name in names:
+            for column in self.fields[name].columns:
+                columns[column.key] = column
+        return load_only(*columns.values())
+
+    def serialize(self, row: Any, names: Iterable[str]) -> Dict[str, Any]:
+        """Diccionario con los campos seleccionados de una fila"""
+        return {name: self.fields[name].value(row) for name in names}
@@ -0,0 +1,226 @@
+# backend/app/core/rate_limit.py
+"""
+Rate limiting por ventana deslizante.
+
+Se usa el contador de ventana deslizante aproximado: por clave se guardan
+solo los intentos de la ventana fija actual y de la anterior, y la
+anterior se pondera por la fracción que aún se solapa con la ventana
+deslizante. Memoria y consultas O(1) por clave, sin guardar cada intento.
+
+Backends:
+- `MemoryRateLimitBackend`: en el proceso (límites por proceso de la API).
+- `DatabaseRateLimitBackend`: tabla `rate_limit_counters`, compartida entre
+  procesos y servidores.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+import logging
+import math
+import time
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.logging_config import SampledLogger
+from app.database.connection import AsyncSessionLocal
+from app.database.models import RateLimitCounter
+
+logger = logging.getLogger(__name__)
+sampled_logger = SampledLogger(logger, interval=settings.LOG_SAMPLE_INTERVAL_SECONDS)
+
+# Limpieza de ventanas vencidas en la tabla (como máximo cada N segundos)
+DATABASE_CLEANUP_INTERVAL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Regla: como máximo `limit` intentos por `window_seconds` y clave"""
+    scope: str
+    limit: int
+    window_seconds: int
+
+
+class RateLimitBackend:
+    """Almacenamiento de contadores por (clave, número de ventana)"""
+
+    async def counts(self, key: str, window: int) -> Tuple[int, int]:
+        """Intentos en la ventana anterior y en la actual"""
+        raise NotImplementedError
+
+    async def increment(self, key: str, window: int, window_seconds: int) -> None:
+        raise NotImplementedError
+
+    async def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Contadores en memoria del proceso.
+
+    Solo se accede desde el event loop (sin lock). El número de claves se
+    acota descartando las menos recientes.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # clave -> (número de ventana actual, intentos anterior, intentos actual)
+        self._data: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict()
+
+    def _current(self, key: str, window: int) -> Tuple[int, int]:
+        entry = self._data.get(key)
+        if entry is None:
+            return 0, 0
+        stored_window, previous, current = entry
+        if stored_window == window:
+            return previous, current
+        if stored_window == window - 1:
+            return current, 0
+        return 0, 0
+
+    async def counts(self, key: str, window: int) -> Tuple[int, int]:
+        return self._current(key, window)
+
+    async def increment(self, key: str, window: int, window_seconds: int) -> None:
+        previous, current = self._current(key, window)
+        self._data[key] = (window, previous, current + 1)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+
+    async def reset(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """
+    Contadores en la tabla `rate_limit_counters` (una fila por clave y
+    ventana). Usa su propia sesión, independiente de la del request.
+    """
+
+    def __init__(self):
+        self._next_cleanup = 0.0
+
+    async def counts(self, key: str, window: int) -> Tuple[int, int]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RateLimitCounter.window, RateLimitCounter.count)
+                .where(RateLimitCounter.key == key, RateLimitCounter.window.in_((window - 1, window)))
+            )
+            counts = dict(result.all())
+        return counts.get(window - 1, 0), counts.get(window, 0)
+
+    def _upsert(self, values: dict):
+        if settings.DB_DIALECT == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            statement = insert(RateLimitCounter).values(**values)
+            return statement.on_conflict_do_update(
+                index_elements=[RateLimitCounter.key, RateLimitCounter.window],
+                set_={"count": RateLimitCounter.count + 1}
+            )
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(RateLimitCounter).values(**values)
+        return statement.on_duplicate_key_update(count=RateLimitCounter.count + 1)
+
+    async def increment(self, key: str, window: int, window_seconds: int) -> None:
+        # La fila sirve hasta que deja de ser la ventana anterior
+        expires_at = datetime.utcfromtimestamp((window + 2) * window_seconds)
+        async with AsyncSessionLocal() as db:
+            await db.execute(self._upsert({"key": key, "window": window, "count": 1, "expires_at": expires_at}))
+            if time.monotonic() >= self._next_cleanup:
+                self._next_cleanup = time.monotonic() + DATABASE_CLEANUP_INTERVAL_SECONDS
+                await db.execute(delete(RateLimitCounter).where(RateLimitCounter.expires_at < datetime.utcnow()))
+            await db.commit()
+
+    async def reset(self, key: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RateLimitCounter).where(RateLimitCounter.key == key))
+            await db.commit()
+
+
+class RateLimiter:
+    """
+    Verificación y registro de intentos contra reglas `RateLimit`.
+
+    Si el backend falla se permite el intento (fail-open): un problema del
+    almacenamiento de contadores no debe impedir los logins.
+    """
+
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    @staticmethod
+    def _key(rule: RateLimit, identifier: str) -> str:
+        return f"{rule.scope}:{identifier}"
+
+    async def hit(self, rule: RateLimit, identifier: str, now: Optional[float] = None) -> Optional[int]:
+        """
+        Registrar un intento. Si la regla ya se alcanzó no se registra y se
+        retornan los segundos a esperar (para `Retry-After`); si no, None.
+        """
+        if not self.enabled:
+            return None
+        now = time.time() if now is None else now
+        key = self._key(rule, identifier)
+        window, offset = divmod(now, rule.window_seconds)
+        window = int(window)
+        try:
+            previous, current = await self.backend.counts(key, window)
+            retry_after = self._retry_after(rule, previous, current, offset)
+            if retry_after is None:
+                await self.backend.increment(key, window, rule.window_seconds)
+            return retry_after
+        except Exception:
+            sampled_logger.log(logging.ERROR, "rate_limit_backend", "Error en backend de rate limiting; se permite el intento")
+            return None
+
+    async def reset(self, rule: RateLimit, identifier: str) -> None:
+        """Olvidar los intentos de un identificador (p. ej. tras un login exitoso)"""
+        if not self.enabled:
+            return
+        try:
+            await self.backend.reset(self._key(rule, identifier))
+        except Exception:
+            sampled_logger.log(logging.ERROR, "rate_limit_backend", "Error en backend de rate limiting al reiniciar")
+
+    @staticmethod
+    def _retry_after(rule: RateLimit, previous: int, current: int, offset: float) -> Optional[int]:
+        """Segundos hasta que la estimación baje del límite, o None si hay cupo"""
+        size = rule.window_seconds
+        overlap = 1 - offset / size  # Fracción de la ventana anterior aún dentro de la deslizante
+        if previous * overlap + current < rule.limit:
+            return None
+
+        if current < rule.limit:
+            # Basta con que la ventana anterior pese menos
+            wait = (1 - (rule.limit - current) / previous) * size - offset
+        else:
+            # Hay que esperar a la ventana siguiente y a que la actual pese menos
+            wait = (size - offset) + (1 - rule.limit / max(current, 1)) * size
+        # En `wait` la estimación es exactamente el límite (aún bloqueado):
+        # el primer segundo entero estrictamente posterior
+        return max(1, math.floor(wait) + 1)
+
+
+def _create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimitBackend()
+    return MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(_create_backend(), enabled=settings.RATE_LIMIT_ENABLED)
+
+# Reglas del login
+LOGIN_PER_EMAIL = RateLimit(
+    scope="login-email",
+    limit=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+)
+LOGIN_PER_IP = RateLimit(
+    scope="login-ip",
+    limit=settings.LOGIN_RATE_LIMIT_PER_IP,
+    window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+)
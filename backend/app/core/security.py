@@ -2,12 +2,27 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import logging
 import os
+import time
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.logging_config import SampledLogger
+from app.core.metrics import PASSWORD_HASH_SECONDS, TOKEN_VERIFICATIONS, register_cache
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+sampled_logger = SampledLogger(logger, interval=settings.LOG_SAMPLE_INTERVAL_SECONDS)
+
+T = TypeVar("T")
+
 # Configuración de encriptación de contraseñas
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,19 +33,116 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar contraseña plana contra hash"""
+    started = time.perf_counter()
     try:
         return pwd_context.verify(plain_password, hashed_password)
     except Exception as e:
-        print(f"Error verificando contraseña: {e}")
+        logger.error("Error verificando contraseña: %s", e)
         return False
+    finally:
+        PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, "verify")
 
 def get_password_hash(password: str) -> str:
     """Encriptar contraseña"""
+    started = time.perf_counter()
     try:
         return pwd_context.hash(password)
-    except Exception as e:
-        print(f"Error hasheando contraseña: {e}")
+    except Exception:
+        logger.exception("Error hasheando contraseña")
         raise
+    finally:
+        PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, "hash")
+
+
+def dummy_verify_password() -> bool:
+    """
+    Verificación bcrypt contra un hash ficticio: mismo costo que
+    `verify_password`, para que rechazar un usuario inexistente tarde lo
+    mismo que una contraseña incorrecta.
+    """
+    started = time.perf_counter()
+    pwd_context.dummy_verify()
+    PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, "dummy_verify")
+    return False
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Encriptar un lote de contraseñas (ejecutado en un proceso del pool de importación)"""
+    return [pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHasherBusy(Exception):
+    """El executor de hashing no acepta más trabajo (cola llena)"""
+
+
+class PasswordHasher:
+    """
+    Executor acotado para bcrypt.
+    
+    bcrypt libera el GIL mientras calcula el hash, por lo que un pool de
+    hilos basta para sacar el trabajo del event loop. La cola se limita
+    para que una avalancha de logins falle rápido con 503 en lugar de
+    acumular esperas que bloqueen al resto de endpoints.
+    """
+    
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.capacity = max_workers + queue_limit
+        self._pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def pending(self) -> int:
+        """Operaciones en ejecución o en espera"""
+        return self._pending
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Ejecutar una función de hashing en el executor dedicado"""
+        # _pending solo se modifica desde el event loop, no requiere lock
+        if self._pending >= self.capacity:
+            raise PasswordHasherBusy()
+        
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+    
+    def shutdown(self) -> None:
+        """Detener el executor (al cerrar la aplicación)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verificar contraseña sin bloquear el event loop"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def dummy_verify_password_async() -> bool:
+    """Verificación ficticia sin bloquear el event loop (siempre False)"""
+    return await password_hasher.run(dummy_verify_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Encriptar contraseña sin bloquear el event loop"""
+    return await password_hasher.run(get_password_hash, password)
+
 
 def create_access_token(data: Dict[Any, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Crear token JWT"""
@@ -46,18 +158,39 @@ def create_access_token(data: Dict[Any, Any], expires_delta: Optional[timedelta]
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
         
-    except Exception as e:
-        print(f"Error creando token: {e}")
+    except Exception:
+        logger.exception("Error creando token")
         raise
 
+# Cache de tokens ya verificados: clave = SHA-256 del token, expira con `exp`
+token_cache: TTLCache[Dict[str, Any]] = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+register_cache("token", token_cache)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
-    """Verificar y decodificar token JWT"""
+    """Verificar y decodificar token JWT (con cache de tokens verificados)"""
+    digest = _token_digest(token)
+    payload = token_cache.get(digest)
+    if payload is not None:
+        TOKEN_VERIFICATIONS.inc("cached")
+        return payload
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        exp = payload.get("exp")
+        if exp is not None:
+            token_cache.set(digest, payload, expires_at=float(exp))
+        TOKEN_VERIFICATIONS.inc("valid")
         return payload
     except JWTError as e:
-        print(f"Error verificando token: {e}")
+        TOKEN_VERIFICATIONS.inc("invalid")
+        sampled_logger.warning("token_invalid", "Token rechazado: %s", e)
         return None
     except Exception as e:
-        print(f"Error inesperado verificando token: {e}")
+        TOKEN_VERIFICATIONS.inc("error")
+        sampled_logger.warning("token_error", "Error inesperado verificando token: %s", e)
         return None
\ No newline at end of file
@@ -0,0 +1,51 @@
+# backend/app/core/serialization.py
+"""
+Serialización JSON de respuestas.
+
+Con orjson instalado, las respuestas se codifican directamente a bytes
+(fechas, UUID y dataclasses incluidos) sin pasar por `json.dumps`. Los
+payloads ya serializados (p. ej. el snapshot del usuario autenticado) se
+envían tal cual con `PreEncodedJSONResponse`, sin volver a validarlos ni
+re-codificarlos.
+"""
+from datetime import date, datetime
+from typing import Any
+import json
+
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # Sin orjson: json de la librería estándar
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializar a JSON (bytes UTF-8)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Respuesta JSON por defecto de la API (orjson si está disponible)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class PreEncodedJSONResponse(Response):
+    """Respuesta con un cuerpo JSON ya serializado"""
+    media_type = "application/json"
@@ -1,29 +1,95 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from typing import AsyncIterator, Tuple
 import logging
+import os
 
 from app.core.config import settings
+from app.database.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_pool_metrics,
+    sync_pool_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def pool_limits() -> Tuple[int, int]:
+    """
+    (pool_size, max_overflow) por proceso.
+
+    Con DB_CONNECTION_BUDGET el tope global se reparte entre los
+    SERVER_WORKERS procesos de la API, de modo que workers × conexiones no
+    supere el `max_connections` disponible en MySQL.
+    """
+    if settings.DB_CONNECTION_BUDGET <= 0:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    per_worker = max(1, settings.DB_CONNECTION_BUDGET // max(1, settings.SERVER_WORKERS))
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    return pool_size, per_worker - pool_size
 
-# Configuración de logging
-logging.basicConfig()
-logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
 
-# Crear engine de SQLAlchemy con pool de conexiones
+def _pool_options(poolclass) -> dict:
+    """Opciones del pool de conexiones según el motor configurado"""
+    if settings.DB_DIALECT == "sqlite":
+        # SQLite (sustituto local): tamaños por defecto del dialecto
+        return {"poolclass": poolclass}
+    pool_size, max_overflow = pool_limits()
+    return {
+        "poolclass": poolclass,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        # Verificar la conexión en cada checkout (sin él: run_pool_liveness_probe)
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
+# Engine síncrono: scripts de administración y creación de tablas
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,  # Verificar conexión antes de usar
-    pool_recycle=3600,   # Reciclar conexiones cada hora
-    echo=settings.DEBUG  # Mostrar SQL queries en debug
+    echo=settings.DB_ECHO,  # Mostrar SQL queries (solo depuración)
+    **_pool_options(InstrumentedQueuePool)
 )
 
+# Engine asíncrono: endpoints de la API (no bloquea el event loop)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    echo=settings.DB_ECHO,
+    **_pool_options(InstrumentedAsyncQueuePool)
+)
+
+sync_pool_metrics.attach(engine)
+async_pool_metrics.attach(async_engine.sync_engine)
+
+
+def _dispose_after_fork() -> None:
+    # Un proceso hijo no debe reutilizar conexiones abiertas por el padre
+    # (close=False: las del padre siguen siendo suyas)
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    sync_pool_metrics.reset()
+    async_pool_metrics.reset()
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
+
 # Crear SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: los objetos siguen legibles tras commit sin
+# recargas implícitas (que en AsyncSession no están permitidas)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base para los modelos
 Base = declarative_base()
 metadata = MetaData()
@@ -44,32 +110,52 @@ def get_database():
         db.close()
 
 
+async def get_async_database() -> AsyncIterator[AsyncSession]:
+    """
+    Generador de sesión asíncrona de base de datos
+    Dependency para FastAPI
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            await db.rollback()
+            raise e
+
+
+def import_models():
+    """Importar todos los modelos para que queden registrados en Base.metadata"""
+    from app.users.models import User
+    from app.database.models import Department, RateLimitCounter
+    from app.documents.models import Document
+    from app.jobs.models import Job
+
+
 def create_tables():
     """
-    Crear todas las tablas en la base de datos
+    Crear todas las tablas en la base de datos (solo desarrollo, con
+    AUTO_CREATE_TABLES; en producción el esquema lo aplica `alembic upgrade head`)
     """
     try:
-        # Importar todos los modelos para que sean registrados
-        from app.users.models import User
-        from app.database.models import Department
-        
+        import_models()
         Base.metadata.create_all(bind=engine)
-        print("✅ Tablas creadas exitosamente")
-    except Exception as e:
-        print(f"❌ Error creando tablas: {e}")
-        raise e
+        logger.info("Tablas creadas/verificadas")
+    except Exception:
+        logger.exception("Error creando tablas")
+        raise
 
 
 def test_connection():
     """
-    Probar conexión a la base de datos
+    Probar conexión a la base de datos (síncrono: scripts; la API usa
+    app.core.health)
     """
     try:
         with engine.connect() as connection:
-            result = connection.execute("SELECT 1")
-            return result.fetchone()[0] == 1
+            result = connection.execute(text("SELECT 1"))
+            return result.scalar() == 1
     except Exception as e:
-        print(f"❌ Error de conexión a la base de datos: {e}")
+        logger.error("Error de conexión a la base de datos: %s", e)
         return False
 
 
@@ -79,8 +165,8 @@ def get_db_info():
     Obtener información de la conexión
     """
     return {
-        "url": settings.DATABASE_URL.replace(settings.DB_PASSWORD, "***"),
+        "url": engine.url.render_as_string(hide_password=True),
         "host": settings.DB_HOST,
         "database": settings.DB_NAME,
         "connected": test_connection()
-    }
\ No newline at end of file
+    }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text
+from sqlalchemy import BigInteger, Column, String, Boolean, DateTime, Integer, Text, Index
 from sqlalchemy.dialects.mysql import CHAR
 from datetime import datetime
 import uuid
@@ -31,6 +31,11 @@ class Department(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        # Paginación por cursor (más recientes primero)
+        Index("ix_departments_created_at_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<Department {self.name}>"
     
@@ -49,4 +54,16 @@ class Department(Base):
             "userCount": self.user_count,
             "createdAt": self.created_at.isoformat() if self.created_at else None,
             "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+        }
+
+class RateLimitCounter(Base):
+    """Contador de intentos por clave y ventana (backend compartido de rate limiting)"""
+    __tablename__ = "rate_limit_counters"
+    
+    key = Column(String(320), primary_key=True)  # "<alcance>:<identificador>"
+    window = Column(BigInteger, primary_key=True, autoincrement=False)  # Número de ventana (epoch // duración)
+    count = Column(Integer, default=0, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Limpieza de ventanas vencidas
+    
+    def __repr__(self):
+        return f"<RateLimitCounter {self.key}@{self.window}>"
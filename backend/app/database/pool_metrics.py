@@ -0,0 +1,220 @@
+# backend/app/database/pool_metrics.py
+"""
+Métricas del pool de conexiones.
+
+Los pools de los engines usan subclases instrumentadas de `QueuePool`
+que miden la espera al obtener una conexión; el resto de los contadores
+(conexiones abiertas, invalidaciones, fallos del pre-ping, edad de las
+conexiones) se alimentan de los eventos del pool y del engine.
+
+Sin `pool_pre_ping` (una ida y vuelta extra en cada checkout),
+`run_pool_liveness_probe` verifica la conexión periódicamente: si la base
+se reinició, el error de desconexión invalida el pool completo y las
+conexiones siguientes se abren de nuevo.
+"""
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Contadores de un pool (un objeto por engine)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reiniciar contadores (p. ej. en un proceso hijo tras fork)"""
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_wait_total = 0.0
+            self.checkout_wait_max = 0.0
+            self.checkout_timeouts = 0
+            self.connections_opened = 0
+            self.connections_closed = 0
+            self.invalidations = 0
+            self.pre_ping_failures = 0
+            self.liveness_probes = 0
+            self.liveness_failures = 0
+            self.liveness_last_ms: Optional[float] = None
+            # id de la conexión DBAPI -> instante de apertura
+            self._opened_at: Dict[int, float] = {}
+
+    def attach(self, engine: Engine) -> None:
+        """Registrar los eventos del pool y del engine"""
+        self.engine = engine
+        pool = engine.pool
+        if isinstance(pool, _InstrumentedPoolMixin):
+            pool.metrics = self
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "close_detached", self._on_close_detached)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_invalidate)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def observe_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_total += wait
+            if wait > self.checkout_wait_max:
+                self.checkout_wait_max = wait
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def observe_liveness(self, elapsed: float, ok: bool) -> None:
+        with self._lock:
+            self.liveness_probes += 1
+            self.liveness_last_ms = round(elapsed * 1000, 2)
+            if not ok:
+                self.liveness_failures += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connections_opened += 1
+            self._opened_at[id(dbapi_connection)] = time.monotonic()
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        self._on_close_detached(dbapi_connection)
+
+    def _on_close_detached(self, dbapi_connection) -> None:
+        with self._lock:
+            if self._opened_at.pop(id(dbapi_connection), None) is not None:
+                self.connections_closed += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_error(self, context) -> None:
+        if context.is_pre_ping:
+            with self._lock:
+                self.pre_ping_failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado actual del pool y contadores acumulados"""
+        pool = self.engine.pool if self.engine is not None else None
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - opened for opened in self._opened_at.values()]
+            data: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkoutWaitAvgMs": round(self.checkout_wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkoutWaitMaxMs": round(self.checkout_wait_max * 1000, 3),
+                "checkoutTimeouts": self.checkout_timeouts,
+                "connectionsOpened": self.connections_opened,
+                "connectionsClosed": self.connections_closed,
+                "invalidations": self.invalidations,
+                "prePingFailures": self.pre_ping_failures,
+                "livenessProbes": self.liveness_probes,
+                "livenessFailures": self.liveness_failures,
+                "livenessLastMs": self.liveness_last_ms,
+                "connectionAgeMaxSeconds": round(max(ages), 1) if ages else 0.0,
+                "connectionAgeAvgSeconds": round(sum(ages) / len(ages), 1) if ages else 0.0,
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checkedIn": pool.checkedin(),
+                "checkedOut": pool.checkedout(),
+                # overflow() es negativo mientras el pool no alcanza pool_size
+                "overflow": max(0, pool.overflow()),
+                "maxOverflow": pool._max_overflow,
+            })
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """Mide el tiempo de obtener una conexión (espera en la cola o apertura)"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_checkout(time.perf_counter() - started)
+        return record
+
+    def recreate(self):
+        # dispose() reemplaza el pool: conservar las métricas
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+
+def _pool_samples(key: str):
+    return lambda: [((metrics.name,), metrics.stats().get(key, 0)) for metrics in (async_pool_metrics, sync_pool_metrics)]
+
+
+registry.callback("db_pool_checked_out", "Conexiones en uso", "gauge", ("pool",), _pool_samples("checkedOut"))
+registry.callback("db_pool_overflow", "Conexiones abiertas sobre pool_size", "gauge", ("pool",), _pool_samples("overflow"))
+registry.callback("db_pool_checkouts_total", "Conexiones obtenidas del pool", "counter", ("pool",), _pool_samples("checkouts"))
+registry.callback(
+    "db_pool_checkout_wait_seconds_total", "Tiempo total esperando una conexión", "counter", ("pool",),
+    lambda: [((metrics.name,), metrics.checkout_wait_total) for metrics in (async_pool_metrics, sync_pool_metrics)]
+)
+registry.callback("db_pool_checkout_timeouts_total", "Esperas por conexión que vencieron", "counter", ("pool",), _pool_samples("checkoutTimeouts"))
+registry.callback("db_pool_pre_ping_failures_total", "Conexiones descartadas por el pre-ping", "counter", ("pool",), _pool_samples("prePingFailures"))
+registry.callback("db_pool_invalidations_total", "Conexiones invalidadas", "counter", ("pool",), _pool_samples("invalidations"))
+registry.callback("db_pool_connection_age_max_seconds", "Edad de la conexión abierta más antigua", "gauge", ("pool",), _pool_samples("connectionAgeMaxSeconds"))
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Métricas de los pools del proceso (engine asíncrono de la API y síncrono)"""
+    return {
+        "async": async_pool_metrics.stats(),
+        "sync": sync_pool_metrics.stats(),
+    }
+
+
+async def run_pool_liveness_probe() -> None:
+    """SELECT 1 periódico en lugar del pre-ping por checkout (lifespan)"""
+    from app.database.connection import async_engine
+
+    while True:
+        await asyncio.sleep(settings.DB_POOL_LIVENESS_PROBE_SECONDS)
+        started = time.perf_counter()
+        try:
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+            ok = True
+        except Exception as e:
+            # Si fue una desconexión, SQLAlchemy ya invalidó el pool
+            logger.warning("Sondeo de conexión a la base de datos falló: %s", e)
+            ok = False
+        async_pool_metrics.observe_liveness(time.perf_counter() - started, ok)
@@ -0,0 +1,103 @@
+# backend/app/database/schema.py
+"""
+Verificación de la versión del esquema al iniciar.
+
+El esquema se aplica fuera de la API con `alembic upgrade head` (una vez
+por despliegue). Al iniciar, cada proceso solo compara la revisión de la
+tabla `alembic_version` con la última migración del código: una consulta
+de una fila, sin DDL ni reflexión de tablas. Las revisiones del código se
+leen de los archivos de `migrations/versions` sin importar Alembic.
+"""
+from typing import Dict, Optional, Set, Tuple
+import ast
+import logging
+import os
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from app.database.connection import async_engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "migrations")
+
+
+class SchemaVersionError(Exception):
+    """La base de datos no tiene aplicadas las migraciones que requiere el código"""
+
+
+def code_revisions() -> Dict[str, Tuple[str, ...]]:
+    """Revisiones de `migrations/versions`: revisión -> revisiones de las que depende"""
+    revisions = {}
+    versions_dir = os.path.join(MIGRATIONS_DIR, "versions")
+    for filename in os.listdir(versions_dir):
+        if not filename.endswith(".py"):
+            continue
+        with open(os.path.join(versions_dir, filename), encoding="utf-8") as file:
+            tree = ast.parse(file.read(), filename=filename)
+        values = {}
+        for node in tree.body:
+            if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+                values[node.target.id] = node.value
+            elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+                values[node.targets[0].id] = node.value
+        if "revision" not in values:
+            continue
+        down = ast.literal_eval(values["down_revision"]) if "down_revision" in values else None
+        if down is None:
+            down = ()
+        elif isinstance(down, str):
+            down = (down,)
+        revisions[ast.literal_eval(values["revision"])] = tuple(down)
+    return revisions
+
+
+async def current_revisions() -> Optional[Set[str]]:
+    """
+    Revisiones aplicadas en la base de datos (None si nunca se migró).
+
+    Solo la ausencia de la tabla `alembic_version` significa "sin
+    migraciones"; cualquier otro error (p. ej. sin conexión) se propaga.
+    """
+    async with async_engine.connect() as connection:
+        try:
+            result = await connection.execute(text("SELECT version_num FROM alembic_version"))
+            return {row[0] for row in result}
+        except DBAPIError:
+            await connection.rollback()
+            exists = await connection.run_sync(lambda sync_connection: inspect(sync_connection).has_table("alembic_version"))
+            if exists:
+                raise
+            return None
+
+
+async def check_schema_version() -> None:
+    """
+    Fallar al iniciar si la base de datos está atrasada respecto del código.
+
+    Una revisión desconocida (más nueva que el código, p. ej. durante un
+    despliegue gradual) solo se advierte.
+    """
+    revisions = code_revisions()
+    heads = set(revisions) - {parent for parents in revisions.values() for parent in parents}
+    current = await current_revisions()
+
+    if not current:
+        raise SchemaVersionError(
+            "La base de datos no tiene migraciones aplicadas: ejecutar `alembic upgrade head` "
+            "(si las tablas ya existen por create_tables: `alembic stamp <revisión>` y luego `alembic upgrade head`)"
+        )
+    if current == heads:
+        logger.info("Esquema al día", extra={"revision": ",".join(sorted(current))})
+        return
+
+    if current <= revisions.keys():
+        raise SchemaVersionError(
+            f"Esquema atrasado ({', '.join(sorted(current))}; el código requiere "
+            f"{', '.join(sorted(heads))}): ejecutar `alembic upgrade head`"
+        )
+    logger.warning(
+        "Revisión de esquema desconocida para este código (¿despliegue en curso?)",
+        extra={"revision": ",".join(sorted(current)), "expected": ",".join(sorted(heads))}
+    )
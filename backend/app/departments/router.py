@@ -0,0 +1,128 @@
+# backend/app/departments/router.py
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.auth.dependencies import get_current_admin_user, get_current_user
+from app.core.serialization import PreEncodedJSONResponse
+from app.database.connection import get_async_database
+from app.departments.schemas import DepartmentCreateRequest, DepartmentUpdateRequest
+from app.departments.service import (
+    DepartmentConflict,
+    DepartmentInUse,
+    DepartmentService,
+    department_directory,
+)
+from app.documents.responses import if_none_match, not_modified
+from app.users.cache import UserSnapshot
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Los clientes revalidan siempre; con el ETag la respuesta suele ser un 304
+_CACHE_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Departamento no encontrado"
+    )
+
+
+def _conflict() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Ya existe un departamento con ese nombre o código"
+    )
+
+
+@router.get("")
+async def list_departments(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Directorio de departamentos (servido desde memoria, con ETag)"""
+    snapshot = await department_directory.get(db)
+    if if_none_match(request.headers, snapshot.etag):
+        return not_modified(snapshot.etag, _CACHE_HEADERS)
+    return PreEncodedJSONResponse(snapshot.body, headers={"ETag": snapshot.etag, **_CACHE_HEADERS})
+
+
+@router.get("/{department_id}")
+async def get_department(
+    department_id: str,
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Obtener un departamento (servido desde memoria, con ETag)"""
+    snapshot = await department_directory.get(db)
+    item = snapshot.items.get(department_id)
+    if item is None:
+        raise _not_found()
+
+    body, etag = item
+    if if_none_match(request.headers, etag):
+        return not_modified(etag, _CACHE_HEADERS)
+    return PreEncodedJSONResponse(body, headers={"ETag": etag, **_CACHE_HEADERS})
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_department(
+    data: DepartmentCreateRequest,
+    current_user: UserSnapshot = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Crear un departamento (solo admin)"""
+    try:
+        department = await DepartmentService.create_department(db=db, data=data)
+    except DepartmentConflict:
+        raise _conflict()
+    return department.to_dict()
+
+
+@router.put("/{department_id}")
+async def update_department(
+    department_id: str,
+    data: DepartmentUpdateRequest,
+    current_user: UserSnapshot = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Actualizar un departamento (solo admin)"""
+    department = await DepartmentService.get_department(db=db, department_id=department_id)
+    if department is None:
+        raise _not_found()
+
+    try:
+        department = await DepartmentService.update_department(db=db, department=department, data=data)
+    except DepartmentConflict:
+        raise _conflict()
+    return department.to_dict()
+
+
+@router.delete("/{department_id}")
+async def delete_department(
+    department_id: str,
+    current_user: UserSnapshot = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Eliminar un departamento sin usuarios ni documentos (solo admin)"""
+    department = await DepartmentService.get_department(db=db, department_id=department_id)
+    if department is None:
+        raise _not_found()
+
+    try:
+        await DepartmentService.delete_department(db=db, department=department)
+    except DepartmentInUse:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El departamento tiene usuarios o documentos asociados"
+        )
+
+    return {
+        "message": "Departamento eliminado",
+        "success": True
+    }
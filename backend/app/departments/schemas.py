@@ -0,0 +1,26 @@
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
+
+
+class DepartmentCreateRequest(BaseModel):
+    """Schema para crear un departamento"""
+    name: str = Field(..., min_length=1, max_length=100, description="Nombre del departamento")
+    code: str = Field(..., min_length=1, max_length=10, description="Código corto")
+    description: Optional[str] = None
+    managerName: Optional[str] = Field(default=None, max_length=200)
+    phone: Optional[str] = Field(default=None, max_length=20)
+    email: Optional[EmailStr] = None
+    location: Optional[str] = Field(default=None, max_length=255)
+    isActive: bool = True
+
+
+class DepartmentUpdateRequest(BaseModel):
+    """Schema para actualizar un departamento (solo los campos enviados)"""
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    code: Optional[str] = Field(default=None, min_length=1, max_length=10)
+    description: Optional[str] = None
+    managerName: Optional[str] = Field(default=None, max_length=200)
+    phone: Optional[str] = Field(default=None, max_length=20)
+    email: Optional[EmailStr] = None
+    location: Optional[str] = Field(default=None, max_length=255)
+    isActive: Optional[bool] = None
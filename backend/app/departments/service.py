@@ -0,0 +1,197 @@
+# backend/app/departments/service.py
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import time
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.database.models import Department
+from app.departments.schemas import DepartmentCreateRequest, DepartmentUpdateRequest
+from app.documents.models import Document
+from app.users.cache import user_cache
+from app.users.models import User
+
+logger = logging.getLogger(__name__)
+
+# Campos del request -> columnas del modelo
+_FIELD_COLUMNS = {
+    "name": "name",
+    "code": "code",
+    "description": "description",
+    "managerName": "manager_name",
+    "phone": "phone",
+    "email": "email",
+    "location": "location",
+    "isActive": "is_active",
+}
+
+
+class DepartmentConflict(Exception):
+    """Nombre o código de departamento ya existente"""
+
+
+class DepartmentInUse(Exception):
+    """El departamento tiene usuarios o documentos asociados"""
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+@dataclass(frozen=True)
+class DirectorySnapshot:
+    """Versión del directorio de departamentos, ya serializada"""
+    body: bytes  # JSON del listado completo
+    etag: str
+    items: Dict[str, Tuple[bytes, str]] = field(default_factory=dict)  # id -> (JSON, ETag)
+    fingerprint: Tuple = ()  # (MAX(updated_at), COUNT(*), SUM(user_count)) al cargarlo
+    names: Dict[str, str] = field(default_factory=dict)  # id -> nombre
+
+
+class DepartmentDirectory:
+    """
+    Directorio de departamentos en memoria del proceso.
+
+    Las lecturas devuelven bytes ya serializados sin consultar la base de
+    datos. Cada `check_interval` segundos como máximo se compara una huella
+    barata de la tabla (MAX(updated_at), COUNT(*), SUM(user_count)) y solo
+    si cambió se recarga; las escrituras de este proceso invalidan el
+    snapshot de inmediato y las de otros procesos se ven en la siguiente
+    verificación.
+
+    Si la recarga trae un departamento renombrado por otro proceso, se
+    vacía también el cache de usuarios de este proceso (los snapshots
+    llevan `department_name`). Sin lecturas del directorio en este proceso
+    el nombre anterior se sirve a lo más `USER_CACHE_TTL_SECONDS`.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._next_check = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Forzar verificación en la próxima lectura"""
+        self._next_check = 0.0
+
+    async def get(self, db: AsyncSession) -> DirectorySnapshot:
+        """Snapshot vigente (sin consultas mientras no toque verificar)"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot
+
+        async with self._lock:
+            # Otra corrutina pudo haberlo verificado mientras se esperaba el lock
+            if self._snapshot is not None and time.monotonic() < self._next_check:
+                return self._snapshot
+
+            fingerprint = await self._fingerprint(db)
+            if self._snapshot is None or self._snapshot.fingerprint != fingerprint:
+                previous, self._snapshot = self._snapshot, await self._load(db, fingerprint)
+                logger.info("Directorio de departamentos recargado", extra={"etag": self._snapshot.etag})
+                if previous is not None and any(
+                    previous.names.get(department_id, name) != name
+                    for department_id, name in self._snapshot.names.items()
+                ):
+                    user_cache.clear()
+            self._next_check = time.monotonic() + self.check_interval
+            return self._snapshot
+
+    async def _fingerprint(self, db: AsyncSession) -> Tuple:
+        result = await db.execute(
+            select(func.max(Department.updated_at), func.count(Department.id), func.sum(Department.user_count))
+        )
+        return tuple(result.one())
+
+    async def _load(self, db: AsyncSession, fingerprint: Tuple) -> DirectorySnapshot:
+        result = await db.execute(select(Department).order_by(Department.name))
+        departments = [department.to_dict() for department in result.scalars().all()]
+
+        items = {}
+        for department in departments:
+            item_body = dumps(department)
+            items[department["id"]] = (item_body, _etag(item_body))
+
+        body = dumps({"departments": departments, "total": len(departments)})
+        names = {department["id"]: department["name"] for department in departments}
+        return DirectorySnapshot(body=body, etag=_etag(body), items=items, fingerprint=fingerprint, names=names)
+
+
+department_directory = DepartmentDirectory(settings.DEPARTMENT_CACHE_CHECK_SECONDS)
+
+
+class DepartmentService:
+
+    @staticmethod
+    async def create_department(db: AsyncSession, data: DepartmentCreateRequest) -> Department:
+        """Crear un departamento"""
+        department = Department(**{
+            column: value for name, column in _FIELD_COLUMNS.items()
+            if (value := getattr(data, name)) is not None
+        })
+        db.add(department)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise DepartmentConflict()
+
+        department_directory.invalidate()
+        logger.info("Departamento creado", extra={"department_id": department.id})
+        return department
+
+    @staticmethod
+    async def update_department(db: AsyncSession, department: Department, data: DepartmentUpdateRequest) -> Department:
+        """Actualizar los campos enviados de un departamento"""
+        changes = data.model_dump(exclude_unset=True)
+        for name, value in changes.items():
+            setattr(department, _FIELD_COLUMNS[name], value)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise DepartmentConflict()
+
+        department_directory.invalidate()
+        if "name" in changes:
+            # Usuarios, documentos e índice de búsqueda se actualizaron en la
+            # misma transacción (eventos de Department en los modelos). Los
+            # snapshots de usuarios llevan el nombre: este proceso los
+            # descarta ya y los demás al recargar su directorio
+            user_cache.clear()
+        logger.info("Departamento actualizado", extra={"department_id": department.id})
+        return department
+
+    @staticmethod
+    async def delete_department(db: AsyncSession, department: Department) -> None:
+        """Eliminar un departamento sin usuarios ni documentos"""
+        in_use = await db.execute(select(
+            exists().where(User.department_id == department.id)
+            | exists().where(Document.department_id == department.id)
+        ))
+        if in_use.scalar():
+            raise DepartmentInUse()
+
+        try:
+            await db.delete(department)
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise DepartmentInUse()
+
+        department_directory.invalidate()
+        logger.info("Departamento eliminado", extra={"department_id": department.id})
+
+    @staticmethod
+    async def get_department(db: AsyncSession, department_id: str) -> Optional[Department]:
+        """Obtener departamento por ID"""
+        result = await db.execute(select(Department).where(Department.id == department_id))
+        return result.scalar_one_or_none()
@@ -0,0 +1,148 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, Integer, ForeignKey, Text, Index, DDL, event, select, update
+from sqlalchemy.dialects.mysql import CHAR, MEDIUMTEXT
+from sqlalchemy.orm.attributes import get_history
+from datetime import datetime
+import uuid
+
+from app.database.connection import Base
+from app.database.models import Department
+
+
+class DocumentBlob(Base):
+    """Contenido de un archivo, almacenado una sola vez por hash SHA-256"""
+    __tablename__ = "document_blobs"
+
+    # Primary Key: dirección de contenido
+    sha256 = Column(CHAR(64), primary_key=True)
+
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=0, nullable=False)  # Documentos que lo referencian
+
+    # Metadatos
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DocumentBlob {self.sha256[:12]} refs={self.ref_count}>"
+
+
+class Document(Base):
+    __tablename__ = "documents"
+
+    # Primary Key
+    id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Información del documento
+    title = Column(String(255), nullable=False)
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False, default="application/octet-stream")
+    size_bytes = Column(BigInteger, nullable=False)
+    sha256 = Column(CHAR(64), ForeignKey("document_blobs.sha256"), nullable=False, index=True)
+
+    # Información organizacional
+    department_id = Column(CHAR(36), ForeignKey("departments.id"), nullable=False, index=True)
+    department_name = Column(String(100), nullable=False)
+    uploaded_by = Column(CHAR(36), ForeignKey("users.id"), nullable=False, index=True)
+
+    # Metadatos
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Paginación por cursor (más recientes primero), global y por departamento
+        Index("ix_documents_created_at_id", "created_at", "id"),
+        Index("ix_documents_department_created_at_id", "department_id", "created_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<Document {self.title}>"
+
+    def to_dict(self) -> dict:
+        """Convertir a diccionario"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "originalFilename": self.original_filename,
+            "contentType": self.content_type,
+            "size": self.size_bytes,
+            "sha256": self.sha256,
+            "departmentId": self.department_id,
+            "departmentName": self.department_name,
+            "uploadedBy": self.uploaded_by,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class DocumentSearchEntry(Base):
+    """
+    Texto indexado de un documento para búsqueda full-text.
+
+    En MySQL se indexa con un índice FULLTEXT; en SQLite (sustituto local)
+    una tabla virtual FTS5 con contenido externo se mantiene por triggers.
+    """
+    __tablename__ = "document_search"
+
+    # Entero para que sea el rowid estable que usa FTS5
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(CHAR(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    title = Column(String(255), nullable=False)
+    department_name = Column(String(100), nullable=False)
+    body = Column(Text().with_variant(MEDIUMTEXT(), "mysql"), nullable=False, default="")  # Texto extraído del archivo
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ft_document_search", "title", "department_name", "body", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+
+_SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS document_search_fts USING fts5(
+        title, department_name, body,
+        content='document_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS document_search_ai AFTER INSERT ON document_search BEGIN
+        INSERT INTO document_search_fts(rowid, title, department_name, body)
+        VALUES (new.id, new.title, new.department_name, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS document_search_ad AFTER DELETE ON document_search BEGIN
+        INSERT INTO document_search_fts(document_search_fts, rowid, title, department_name, body)
+        VALUES ('delete', old.id, old.title, old.department_name, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS document_search_au AFTER UPDATE ON document_search BEGIN
+        INSERT INTO document_search_fts(document_search_fts, rowid, title, department_name, body)
+        VALUES ('delete', old.id, old.title, old.department_name, old.body);
+        INSERT INTO document_search_fts(rowid, title, department_name, body)
+        VALUES (new.id, new.title, new.department_name, new.body);
+    END""",
+]
+
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(DocumentSearchEntry.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    DocumentSearchEntry.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS document_search_fts").execute_if(dialect="sqlite")
+)
+
+
+@event.listens_for(Department, "after_update")
+def _department_after_update(mapper, connection, target: Department) -> None:
+    """Propagar el cambio de nombre del departamento a documentos e índice"""
+    if get_history(target, "name").has_changes():
+        connection.execute(
+            update(Document)
+            .where(Document.department_id == target.id)
+            .values(department_name=target.name)
+        )
+        connection.execute(
+            update(DocumentSearchEntry)
+            .where(DocumentSearchEntry.document_id.in_(
+                select(Document.id).where(Document.department_id == target.id)
+            ))
+            .values(department_name=target.name)
+        )
@@ -0,0 +1,114 @@
+# backend/app/documents/multipart.py
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+
+class MultipartError(Exception):
+    """Cuerpo multipart inválido"""
+
+
+@dataclass
+class PartHeaders:
+    """Cabeceras de una parte del cuerpo multipart"""
+    name: str
+    filename: Optional[str]
+    content_type: str
+
+    @property
+    def is_file(self) -> bool:
+        return self.filename is not None
+
+
+# Eventos emitidos: ("begin", PartHeaders) | ("data", bytes) | ("end", None)
+MultipartEvent = Tuple[str, Union[PartHeaders, bytes, None]]
+
+
+async def iter_multipart(request: Request) -> AsyncIterator[MultipartEvent]:
+    """
+    Recorrer un cuerpo multipart/form-data a medida que llega.
+
+    A diferencia de `request.form()`, no acumula las partes en memoria ni
+    en archivos temporales: entrega cada fragmento de datos en cuanto el
+    parser lo reconoce, para que el consumidor lo escriba donde corresponda.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise MultipartError("Se esperaba multipart/form-data")
+
+    events: List[MultipartEvent] = []
+    header_field = bytearray()
+    header_value = bytearray()
+    headers = {}
+
+    def on_part_begin():
+        headers.clear()
+
+    def on_header_field(data, start, end):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        disposition, options = parse_options_header(headers.get(b"content-disposition"))
+        if disposition != b"form-data" or b"name" not in options:
+            raise MultipartError("Parte multipart sin Content-Disposition válido")
+        filename = options.get(b"filename")
+        events.append(("begin", PartHeaders(
+            name=options[b"name"].decode("utf-8", "replace"),
+            filename=filename.decode("utf-8", "replace") if filename is not None else None,
+            content_type=headers.get(b"content-type", b"application/octet-stream").decode("latin-1"),
+        )))
+
+    def on_part_data(data, start, end):
+        events.append(("data", bytes(data[start:end])))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(params[b"boundary"], callbacks={
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    part_open = False  # Hay una parte iniciada sin su evento "end"
+
+    def feed(data: Optional[bytes]) -> None:
+        try:
+            if data is None:
+                parser.finalize()
+            else:
+                parser.write(data)
+        except MultipartError:
+            raise
+        except Exception as e:
+            raise MultipartError(f"Cuerpo multipart inválido: {e}")
+
+    async for chunk in request.stream():
+        feed(chunk)
+        for event in events:
+            part_open = event[0] != "end"
+            yield event
+        events.clear()
+
+    feed(None)
+    for event in events:
+        part_open = event[0] != "end"
+        yield event
+
+    if part_open:
+        # El cuerpo terminó antes del cierre de la parte (cliente desconectado)
+        raise MultipartError("Cuerpo multipart incompleto")
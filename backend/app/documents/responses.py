@@ -0,0 +1,118 @@
+# backend/app/documents/responses.py
+from typing import Optional, Tuple
+import os
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+# Extensión ASGI de envío zero-copy (el servidor usa os.sendfile)
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+def etag_for(sha256: str) -> str:
+    """ETag fuerte derivado del hash del contenido"""
+    return f'"{sha256}"'
+
+
+def if_none_match(request_headers: Headers, etag: str) -> bool:
+    """True si el cliente ya tiene la versión actual (If-None-Match)"""
+    header = request_headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    """Respuesta 304 con el ETag vigente"""
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
+
+
+def parse_single_range(header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    (inicio, fin exclusivo) de un header Range con un único rango
+    satisfacible. None en cualquier otro caso (varios rangos, sintaxis
+    inválida, fuera del archivo): esas respuestas las arma FileResponse.
+    """
+    units, _, spec = header.partition("=")
+    if units.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, separator, last = spec.strip().partition("-")
+    if not separator:
+        return None
+    try:
+        if not first:
+            # Sufijo: los últimos N bytes
+            length = int(last)
+            if length <= 0:
+                return None
+            return max(0, file_size - length), file_size
+        start = int(first)
+        end = int(last) + 1 if last else file_size
+    except ValueError:
+        return None
+    if start < 0 or start >= file_size or end <= start:
+        return None
+    return start, min(end, file_size)
+
+
+class BlobFileResponse(FileResponse):
+    """
+    FileResponse para blobs del almacén de documentos.
+
+    - Si el servidor ASGI ofrece `http.response.zerocopysend`, el archivo
+      (completo o un único rango) se entrega con os.sendfile sin pasar por
+      buffers de Python.
+    - En otro caso delega en FileResponse (pathsend o lectura por chunks),
+      con chunks más grandes para reducir saltos al threadpool.
+
+    Range/If-Range se resuelven contra el ETag fuerte recibido en `headers`.
+    """
+
+    chunk_size = 1024 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if ZEROCOPY_EXTENSION not in scope.get("extensions", {}) or scope["method"].upper() == "HEAD":
+            return await super().__call__(scope, receive, send)
+
+        stat_result = self.stat_result or os.stat(self.path)
+        if self.stat_result is None:
+            self.set_stat_headers(stat_result)
+        file_size = stat_result.st_size
+
+        request_headers = Headers(scope=scope)
+        http_range = request_headers.get("range")
+        http_if_range = request_headers.get("if-range")
+
+        start, end = 0, file_size
+        status_code = self.status_code
+        # If-Range distinto del ETag/Last-Modified actual: contenido completo
+        if http_range is not None and (
+            http_if_range is None
+            or http_if_range in (self.headers.get("etag"), self.headers.get("last-modified"))
+        ):
+            requested = parse_single_range(http_range, file_size)
+            if requested is None:
+                # Rangos inválidos, múltiples o no satisfacibles (416): FileResponse
+                return await super().__call__(scope, receive, send)
+            start, end = requested
+            status_code = 206
+            self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+            self.headers["content-length"] = str(end - start)
+
+        with open(self.path, "rb") as file:
+            await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+            await send({
+                "type": ZEROCOPY_EXTENSION,
+                "file": file.fileno(),
+                "offset": start,
+                "count": end - start,
+                "more_body": False,
+            })
+
+        if self.background is not None:
+            await self.background()
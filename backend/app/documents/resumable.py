@@ -0,0 +1,468 @@
+# backend/app/documents/resumable.py
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.documents.storage import DocumentStorage, StoredFile, document_storage
+
+try:
+    import fcntl
+except ImportError:  # Windows: solo lock dentro del proceso
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de lectura al calcular el hash final
+_HASH_READ_SIZE = 4 * 1024 * 1024
+
+
+class UploadSessionError(Exception):
+    """Operación inválida sobre una sesión de upload"""
+
+
+class UploadSessionNotFound(UploadSessionError):
+    """La sesión no existe o expiró"""
+
+
+class UploadIncomplete(UploadSessionError):
+    """Faltan rangos por recibir"""
+
+
+class TooManyUploadSessions(UploadSessionError):
+    """El usuario alcanzó el máximo de sesiones abiertas"""
+
+
+class UploadAlreadyCompleting(UploadSessionError):
+    """Otra solicitud ya está finalizando la sesión"""
+
+
+class UploadWriteInProgress(UploadSessionError):
+    """Hay chunks escribiéndose en la sesión"""
+
+
+@dataclass
+class UploadSession:
+    """Metadatos persistidos de una sesión de upload reanudable"""
+    id: str
+    user_id: str
+    filename: str
+    title: str
+    content_type: str
+    size: int
+    created_at: float
+    updated_at: float
+    received: List[List[int]] = field(default_factory=list)  # Rangos [inicio, fin) ordenados
+    completing: bool = False  # Una solicitud de `complete` en curso
+    leases: Dict[str, float] = field(default_factory=dict)  # PATCH en curso -> última escritura
+
+    def prune_leases(self, now: float) -> None:
+        """Descartar leases de escritores que dejaron de escribir (p. ej. un worker caído)"""
+        self.leases = {
+            lease_id: renewed_at for lease_id, renewed_at in self.leases.items()
+            if now - renewed_at < settings.RESUMABLE_WRITE_LEASE_SECONDS
+        }
+
+    @property
+    def received_bytes(self) -> int:
+        return sum(end - start for start, end in self.received)
+
+    @property
+    def offset(self) -> int:
+        """Bytes contiguos recibidos desde el inicio"""
+        if self.received and self.received[0][0] == 0:
+            return self.received[0][1]
+        return 0
+
+    @property
+    def is_complete(self) -> bool:
+        return self.received == [[0, self.size]] or self.size == 0
+
+    def missing(self) -> List[List[int]]:
+        """Rangos que faltan por recibir"""
+        gaps, cursor = [], 0
+        for start, end in self.received:
+            if start > cursor:
+                gaps.append([cursor, start])
+            cursor = max(cursor, end)
+        if cursor < self.size:
+            gaps.append([cursor, self.size])
+        return gaps
+
+    def extends_range(self, offset: int) -> bool:
+        """Si un chunk en `offset` se fusiona con un rango ya recibido"""
+        return any(start <= offset <= end for start, end in self.received)
+
+    def add_range(self, start: int, end: int) -> None:
+        """Registrar un rango recibido, fusionándolo con los existentes"""
+        if end <= start:
+            return
+        merged: List[List[int]] = []
+        for current_start, current_end in sorted(self.received + [[start, end]]):
+            if merged and current_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], current_end)
+            else:
+                merged.append([current_start, current_end])
+        if len(merged) > settings.RESUMABLE_MAX_RANGES:
+            raise UploadSessionError("Demasiados rangos no contiguos: envíe primero los rangos faltantes")
+        self.received = merged
+
+    def to_dict(self) -> dict:
+        """Convertir a diccionario"""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "title": self.title,
+            "contentType": self.content_type,
+            "size": self.size,
+            "offset": self.offset,
+            "receivedBytes": self.received_bytes,
+            "received": self.received,
+            "missing": self.missing(),
+            "complete": self.is_complete,
+            "chunkSize": settings.RESUMABLE_CHUNK_SIZE,
+            "expiresAt": int(self.updated_at + settings.RESUMABLE_UPLOAD_TTL_SECONDS),
+        }
+
+
+class ResumableUploadStore:
+    """
+    Sesiones de upload reanudable bajo `UPLOAD_DIR/sessions/<id>/`.
+
+    Cada sesión tiene un archivo `data` preasignado al tamaño final, donde
+    cada PATCH escribe su rango en el offset indicado (se aceptan chunks en
+    paralelo y en cualquier orden), y un `session.json` con los rangos
+    recibidos. Al finalizar, `data` se hashea en una única lectura y se
+    mueve al almacén de blobs sin copiarlo.
+    """
+
+    def __init__(self, storage: DocumentStorage):
+        self.storage = storage
+        self.sessions_dir = storage.root / "sessions"
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self._thread_lock = threading.Lock()
+
+    def _session_dir(self, session_id: str) -> Path:
+        # Validar formato para no permitir rutas arbitrarias
+        try:
+            uuid.UUID(session_id)
+        except ValueError:
+            raise UploadSessionNotFound()
+        return self.sessions_dir / session_id
+
+    @contextmanager
+    def _locked(self, session_dir: Path) -> Iterator[None]:
+        """Lock de la metadata de la sesión (entre hilos y entre workers)"""
+        with self._thread_lock:
+            if not session_dir.is_dir():
+                raise UploadSessionNotFound()
+            if fcntl is None:
+                yield
+                return
+            with open(session_dir / "session.lock", "a+b") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self, session_dir: Path) -> UploadSession:
+        try:
+            with open(session_dir / "session.json", "r", encoding="utf-8") as meta:
+                return UploadSession(**json.load(meta))
+        except FileNotFoundError:
+            raise UploadSessionNotFound()
+
+    def _write(self, session_dir: Path, session: UploadSession) -> None:
+        temp = session_dir / "session.json.tmp"
+        with open(temp, "w", encoding="utf-8") as meta:
+            json.dump(asdict(session), meta)
+        os.replace(temp, session_dir / "session.json")
+
+    # Operaciones síncronas (se ejecutan en el threadpool)
+
+    def _count_open(self, user_id: str) -> int:
+        """Sesiones vigentes del usuario"""
+        cutoff = time.time() - settings.RESUMABLE_UPLOAD_TTL_SECONDS
+        count = 0
+        for session_dir in self.sessions_dir.iterdir():
+            try:
+                session = self._read(session_dir)
+            except (UploadSessionNotFound, ValueError, TypeError):
+                continue
+            if session.user_id == user_id and session.updated_at >= cutoff:
+                count += 1
+        return count
+
+    def _create(self, user_id: str, filename: str, title: str, content_type: str, size: int) -> UploadSession:
+        with self._thread_lock:
+            if self._count_open(user_id) >= settings.RESUMABLE_MAX_SESSIONS_PER_USER:
+                raise TooManyUploadSessions(
+                    f"Máximo de {settings.RESUMABLE_MAX_SESSIONS_PER_USER} uploads abiertos por usuario"
+                )
+            return self._create_session(user_id, filename, title, content_type, size)
+
+    def _create_session(self, user_id: str, filename: str, title: str, content_type: str, size: int) -> UploadSession:
+        now = time.time()
+        session = UploadSession(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            filename=filename,
+            title=title,
+            content_type=content_type,
+            size=size,
+            created_at=now,
+            updated_at=now
+        )
+        session_dir = self._session_dir(session.id)
+        session_dir.mkdir(parents=True)
+        with open(session_dir / "data", "wb") as data:
+            data.truncate(size)  # Archivo disperso del tamaño final
+        self._write(session_dir, session)
+        return session
+
+    def _get(self, session_id: str, user_id: str) -> UploadSession:
+        session = self._read(self._session_dir(session_id))
+        if session.user_id != user_id:
+            raise UploadSessionNotFound()
+        return session
+
+    def _begin_write(self, session_dir: Path, user_id: str, lease_id: str, offset: int) -> UploadSession:
+        """Registrar un escritor activo; `complete` espera a que terminen todos"""
+        with self._locked(session_dir):
+            session = self._read(session_dir)
+            if session.user_id != user_id:
+                raise UploadSessionNotFound()
+            if offset < 0 or offset > session.size:
+                raise UploadSessionError("Upload-Offset fuera de rango")
+            if session.completing:
+                raise UploadAlreadyCompleting()
+            if len(session.received) >= settings.RESUMABLE_MAX_RANGES and not session.extends_range(offset):
+                raise UploadSessionError("Demasiados rangos no contiguos: envíe primero los rangos faltantes")
+            session.leases[lease_id] = time.time()
+            self._write(session_dir, session)
+        return session
+
+    def _write_at(self, session_dir: Path, lease_id: str, data: BinaryIO, position: int, chunk: bytes) -> None:
+        """Escribir bajo el lock, solo si el lease sigue vigente y nadie está finalizando"""
+        with self._locked(session_dir):
+            session = self._read(session_dir)
+            if session.completing or lease_id not in session.leases:
+                raise UploadAlreadyCompleting()
+            data.seek(position)
+            data.write(chunk)
+            data.flush()
+            session.leases[lease_id] = time.time()
+            self._write(session_dir, session)
+
+    def _end_write(self, session_dir: Path, lease_id: str, start: int, end: int) -> UploadSession:
+        """Liberar el lease y registrar el rango efectivamente escrito"""
+        with self._locked(session_dir):
+            session = self._read(session_dir)
+            session.leases.pop(lease_id, None)
+            try:
+                session.add_range(start, end)
+            finally:
+                session.updated_at = time.time()
+                self._write(session_dir, session)
+        return session
+
+    def _set_completing(self, session_id: str, user_id: str, completing: bool) -> UploadSession:
+        """Marcar (o liberar) la sesión como en finalización; solo una solicitud a la vez"""
+        session_dir = self._session_dir(session_id)
+        with self._locked(session_dir):
+            session = self._read(session_dir)
+            if session.user_id != user_id:
+                raise UploadSessionNotFound()
+            if completing:
+                if session.completing:
+                    raise UploadAlreadyCompleting()
+                session.prune_leases(time.time())
+                if session.leases:
+                    raise UploadWriteInProgress()
+                if not session.is_complete:
+                    raise UploadIncomplete()
+            session.completing = completing
+            session.updated_at = time.time()
+            self._write(session_dir, session)
+        return session
+
+    def _hash_and_sync(self, session_id: str) -> str:
+        """Leer `data` una sola vez para el hash y dejarlo durable"""
+        digest = hashlib.sha256()
+        with open(self._session_dir(session_id) / "data", "rb") as data:
+            while True:
+                block = data.read(_HASH_READ_SIZE)
+                if not block:
+                    break
+                digest.update(block)
+            os.fsync(data.fileno())
+        return digest.hexdigest()
+
+    def _cancel(self, session_id: str, user_id: str) -> None:
+        session_dir = self._session_dir(session_id)
+        with self._locked(session_dir):
+            session = self._read(session_dir)
+            if session.user_id != user_id:
+                raise UploadSessionNotFound()
+            if session.completing:
+                # `data` está por publicarse en el almacén
+                raise UploadAlreadyCompleting()
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+    def _delete(self, session_id: str) -> None:
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    # API asíncrona
+
+    async def create(self, user_id: str, filename: str, title: str, content_type: str, size: int) -> UploadSession:
+        """Crear una sesión de upload"""
+        if size < 0 or size > settings.MAX_FILE_SIZE:
+            raise UploadSessionError(f"El tamaño debe estar entre 0 y {settings.MAX_FILE_SIZE} bytes")
+        return await run_in_threadpool(self._create, user_id, filename, title, content_type, size)
+
+    async def get(self, session_id: str, user_id: str) -> UploadSession:
+        """Obtener el estado de una sesión del usuario"""
+        return await run_in_threadpool(self._get, session_id, user_id)
+
+    async def write_chunk(
+        self,
+        session_id: str,
+        user_id: str,
+        offset: int,
+        body: AsyncIterator[bytes]
+    ) -> UploadSession:
+        """
+        Escribir un chunk en `offset` a medida que llega.
+        Si la conexión se corta, se registra lo efectivamente escrito
+        para que el cliente pueda reanudar desde ahí.
+
+        Mientras dure, el PATCH tiene un lease en la sesión: `complete` se
+        rechaza hasta que termine, y cada escritura verifica bajo el lock
+        que nadie haya empezado a finalizar (el archivo ya hasheado no
+        vuelve a modificarse).
+        """
+        session_dir = self._session_dir(session_id)
+        lease_id = uuid.uuid4().hex
+        session = await run_in_threadpool(self._begin_write, session_dir, user_id, lease_id, offset)
+
+        position = offset
+        buffer = bytearray()
+        data = None
+        try:
+            data = await run_in_threadpool(open, session_dir / "data", "r+b")
+
+            async def flush():
+                nonlocal position
+                chunk = bytes(buffer)
+                buffer.clear()
+                if chunk:
+                    await run_in_threadpool(self._write_at, session_dir, lease_id, data, position, chunk)
+                    position += len(chunk)
+
+            async for piece in body:
+                if position + len(buffer) + len(piece) > session.size:
+                    raise UploadSessionError("El chunk excede el tamaño declarado")
+                buffer += piece
+                if len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                    await flush()
+            await flush()
+        finally:
+            if data is not None:
+                await run_in_threadpool(data.close)
+            session = await run_in_threadpool(self._end_write, session_dir, lease_id, offset, position)
+
+        return session
+
+    async def finalize(self, session_id: str, user_id: str) -> Tuple[UploadSession, StoredFile]:
+        """
+        Verificar que la sesión esté completa y preparar su contenido para
+        publicarlo en el almacén (el archivo se mueve, no se copia).
+        La sesión queda marcada: una segunda llamada concurrente recibe
+        `UploadAlreadyCompleting` hasta que se elimine o se libere con
+        `release`.
+        """
+        session = await run_in_threadpool(self._set_completing, session_id, user_id, True)
+        try:
+            sha256 = await run_in_threadpool(self._hash_and_sync, session_id)
+        except Exception:
+            await self.release(session_id, user_id)
+            raise
+        stored = StoredFile(
+            sha256=sha256,
+            size_bytes=session.size,
+            temp_path=self._session_dir(session_id) / "data"
+        )
+        return session, stored
+
+    async def release(self, session_id: str, user_id: str) -> None:
+        """Quitar la marca de finalización (p. ej. si falló el registro)"""
+        try:
+            await run_in_threadpool(self._set_completing, session_id, user_id, False)
+        except UploadSessionNotFound:
+            pass
+
+    async def cancel(self, session_id: str, user_id: str) -> None:
+        """Cancelar una sesión del usuario (no mientras se está finalizando)"""
+        await run_in_threadpool(self._cancel, session_id, user_id)
+
+    async def delete(self, session_id: str) -> None:
+        """Eliminar una sesión y sus datos"""
+        await run_in_threadpool(self._delete, session_id)
+
+    def cleanup_expired(self, max_age: Optional[float] = None) -> int:
+        """
+        Recolectar sesiones abandonadas y temporales huérfanos.
+        Retorna la cantidad de entradas eliminadas.
+        """
+        max_age = max_age if max_age is not None else settings.RESUMABLE_UPLOAD_TTL_SECONDS
+        cutoff = time.time() - max_age
+        removed = 0
+
+        for session_dir in self.sessions_dir.iterdir():
+            meta_path = session_dir / "session.json"
+            try:
+                last_activity = meta_path.stat().st_mtime if meta_path.exists() else session_dir.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if last_activity < cutoff:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                removed += 1
+
+        # Temporales de uploads directos interrumpidos por una caída del proceso
+        for temp_file in self.storage.temp_dir.iterdir():
+            try:
+                if temp_file.stat().st_mtime < cutoff:
+                    temp_file.unlink(missing_ok=True)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+
+        return removed
+
+
+resumable_uploads = ResumableUploadStore(document_storage)
+
+
+async def run_upload_cleanup() -> None:
+    """Tarea periódica de limpieza de sesiones abandonadas (lifespan)"""
+    while True:
+        try:
+            removed = await run_in_threadpool(resumable_uploads.cleanup_expired)
+            if removed:
+                logger.info("Sesiones de upload expiradas eliminadas", extra={"removed": removed})
+        except Exception:
+            logger.exception("Error limpiando sesiones de upload")
+        await asyncio.sleep(settings.RESUMABLE_UPLOAD_GC_INTERVAL_SECONDS)
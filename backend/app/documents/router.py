@@ -0,0 +1,473 @@
+# backend/app/documents/router.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import logging
+
+from app.auth.dependencies import get_current_user
+from app.core.config import settings
+from app.core.pagination import InvalidCursor, InvalidFields
+from app.database.connection import get_async_database
+from app.documents.multipart import MultipartError, PartHeaders
+from app.documents.responses import BlobFileResponse, etag_for, if_none_match, not_modified
+from app.documents.resumable import (
+    TooManyUploadSessions,
+    UploadAlreadyCompleting,
+    UploadIncomplete,
+    UploadSessionError,
+    UploadSessionNotFound,
+    UploadWriteInProgress,
+    resumable_uploads,
+)
+from app.documents.schemas import CreateUploadSessionRequest, DocumentResponse
+from app.documents.search import search_documents
+from app.documents.service import DOCUMENT_LIST_FIELDS, BlobUnavailable, DocumentService, ReceivedUpload
+from app.documents.storage import ContentMismatch, FileTooLarge, document_storage
+from app.jobs.queue import get_jobs_for_document
+from app.users.cache import UserSnapshot
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("")
+async def list_documents(
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (`nextCursor`)"),
+    pageSize: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma"),
+    departmentId: Optional[str] = Query(None),
+    uploadedBy: Optional[str] = Query(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Listar documentos, más recientes primero.
+    Paginación por cursor: pasar `nextCursor` de la respuesta para la página siguiente.
+    """
+    try:
+        selected = DOCUMENT_LIST_FIELDS.parse(fields)
+        documents, next_cursor = await DocumentService.list_documents(
+            db=db,
+            fields=selected,
+            limit=pageSize,
+            cursor=cursor,
+            department_id=departmentId,
+            uploaded_by=uploadedBy
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    except InvalidFields as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return {
+        "results": documents,
+        "pageSize": pageSize,
+        "nextCursor": next_cursor,
+        "hasMore": next_cursor is not None
+    }
+
+
+@router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+async def upload_document(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Subir un documento (multipart/form-data con `file` y `title` opcional).
+    El archivo se escribe a disco por chunks mientras se recibe.
+    """
+    try:
+        upload = await DocumentService.receive_upload(request)
+    except FileTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"El archivo supera el máximo de {settings.MAX_FILE_SIZE} bytes"
+        )
+    except MultipartError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ContentMismatch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El contenido no coincide con X-Content-SHA256"
+        )
+
+    try:
+        document = await DocumentService.create_document(db=db, user=current_user, upload=upload)
+        return DocumentResponse(**document.to_dict())
+    except BlobUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El contenido ya no está almacenado, reintente sin X-Content-SHA256"
+        )
+    except Exception:
+        logger.exception("Error registrando documento")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+
+@router.post("/batch", status_code=status.HTTP_201_CREATED)
+async def upload_documents_batch(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Subir varios documentos en un solo request (multipart/form-data con
+    uno o más campos de archivo). Se autentica una vez, los archivos se
+    escriben a disco mientras llegan y todos los documentos válidos se
+    registran en una única transacción. Retorna el estado de cada archivo.
+    """
+    try:
+        items = await DocumentService.receive_batch(request)
+    except MultipartError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    await DocumentService.create_documents_bulk(db=db, user=current_user, items=items)
+
+    results = [item.to_dict() for item in items]
+    created = sum(1 for result in results if result["status"] == "created")
+    return {
+        "results": results,
+        "created": created,
+        "failed": len(results) - created,
+        "success": created == len(results)
+    }
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Texto a buscar"),
+    page: int = Query(1, ge=1),
+    pageSize: int = Query(20, ge=1, le=100),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Buscar documentos por título, departamento y contenido (ordenado por relevancia)"""
+    hits, has_more = await search_documents(db=db, query=q, page=page, page_size=pageSize)
+    return {
+        "results": [
+            {"document": document.to_dict(), "score": round(score, 4)}
+            for document, score in hits
+        ],
+        "page": page,
+        "pageSize": pageSize,
+        "hasMore": has_more
+    }
+
+
+def _session_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Sesión de upload no encontrada o expirada"
+    )
+
+
+def _session_completing() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="La sesión de upload ya se está finalizando"
+    )
+
+
+@router.post("/uploads", status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    data: CreateUploadSessionRequest,
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Crear una sesión de upload reanudable.
+    Luego enviar el contenido con PATCH (uno o más chunks, en paralelo o
+    en cualquier orden) y cerrar con POST /uploads/{id}/complete.
+    """
+    try:
+        session = await resumable_uploads.create(
+            user_id=current_user.id,
+            filename=data.filename,
+            title=data.title or data.filename,
+            content_type=data.contentType,
+            size=data.size
+        )
+    except TooManyUploadSessions as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)
+        )
+    except UploadSessionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    return session.to_dict()
+
+
+@router.api_route("/uploads/{session_id}", methods=["GET", "HEAD"])
+async def get_upload_session(
+    session_id: str,
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Estado de una sesión: rangos recibidos y faltantes"""
+    try:
+        session = await resumable_uploads.get(session_id, current_user.id)
+    except UploadSessionNotFound:
+        raise _session_not_found()
+    return session.to_dict()
+
+
+@router.patch("/uploads/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_session_chunk(
+    session_id: str,
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Recibir un chunk en el offset indicado por el header `Upload-Offset`"""
+    try:
+        offset = int(request.headers["upload-offset"])
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Header Upload-Offset requerido"
+        )
+
+    try:
+        session = await resumable_uploads.write_chunk(
+            session_id, current_user.id, offset, request.stream()
+        )
+    except UploadSessionNotFound:
+        raise _session_not_found()
+    except UploadAlreadyCompleting:
+        raise _session_completing()
+    except UploadSessionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={
+            "Upload-Offset": str(session.offset),
+            "Upload-Received": str(session.received_bytes),
+        }
+    )
+
+
+@router.post("/uploads/{session_id}/complete", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload_session(
+    session_id: str,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Finalizar la sesión y registrar el documento"""
+    try:
+        session, stored = await resumable_uploads.finalize(session_id, current_user.id)
+    except UploadSessionNotFound:
+        raise _session_not_found()
+    except UploadAlreadyCompleting:
+        raise _session_completing()
+    except UploadWriteInProgress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Hay chunks en curso; reintentar al terminar"
+        )
+    except UploadIncomplete:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El upload aún no está completo"
+        )
+
+    upload = ReceivedUpload(
+        stored=stored,
+        headers=PartHeaders(name="file", filename=session.filename, content_type=session.content_type),
+        fields={"title": session.title}
+    )
+    try:
+        # Si falla, los datos de la sesión se conservan para reintentar
+        document = await DocumentService.create_document(
+            db=db, user=current_user, upload=upload, discard_on_error=False
+        )
+    except Exception:
+        logger.exception("Error registrando documento de upload reanudable")
+        await resumable_uploads.release(session_id, current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+    await resumable_uploads.delete(session_id)
+    return DocumentResponse(**document.to_dict())
+
+
+@router.delete("/uploads/{session_id}")
+async def cancel_upload_session(
+    session_id: str,
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Cancelar una sesión de upload"""
+    try:
+        await resumable_uploads.cancel(session_id, current_user.id)
+    except UploadSessionNotFound:
+        raise _session_not_found()
+    except UploadAlreadyCompleting:
+        raise _session_completing()
+    return {
+        "message": "Sesión de upload cancelada",
+        "success": True
+    }
+
+
+@router.get("/{document_id}", response_model=DocumentResponse)
+async def get_document(
+    document_id: str,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Obtener metadatos de un documento"""
+    document = await DocumentService.get_document(db=db, document_id=document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Documento no encontrado"
+        )
+    return DocumentResponse(**document.to_dict())
+
+
+@router.api_route("/{document_id}/download", methods=["GET", "HEAD"])
+async def download_document(
+    document_id: str,
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Descargar el contenido de un documento.
+    Soporta Range/If-Range (descargas parciales y reanudadas) y
+    If-None-Match (304) con ETag fuerte basado en el SHA-256.
+    """
+    document = await DocumentService.get_document(db=db, document_id=document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Documento no encontrado"
+        )
+
+    etag = etag_for(document.sha256)
+    cache_headers = {"Cache-Control": "private, no-cache"}
+    if if_none_match(request.headers, etag):
+        return not_modified(etag, cache_headers)
+
+    path = document_storage.blob_path(document.sha256)
+    if not path.exists():
+        logger.error("Blob faltante para documento", extra={"document_id": document.id})
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contenido del documento no disponible"
+        )
+
+    return BlobFileResponse(
+        path,
+        media_type=document.content_type,
+        filename=document.original_filename,
+        headers={"ETag": etag, **cache_headers}
+    )
+
+
+@router.get("/{document_id}/jobs")
+async def get_document_jobs(
+    document_id: str,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Estado de los trabajos en segundo plano de un documento (texto, miniatura)"""
+    document = await DocumentService.get_document(db=db, document_id=document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Documento no encontrado"
+        )
+
+    jobs = await get_jobs_for_document(db, document_id)
+    return {
+        "documentId": document_id,
+        "jobs": [job.to_dict() for job in jobs]
+    }
+
+
+@router.get("/{document_id}/thumbnail")
+async def get_document_thumbnail(
+    document_id: str,
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Miniatura PNG del documento (404 mientras no se haya generado)"""
+    document = await DocumentService.get_document(db=db, document_id=document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Documento no encontrado"
+        )
+
+    etag = etag_for(f"{document.sha256}-thumbnail")
+    cache_headers = {"Cache-Control": "private, max-age=86400"}
+    if if_none_match(request.headers, etag):
+        return not_modified(etag, cache_headers)
+
+    path = document_storage.thumbnail_path(document.sha256)
+    if not path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Miniatura no disponible"
+        )
+
+    return BlobFileResponse(path, media_type="image/png", headers={"ETag": etag, **cache_headers})
+
+
+@router.delete("/{document_id}")
+async def delete_document(
+    document_id: str,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Eliminar un documento (autor o admin)"""
+    document = await DocumentService.get_document(db=db, document_id=document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Documento no encontrado"
+        )
+
+    if document.uploaded_by != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tiene permisos para eliminar este documento"
+        )
+
+    try:
+        await DocumentService.delete_document(db=db, document=document)
+    except Exception:
+        logger.exception("Error eliminando documento")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor"
+        )
+
+    return {
+        "message": "Documento eliminado",
+        "success": True
+    }
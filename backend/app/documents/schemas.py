@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class DocumentResponse(BaseModel):
+    """Schema para response de documento"""
+    id: str
+    title: str
+    originalFilename: str
+    contentType: str
+    size: int
+    sha256: str
+    departmentId: str
+    departmentName: str
+    uploadedBy: str
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CreateUploadSessionRequest(BaseModel):
+    """Schema para crear una sesión de upload reanudable"""
+    filename: str = Field(..., min_length=1, max_length=255, description="Nombre del archivo")
+    size: int = Field(..., ge=0, description="Tamaño total en bytes")
+    title: Optional[str] = Field(default=None, max_length=255, description="Título del documento")
+    contentType: str = Field(default="application/octet-stream", max_length=100)
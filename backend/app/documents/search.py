@@ -0,0 +1,153 @@
+# backend/app/documents/search.py
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Tuple
+import re
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.documents.models import Document, DocumentSearchEntry
+
+# Palabras de la consulta (letras/números, incluye acentos)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Máximo de términos de una consulta
+MAX_QUERY_TERMS = 16
+
+SearchHit = Tuple[Document, float]
+
+
+class SearchIndex(ABC):
+    """
+    Índice full-text de documentos.
+
+    Las entradas viven en `document_search` y se actualizan dentro de la
+    misma transacción que el documento (alta, baja o texto extraído); cada
+    backend solo cambia cómo se consulta.
+    """
+
+    async def add(self, db: AsyncSession, document: Document, body: str = "") -> None:
+        """Indexar un documento nuevo (sin hacer commit)"""
+        db.add(DocumentSearchEntry(
+            document_id=document.id,
+            title=document.title,
+            department_name=document.department_name,
+            body=body
+        ))
+
+    async def add_many(self, db: AsyncSession, rows: Sequence[dict]) -> None:
+        """Indexar documentos insertados en lote (filas de `documents`)"""
+        if rows:
+            await db.execute(DocumentSearchEntry.__table__.insert(), [
+                {
+                    "document_id": row["id"],
+                    "title": row["title"],
+                    "department_name": row["department_name"],
+                    "body": "",
+                    "updated_at": row["updated_at"],
+                }
+                for row in rows
+            ])
+
+    async def update_body(self, db: AsyncSession, document_id: str, body: str) -> None:
+        """Actualizar el texto extraído de un documento (sin hacer commit)"""
+        await db.execute(
+            update(DocumentSearchEntry)
+            .where(DocumentSearchEntry.document_id == document_id)
+            .values(body=body)
+        )
+
+    async def remove(self, db: AsyncSession, document_id: str) -> None:
+        """Quitar un documento del índice (sin hacer commit)"""
+        await db.execute(delete(DocumentSearchEntry).where(DocumentSearchEntry.document_id == document_id))
+
+    @abstractmethod
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int) -> List[SearchHit]:
+        """Documentos que coinciden con la consulta, con su puntaje"""
+
+
+class MySQLFullTextIndex(SearchIndex):
+    """Búsqueda con índice FULLTEXT de MySQL (modo lenguaje natural)"""
+
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int) -> List[SearchHit]:
+        score = mysql.match(
+            DocumentSearchEntry.title,
+            DocumentSearchEntry.department_name,
+            DocumentSearchEntry.body,
+            against=query
+        ).in_natural_language_mode()
+
+        result = await db.execute(
+            select(Document, score.label("score"))
+            .join(DocumentSearchEntry, DocumentSearchEntry.document_id == Document.id)
+            .where(score > 0)
+            .order_by(score.desc(), Document.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return [(document, float(rank)) for document, rank in result.all()]
+
+
+class SQLiteFTSIndex(SearchIndex):
+    """Búsqueda con FTS5 de SQLite (sustituto local), ordenada por BM25"""
+
+    async def search(self, db: AsyncSession, query: str, limit: int, offset: int) -> List[SearchHit]:
+        # Cada término entre comillas evita la sintaxis de consulta de FTS5;
+        # el último término admite prefijo para búsqueda mientras se escribe
+        terms = [f'"{token}"' for token in tokenize(query)]
+        terms[-1] += "*"
+        ranked = await db.execute(
+            text(
+                "SELECT rowid, bm25(document_search_fts) AS rank FROM document_search_fts "
+                "WHERE document_search_fts MATCH :match ORDER BY rank LIMIT :limit OFFSET :offset"
+            ),
+            {"match": " ".join(terms), "limit": limit, "offset": offset}
+        )
+        ranks = {row.rowid: row.rank for row in ranked}
+        if not ranks:
+            return []
+
+        result = await db.execute(
+            select(Document, DocumentSearchEntry.id)
+            .join(DocumentSearchEntry, DocumentSearchEntry.document_id == Document.id)
+            .where(DocumentSearchEntry.id.in_(ranks))
+        )
+        # bm25() es negativo: más bajo = más relevante
+        hits = [(document, -float(ranks[entry_id])) for document, entry_id in result.all()]
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return hits
+
+
+def tokenize(query: str) -> List[str]:
+    """Términos de búsqueda normalizados de una consulta"""
+    return _TOKEN_RE.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+def _create_index() -> SearchIndex:
+    if settings.DB_DIALECT == "sqlite":
+        return SQLiteFTSIndex()
+    return MySQLFullTextIndex()
+
+
+search_index = _create_index()
+
+
+async def search_documents(
+    db: AsyncSession,
+    query: str,
+    page: int,
+    page_size: int
+) -> Tuple[List[SearchHit], bool]:
+    """
+    Buscar documentos por título, departamento y texto extraído.
+    Retorna los resultados de la página y si hay más páginas.
+    """
+    if not tokenize(query):
+        return [], False
+
+    offset = (page - 1) * page_size
+    # Se pide un resultado extra para saber si hay otra página sin COUNT(*)
+    hits = await search_index.search(db, query, limit=page_size + 1, offset=offset)
+    return hits[:page_size], len(hits) > page_size
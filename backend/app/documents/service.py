@@ -0,0 +1,420 @@
+# backend/app/documents/service.py
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import PurePath
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import re
+import uuid
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.pagination import FieldSelection, column_field, datetime_field, paginate
+from app.documents.models import Document, DocumentBlob
+from app.documents.multipart import MultipartError, PartHeaders, iter_multipart
+from app.documents.search import search_index
+from app.core.config import settings
+from app.documents.storage import ChunkedFileWriter, FileTooLarge, StoredFile, document_storage
+from app.jobs import queue as job_queue
+from app.jobs.models import JobKind
+from app.jobs.worker import job_worker
+from app.users.cache import UserSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Tamaño máximo de un campo de texto del formulario (título, etc.)
+MAX_FORM_FIELD_SIZE = 4096
+
+# Trabajos en segundo plano de cada documento nuevo
+DOCUMENT_JOBS = [kind.value for kind in JobKind]
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Campos disponibles en el listado de documentos (mismos nombres que `Document.to_dict`)
+DOCUMENT_LIST_FIELDS = FieldSelection(
+    fields={
+        "id": column_field(Document.id),
+        "title": column_field(Document.title),
+        "originalFilename": column_field(Document.original_filename),
+        "contentType": column_field(Document.content_type),
+        "size": column_field(Document.size_bytes),
+        "sha256": column_field(Document.sha256),
+        "departmentId": column_field(Document.department_id),
+        "departmentName": column_field(Document.department_name),
+        "uploadedBy": column_field(Document.uploaded_by),
+        "createdAt": datetime_field(Document.created_at),
+        "updatedAt": datetime_field(Document.updated_at),
+    },
+    default=[
+        "id", "title", "originalFilename", "contentType", "size", "sha256",
+        "departmentId", "departmentName", "uploadedBy", "createdAt", "updatedAt",
+    ],
+    required=[Document.id, Document.created_at]
+)
+
+
+class BlobUnavailable(Exception):
+    """El blob declarado por hash dejó de existir antes de referenciarlo"""
+
+
+@dataclass
+class ReceivedUpload:
+    """Upload recibido: archivo en disco y campos de texto del formulario"""
+    stored: StoredFile
+    headers: PartHeaders
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class BatchItem:
+    """Resultado por archivo de un upload en lote"""
+    headers: PartHeaders
+    stored: Optional[StoredFile] = None
+    document: Optional[Document] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convertir a diccionario"""
+        return {
+            "filename": self.headers.filename,
+            "status": "created" if self.document is not None else "error",
+            "document": self.document.to_dict() if self.document is not None else None,
+            "error": self.error,
+        }
+
+
+def _document_fields(user: UserSnapshot, headers: PartHeaders, stored: StoredFile, title: str = "") -> dict:
+    """Columnas de un documento nuevo a partir de su upload"""
+    filename = PurePath(headers.filename or "archivo").name
+    return {
+        "title": (title.strip() or filename)[:255],
+        "original_filename": filename[:255],
+        "content_type": headers.content_type[:100],
+        "size_bytes": stored.size_bytes,
+        "sha256": stored.sha256,
+        "department_id": user.department_id,
+        "department_name": user.department_name,
+        "uploaded_by": user.id,
+    }
+
+
+class DocumentService:
+
+    @staticmethod
+    async def receive_upload(request: Request) -> ReceivedUpload:
+        """
+        Recibir un upload multipart con un único archivo (campo `file`).
+
+        El archivo se escribe a disco mientras llega; los campos de texto
+        (p. ej. `title`) pueden venir antes o después del archivo. Si el
+        cliente envía `X-Content-SHA256` y ese contenido ya está almacenado,
+        los bytes solo se verifican, sin escribirlos de nuevo.
+        """
+        declared_sha256 = (request.headers.get("x-content-sha256") or "").lower() or None
+        if declared_sha256 is not None and not _SHA256_RE.match(declared_sha256):
+            raise MultipartError("X-Content-SHA256 inválido")
+        if declared_sha256 is not None and not document_storage.blob_exists(declared_sha256):
+            declared_sha256 = None
+
+        fields: Dict[str, str] = {}
+        writer: Optional[ChunkedFileWriter] = None
+        file_headers: Optional[PartHeaders] = None
+        stored: Optional[StoredFile] = None
+        current: Optional[PartHeaders] = None
+        field_value = bytearray()
+
+        try:
+            async for kind, payload in iter_multipart(request):
+                if kind == "begin":
+                    current = payload
+                    if current.is_file:
+                        if file_headers is not None:
+                            raise MultipartError("Solo se admite un archivo por request")
+                        file_headers = current
+                        writer = await document_storage.new_writer(expected_sha256=declared_sha256)
+                elif kind == "data":
+                    if current.is_file:
+                        await writer.write(payload)
+                    else:
+                        field_value.extend(payload)
+                        if len(field_value) > MAX_FORM_FIELD_SIZE:
+                            raise MultipartError(f"Campo demasiado largo: {current.name}")
+                elif kind == "end":
+                    if current.is_file:
+                        stored = await writer.finalize()
+                    else:
+                        fields[current.name] = field_value.decode("utf-8", "replace")
+                        field_value.clear()
+            if stored is None:
+                raise MultipartError("No se recibió ningún archivo")
+        except BaseException:
+            if writer is not None and stored is None:
+                writer.abort()
+            raise
+
+        return ReceivedUpload(stored=stored, headers=file_headers, fields=fields)
+
+    @staticmethod
+    async def _acquire_blob(db: AsyncSession, stored: StoredFile, references: int = 1) -> None:
+        """Sumar referencias al blob, creándolo si es contenido nuevo"""
+        increment = (
+            update(DocumentBlob)
+            .where(DocumentBlob.sha256 == stored.sha256)
+            .values(ref_count=DocumentBlob.ref_count + references)
+        )
+        result = await db.execute(increment)
+        if result.rowcount:
+            return
+
+        if stored.temp_path is None:
+            # Se verificó contra un blob existente que ya fue reclamado
+            raise BlobUnavailable()
+
+        try:
+            async with db.begin_nested():
+                db.add(DocumentBlob(sha256=stored.sha256, size_bytes=stored.size_bytes, ref_count=references))
+        except IntegrityError:
+            # Otro upload concurrente creó el mismo blob
+            await db.execute(increment)
+
+    @staticmethod
+    async def create_document(
+        db: AsyncSession,
+        user: UserSnapshot,
+        upload: ReceivedUpload,
+        discard_on_error: bool = True
+    ) -> Document:
+        """Registrar un documento y publicar su contenido en el almacén"""
+        title = upload.fields.get("title", "")
+        document = Document(**_document_fields(user, upload.headers, upload.stored, title))
+
+        published = False
+        try:
+            await DocumentService._acquire_blob(db, upload.stored)
+            db.add(document)
+            await db.flush()
+            await search_index.add(db, document)
+            await job_queue.enqueue(db, [document.id], DOCUMENT_JOBS)
+            # Antes del commit: al ser visible el documento su contenido ya
+            # está en el almacén (descargas, worker de trabajos)
+            published = await run_in_threadpool(document_storage.publish, upload.stored)
+            await db.commit()
+        except Exception:
+            if published:
+                # Aún con la fila del blob bloqueada: nadie más lo referencia
+                await run_in_threadpool(document_storage.unpublish, upload.stored)
+            await db.rollback()
+            if discard_on_error:
+                document_storage.discard(upload.stored)
+            raise
+
+        # Contenido ya existente (deduplicación): el temporal sobra
+        await run_in_threadpool(document_storage.discard, upload.stored)
+        job_worker.notify()
+
+        logger.info("Documento subido", extra={"document_id": document.id, "size": document.size_bytes})
+        return document
+
+    @staticmethod
+    async def receive_batch(request: Request) -> List[BatchItem]:
+        """
+        Recibir un upload multipart con varios archivos.
+
+        Cada parte se escribe a disco mientras llega; el cierre durable de
+        una parte (flush + fsync) corre en paralelo con la recepción de la
+        siguiente. Un archivo inválido (p. ej. demasiado grande) se marca
+        con error sin interrumpir el resto del lote.
+        """
+        items: List[BatchItem] = []
+        finalizing: List[Tuple[BatchItem, asyncio.Task]] = []
+        current: Optional[PartHeaders] = None
+        item: Optional[BatchItem] = None
+        writer: Optional[ChunkedFileWriter] = None
+
+        try:
+            async for kind, payload in iter_multipart(request):
+                if kind == "begin":
+                    current = payload
+                    if not current.is_file:
+                        continue
+                    if len(items) >= settings.BATCH_UPLOAD_MAX_FILES:
+                        raise MultipartError(
+                            f"Máximo {settings.BATCH_UPLOAD_MAX_FILES} archivos por lote"
+                        )
+                    item = BatchItem(headers=current)
+                    items.append(item)
+                    if not current.filename:
+                        item.error = "Parte sin nombre de archivo"
+                    else:
+                        writer = await document_storage.new_writer()
+                elif kind == "data":
+                    if current.is_file and writer is not None:
+                        try:
+                            await writer.write(payload)
+                        except FileTooLarge:
+                            writer.abort()
+                            writer = None
+                            item.error = f"El archivo supera el máximo de {settings.MAX_FILE_SIZE} bytes"
+                elif kind == "end":
+                    if current.is_file and writer is not None:
+                        finalizing.append((item, asyncio.create_task(writer.finalize())))
+                        writer = None
+            if not items:
+                raise MultipartError("No se recibió ningún archivo")
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            tasks = [task for _, task in finalizing]
+            for stored in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(stored, StoredFile):
+                    document_storage.discard(stored)
+            raise
+
+        results = await asyncio.gather(*(task for _, task in finalizing), return_exceptions=True)
+        for (finished, _), stored in zip(finalizing, results):
+            if isinstance(stored, StoredFile):
+                finished.stored = stored
+            else:
+                logger.error("Error almacenando archivo del lote: %s", stored)
+                finished.error = "Error almacenando el archivo"
+        return items
+
+    @staticmethod
+    async def create_documents_bulk(db: AsyncSession, user: UserSnapshot, items: List[BatchItem]) -> None:
+        """
+        Registrar los archivos válidos de un lote en una sola transacción
+        (INSERT masivo) y publicar su contenido en el almacén.
+        El resultado de cada archivo queda en su `BatchItem`.
+        """
+        accepted = [item for item in items if item.stored is not None]
+        if not accepted:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "created_at": now,
+                "updated_at": now,
+                **_document_fields(user, item.headers, item.stored),
+            }
+            for item in accepted
+        ]
+
+        references = Counter(item.stored.sha256 for item in accepted)
+        stored_by_hash = {item.stored.sha256: item.stored for item in accepted}
+
+        published: List[StoredFile] = []
+        try:
+            for sha256, count in references.items():
+                await DocumentService._acquire_blob(db, stored_by_hash[sha256], references=count)
+            await db.execute(insert(Document), rows)
+            await search_index.add_many(db, rows)
+            await job_queue.enqueue(db, [row["id"] for row in rows], DOCUMENT_JOBS)
+            # Un archivo por contenido distinto; los duplicados del lote se descartan
+            for stored in stored_by_hash.values():
+                if await run_in_threadpool(document_storage.publish, stored):
+                    published.append(stored)
+            await db.commit()
+        except Exception:
+            for stored in published:
+                await run_in_threadpool(document_storage.unpublish, stored)
+            await db.rollback()
+            logger.exception("Error registrando lote de documentos")
+            for item in accepted:
+                document_storage.discard(item.stored)
+                item.stored = None
+                item.error = "Error registrando el documento"
+            return
+
+        await asyncio.gather(*(
+            run_in_threadpool(document_storage.discard, item.stored) for item in accepted
+        ))
+        job_worker.notify()
+
+        for item, row in zip(accepted, rows):
+            item.document = Document(**row)
+
+        logger.info("Lote de documentos subido", extra={"documents_created": len(accepted), "files": len(items)})
+
+    @staticmethod
+    async def delete_document(db: AsyncSession, document: Document) -> bool:
+        """
+        Eliminar un documento y liberar su referencia al blob.
+        El espacio se recupera solo cuando se elimina la última referencia.
+        Retorna True si el contenido fue eliminado del almacén.
+        """
+        sha256 = document.sha256
+        trash_path = None
+
+        try:
+            # Bloquear la fila del blob serializa altas y bajas concurrentes
+            result = await db.execute(
+                select(DocumentBlob).where(DocumentBlob.sha256 == sha256).with_for_update()
+            )
+            blob = result.scalar_one()
+
+            await search_index.remove(db, document.id)
+            await db.delete(document)
+            await db.flush()
+
+            blob.ref_count -= 1
+            if blob.ref_count <= 0:
+                await db.delete(blob)
+                await db.flush()
+                # Apartar el archivo mientras se mantiene el lock: un upload
+                # concurrente del mismo contenido lo volverá a publicar
+                blob_path = document_storage.blob_path(sha256)
+                if blob_path.exists():
+                    trash_path = document_storage.temp_dir / f"{uuid.uuid4()}.trash"
+                    await run_in_threadpool(os.replace, blob_path, trash_path)
+
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            if trash_path is not None:
+                await run_in_threadpool(os.replace, trash_path, document_storage.blob_path(sha256))
+            raise
+
+        if trash_path is not None:
+            await run_in_threadpool(trash_path.unlink, True)
+            await run_in_threadpool(document_storage.thumbnail_path(sha256).unlink, True)
+            logger.info("Blob eliminado", extra={"sha256": sha256})
+
+        logger.info("Documento eliminado", extra={"document_id": document.id})
+        return trash_path is not None
+
+    @staticmethod
+    async def list_documents(
+        db: AsyncSession,
+        fields: List[str],
+        limit: int,
+        cursor: Optional[str] = None,
+        department_id: Optional[str] = None,
+        uploaded_by: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Listar documentos (más recientes primero) paginando por cursor.
+        Retorna los documentos serializados y el cursor de la página siguiente.
+        """
+        statement = select(Document).options(DOCUMENT_LIST_FIELDS.load_options(fields))
+        if department_id is not None:
+            statement = statement.where(Document.department_id == department_id)
+        if uploaded_by is not None:
+            statement = statement.where(Document.uploaded_by == uploaded_by)
+
+        documents, next_cursor = await paginate(db, statement, Document, limit=limit, cursor=cursor)
+        return [DOCUMENT_LIST_FIELDS.serialize(document, fields) for document in documents], next_cursor
+
+    @staticmethod
+    async def get_document(db: AsyncSession, document_id: str) -> Optional[Document]:
+        """Obtener documento por ID"""
+        result = await db.execute(select(Document).where(Document.id == document_id))
+        return result.scalar_one_or_none()
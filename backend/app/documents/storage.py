@@ -0,0 +1,199 @@
+# backend/app/documents/storage.py
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import hashlib
+import logging
+import os
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FileTooLarge(Exception):
+    """El archivo supera MAX_FILE_SIZE"""
+
+
+class ContentMismatch(Exception):
+    """El contenido recibido no coincide con el hash declarado"""
+
+
+@dataclass
+class StoredFile:
+    """Upload recibido completo, pendiente de publicarse en el almacén"""
+    sha256: str
+    size_bytes: int
+    temp_path: Optional[Path]  # None si el contenido ya existía y no se escribió
+    durable: bool = True  # False si no se hizo fsync (el blob existía al recibirlo)
+
+
+class ChunkedFileWriter:
+    """
+    Escritor incremental de un upload.
+
+    Acumula los fragmentos recibidos hasta `chunk_size` y los escribe en un
+    archivo temporal desde el threadpool, calculando el SHA-256 y validando
+    el tamaño máximo a medida que llegan. La memoria usada por upload queda
+    acotada a un chunk, sin importar el tamaño del archivo.
+
+    Si el cliente declara un hash cuyo blob ya existe (`expected_sha256`),
+    el contenido solo se hashea para verificarlo y no se escribe a disco.
+    """
+
+    def __init__(
+        self,
+        storage: "DocumentStorage",
+        max_size: int,
+        chunk_size: int,
+        expected_sha256: Optional[str] = None
+    ):
+        self.storage = storage
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.expected_sha256 = expected_sha256
+        self.size_bytes = 0
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self.temp_path: Optional[Path] = None
+        self._file = None
+
+    async def open(self) -> None:
+        """Crear el archivo temporal (desde el threadpool: no bloquea el event loop)"""
+        if self.expected_sha256 is None:
+            self.temp_path = self.storage.temp_dir / f"{uuid.uuid4()}.part"
+            self._file = await run_in_threadpool(open, self.temp_path, "wb")
+
+    async def write(self, data: bytes) -> None:
+        """Agregar datos al upload"""
+        self.size_bytes += len(data)
+        if self.size_bytes > self.max_size:
+            raise FileTooLarge()
+
+        self._hash.update(data)
+        if self._file is None:
+            return
+
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if self._buffer:
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            await run_in_threadpool(self._file.write, chunk)
+
+    async def finalize(self) -> StoredFile:
+        """Cerrar el archivo temporal (durable solo si el blob es nuevo)"""
+        sha256 = self._hash.hexdigest()
+        if self.expected_sha256 is not None and sha256 != self.expected_sha256:
+            raise ContentMismatch()
+
+        durable = True
+        if self._file is not None:
+            await self._flush()
+            durable = not self.storage.blob_exists(sha256)
+            await run_in_threadpool(self._close, durable)
+
+        return StoredFile(sha256=sha256, size_bytes=self.size_bytes, temp_path=self.temp_path, durable=durable)
+
+    def _close(self, durable: bool) -> None:
+        self._file.flush()
+        if durable:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+    def abort(self) -> None:
+        """Descartar el upload y su archivo temporal"""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        if self.temp_path is not None:
+            self.temp_path.unlink(missing_ok=True)
+
+
+class DocumentStorage:
+    """
+    Almacén de contenido direccionado por SHA-256 bajo UPLOAD_DIR.
+
+    Cada contenido distinto se guarda una única vez en
+    `blobs/<aa>/<bb>/<sha256>`; los documentos lo referencian por hash.
+    """
+
+    def __init__(self, upload_dir: str):
+        self.root = Path(upload_dir)
+        self.blobs_dir = self.root / "blobs"
+        self.temp_dir = self.root / "tmp"
+        self.thumbnails_dir = self.root / "thumbnails"
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+
+    async def new_writer(
+        self,
+        max_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None
+    ) -> ChunkedFileWriter:
+        """Iniciar la escritura de un nuevo upload"""
+        writer = ChunkedFileWriter(
+            self,
+            max_size=max_size or settings.MAX_FILE_SIZE,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+            expected_sha256=expected_sha256
+        )
+        await writer.open()
+        return writer
+
+    def blob_path(self, sha256: str) -> Path:
+        """Ruta absoluta del blob para un hash"""
+        return self.blobs_dir / sha256[:2] / sha256[2:4] / sha256
+
+    def blob_exists(self, sha256: str) -> bool:
+        return self.blob_path(sha256).exists()
+
+    def thumbnail_path(self, sha256: str) -> Path:
+        """Ruta de la miniatura PNG de un contenido (compartida entre duplicados)"""
+        return self.thumbnails_dir / sha256[:2] / sha256[2:4] / f"{sha256}.png"
+
+    def publish(self, stored: StoredFile) -> bool:
+        """
+        Publicar un upload en el almacén, antes del commit y con la fila del
+        blob bloqueada por la transacción.
+        Si el blob ya existe no se reescriben bytes: el temporal queda para
+        `discard`. Retorna True si este upload creó el blob.
+        """
+        if stored.temp_path is None:
+            return False
+
+        destination = self.blob_path(stored.sha256)
+        if destination.exists():
+            return False
+
+        if not stored.durable:
+            # El blob existente al recibirlo ya no está: esta copia pasa a ser la única
+            with open(stored.temp_path, "rb") as temp:
+                os.fsync(temp.fileno())
+            stored.durable = True
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(stored.temp_path, destination)
+        return True
+
+    def unpublish(self, stored: StoredFile) -> None:
+        """Devolver al temporal un blob creado por `publish` (antes del rollback)"""
+        os.replace(self.blob_path(stored.sha256), stored.temp_path)
+
+    def discard(self, stored: StoredFile) -> None:
+        """Descartar un upload no publicado"""
+        if stored.temp_path is not None:
+            stored.temp_path.unlink(missing_ok=True)
+
+    def delete_blob(self, sha256: str) -> None:
+        """Eliminar el contenido de un blob sin referencias"""
+        try:
+            self.blob_path(sha256).unlink(missing_ok=True)
+        except OSError:
+            logger.exception("No se pudo eliminar blob", extra={"sha256": sha256})
+
+
+document_storage = DocumentStorage(settings.UPLOAD_DIR)
@@ -0,0 +1,87 @@
+# backend/app/jobs/handlers.py
+from typing import Awaitable, Callable, Dict, Optional, TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.documents.models import Document, DocumentSearchEntry
+from app.documents.search import search_index
+from app.documents.storage import document_storage
+from app.jobs import tasks
+from app.jobs.models import Job, JobKind
+
+if TYPE_CHECKING:
+    from app.jobs.worker import JobWorker
+
+
+class JobSkipped(Exception):
+    """El trabajo no aplica a este documento"""
+
+
+# Un handler procesa un trabajo y retorna un resumen corto del resultado
+JobHandler = Callable[["JobWorker", AsyncSession, Job], Awaitable[Optional[str]]]
+
+
+async def _load_document(db: AsyncSession, job: Job) -> Document:
+    document = await db.get(Document, job.document_id)
+    if document is None:
+        raise JobSkipped("Documento eliminado")
+    if not document_storage.blob_exists(document.sha256):
+        raise JobSkipped("Contenido no disponible")
+    return document
+
+
+async def extract_text(worker: "JobWorker", db: AsyncSession, job: Job) -> Optional[str]:
+    """Extraer el texto del archivo y agregarlo al índice de búsqueda"""
+    document = await _load_document(db, job)
+
+    # Contenido deduplicado: reutilizar el texto ya extraído de otra copia
+    result = await db.execute(
+        select(DocumentSearchEntry.body)
+        .join(Document, Document.id == DocumentSearchEntry.document_id)
+        .where(
+            Document.sha256 == document.sha256,
+            Document.id != document.id,
+            DocumentSearchEntry.body != ""
+        )
+        .limit(1)
+    )
+    body = result.scalar_one_or_none()
+
+    if body is None:
+        path = str(document_storage.blob_path(document.sha256))
+        body = await worker.run_in_process(
+            tasks.extract_text, path, document.content_type, settings.MAX_EXTRACTED_TEXT_CHARS
+        )
+        if not body.strip():
+            raise JobSkipped("Sin texto extraíble")
+
+    await search_index.update_body(db, document.id, body)
+    await db.commit()
+    return f"{len(body)} caracteres"
+
+
+async def render_thumbnail(worker: "JobWorker", db: AsyncSession, job: Job) -> Optional[str]:
+    """Generar la miniatura de vista previa del documento"""
+    document = await _load_document(db, job)
+    destination = document_storage.thumbnail_path(document.sha256)
+    if destination.exists():
+        return "Miniatura existente"
+
+    rendered = await worker.run_in_process(
+        tasks.render_thumbnail,
+        str(document_storage.blob_path(document.sha256)),
+        document.content_type,
+        str(destination),
+        settings.THUMBNAIL_SIZE
+    )
+    if not rendered:
+        raise JobSkipped("Tipo de archivo sin miniatura")
+    return "Miniatura generada"
+
+
+HANDLERS: Dict[str, JobHandler] = {
+    JobKind.EXTRACT_TEXT.value: extract_text,
+    JobKind.THUMBNAIL.value: render_thumbnail,
+}
@@ -0,0 +1,69 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey, Index
+from sqlalchemy.dialects.mysql import CHAR
+from datetime import datetime
+import enum
+
+from app.database.connection import Base
+
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class JobKind(str, enum.Enum):
+    EXTRACT_TEXT = "extract_text"  # Texto para la búsqueda full-text
+    THUMBNAIL = "thumbnail"  # Miniatura de vista previa
+
+
+class Job(Base):
+    """Trabajo en segundo plano asociado a un documento (cola en base de datos)"""
+    __tablename__ = "jobs"
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Trabajo
+    kind = Column(String(50), nullable=False)  # p. ej. "extract_text", "thumbnail"
+    document_id = Column(CHAR(36), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Estado y reintentos
+    status = Column(String(20), default=JobStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(String(255), nullable=True)
+
+    # Metadatos
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Búsqueda del siguiente trabajo listo para ejecutarse
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.kind} {self.status}>"
+
+    def to_dict(self) -> dict:
+        """Convertir a diccionario"""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "documentId": self.document_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "maxAttempts": self.max_attempts,
+            "lastError": self.last_error,
+            "result": self.result,
+            "runAfter": self.run_after.isoformat() if self.run_after else None,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,169 @@
+# backend/app/jobs/queue.py
+"""
+Cola de trabajos respaldada por la tabla `jobs`.
+
+No requiere un broker externo: los trabajos se encolan en la misma
+transacción que el documento y cualquier proceso de la API puede
+reclamarlos con un UPDATE condicional (solo uno gana).
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.jobs.models import Job, JobStatus
+
+# Longitud máxima del error guardado por intento
+MAX_ERROR_LENGTH = 2000
+
+
+async def enqueue(db: AsyncSession, document_ids: Iterable[str], kinds: Iterable[str]) -> None:
+    """Encolar trabajos para documentos (sin hacer commit)"""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "kind": kind,
+            "document_id": document_id,
+            "status": JobStatus.PENDING.value,
+            "attempts": 0,
+            "max_attempts": settings.JOB_MAX_ATTEMPTS,
+            "run_after": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for document_id in document_ids
+        for kind in kinds
+    ]
+    if rows:
+        await db.execute(insert(Job), rows)
+
+
+async def claim_next(db: AsyncSession, worker_id: str, kinds: Iterable[str]) -> Optional[Job]:
+    """
+    Reclamar el siguiente trabajo listo para ejecutarse.
+    El UPDATE solo afecta la fila si sigue pendiente, por lo que dos
+    workers nunca reclaman el mismo trabajo.
+    """
+    kinds = list(kinds)
+    while True:
+        now = datetime.utcnow()
+        candidates = await db.execute(
+            select(Job.id)
+            .where(Job.status == JobStatus.PENDING.value, Job.run_after <= now, Job.kind.in_(kinds))
+            .order_by(Job.run_after, Job.id)
+            .limit(5)
+        )
+        job_ids = candidates.scalars().all()
+        if not job_ids:
+            await db.commit()
+            return None
+
+        for job_id in job_ids:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JobStatus.PENDING.value)
+                .values(
+                    status=JobStatus.RUNNING.value,
+                    attempts=Job.attempts + 1,
+                    locked_by=worker_id,
+                    locked_at=now,
+                    updated_at=now
+                )
+            )
+            if result.rowcount:
+                await db.commit()
+                return await db.get(Job, job_id, populate_existing=True)
+        # Otro worker ganó todos los candidatos: reintentar con los siguientes
+        await db.commit()
+
+
+async def mark_succeeded(db: AsyncSession, job: Job, result: Optional[str] = None) -> None:
+    """Marcar un trabajo como terminado"""
+    await _finish(db, job, JobStatus.SUCCEEDED, result=result)
+
+
+async def mark_skipped(db: AsyncSession, job: Job, reason: str) -> None:
+    """Marcar un trabajo que no aplica (tipo de archivo o dependencia ausente)"""
+    await _finish(db, job, JobStatus.SKIPPED, result=reason[:255])
+
+
+async def mark_failed(db: AsyncSession, job: Job, error: str) -> None:
+    """
+    Registrar un intento fallido. Si quedan intentos, el trabajo vuelve a
+    la cola con backoff exponencial; si no, queda como fallido.
+    """
+    if job.attempts < job.max_attempts:
+        delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        await _finish(
+            db, job, JobStatus.PENDING,
+            error=error,
+            run_after=datetime.utcnow() + timedelta(seconds=delay)
+        )
+    else:
+        await _finish(db, job, JobStatus.FAILED, error=error)
+
+
+async def _finish(
+    db: AsyncSession,
+    job: Job,
+    job_status: JobStatus,
+    result: Optional[str] = None,
+    error: Optional[str] = None,
+    run_after: Optional[datetime] = None
+) -> None:
+    values = {
+        "status": job_status.value,
+        "locked_by": None,
+        "locked_at": None,
+        "updated_at": datetime.utcnow(),
+    }
+    if result is not None:
+        values["result"] = result
+    if error is not None:
+        values["last_error"] = error[:MAX_ERROR_LENGTH]
+    if run_after is not None:
+        values["run_after"] = run_after
+
+    # Solo el dueño del lock puede cerrar el trabajo
+    await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.locked_by == job.locked_by, Job.status == JobStatus.RUNNING.value)
+        .values(**values)
+    )
+    await db.commit()
+
+
+async def release_stale(db: AsyncSession) -> int:
+    """
+    Devolver a la cola los trabajos cuyo worker murió sin cerrarlos.
+    Retorna la cantidad de trabajos recuperados.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+    result = await db.execute(
+        update(Job)
+        .where(Job.status == JobStatus.RUNNING.value, Job.locked_at < cutoff)
+        .values(status=JobStatus.PENDING.value, locked_by=None, locked_at=None, last_error="Tiempo de ejecución agotado")
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def release_worker(db: AsyncSession, worker_id: str) -> int:
+    """Devolver a la cola los trabajos en curso de un worker que se detiene"""
+    result = await db.execute(
+        update(Job)
+        .where(Job.status == JobStatus.RUNNING.value, Job.locked_by == worker_id)
+        .values(status=JobStatus.PENDING.value, locked_by=None, locked_at=None)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def get_jobs_for_document(db: AsyncSession, document_id: str) -> List[Job]:
+    """Trabajos de un documento, del más antiguo al más reciente"""
+    result = await db.execute(
+        select(Job).where(Job.document_id == document_id).order_by(Job.id)
+    )
+    return list(result.scalars().all())
@@ -0,0 +1,80 @@
+# backend/app/jobs/tasks.py
+"""
+Funciones CPU-intensivas que se ejecutan en el pool de procesos.
+
+Este módulo no importa nada de la aplicación para que los procesos
+hijos arranquen rápido y sin abrir conexiones a la base de datos.
+"""
+from pathlib import Path
+import os
+import uuid
+
+
+class MissingDependency(Exception):
+    """Falta una dependencia opcional para procesar este tipo de archivo"""
+
+
+def extract_text(path: str, content_type: str, max_chars: int) -> str:
+    """Extraer texto plano de un archivo (PDF o texto)"""
+    if content_type == "application/pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise MissingDependency("pypdf no está instalado")
+
+        parts = []
+        length = 0
+        for page in PdfReader(path).pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            length += len(text)
+            if length >= max_chars:
+                break
+        return "\n".join(parts)[:max_chars]
+
+    if content_type.startswith("text/"):
+        with open(path, "rb") as source:
+            return source.read(max_chars * 4).decode("utf-8", "replace")[:max_chars]
+
+    return ""
+
+
+def render_thumbnail(path: str, content_type: str, destination: str, size: int) -> bool:
+    """
+    Generar una miniatura PNG (imágenes con Pillow, PDFs con pypdfium2).
+    Retorna False si el tipo de archivo no admite miniatura.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise MissingDependency("Pillow no está instalado")
+
+    if content_type.startswith("image/"):
+        image = Image.open(path)
+    elif content_type == "application/pdf":
+        try:
+            import pypdfium2
+        except ImportError:
+            raise MissingDependency("pypdfium2 no está instalado")
+        pdf = pypdfium2.PdfDocument(path)
+        if len(pdf) == 0:
+            return False  # PDF sin páginas: nada que mostrar
+        image = pdf[0].render(scale=1).to_pil()
+    else:
+        return False
+
+    image.thumbnail((size, size))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    target = Path(destination)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Nombre único: dos trabajos del mismo documento no comparten el temporal
+    temp = target.with_name(f"{uuid.uuid4()}.tmp")
+    try:
+        image.save(temp, format="PNG", optimize=True)
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return True
@@ -0,0 +1,218 @@
+# backend/app/jobs/worker.py
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Optional, Set
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+
+from app.core.config import settings
+from app.database.connection import AsyncSessionLocal
+from app.jobs import queue
+from app.jobs.handlers import HANDLERS, JobHandler, JobSkipped
+from app.jobs.models import Job
+from app.jobs.tasks import MissingDependency
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima a que terminen los trabajos en curso al apagar
+SHUTDOWN_GRACE_SECONDS = 10.0
+
+
+class TaskTimeout(Exception):
+    """Una tarea del pool de procesos superó JOB_TASK_TIMEOUT_SECONDS"""
+
+
+class JobWorker:
+    """
+    Ejecuta los trabajos de la cola dentro del proceso de la API.
+
+    El bucle reclama trabajos mientras haya cupo (`concurrency`); cada uno
+    corre en su propia tarea y sesión, y el trabajo CPU-intensivo se delega
+    a un pool de procesos para no bloquear el event loop. Un upload local
+    despierta al worker con `notify()`; los encolados por otros procesos se
+    detectan sondeando la tabla cada `poll_interval` segundos.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        concurrency: int,
+        process_workers: int,
+        poll_interval: float
+    ):
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.process_workers = process_workers
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop_task is not None
+
+    def notify(self) -> None:
+        """Avisar que hay trabajos nuevos (sin esperar al siguiente sondeo)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def start(self) -> None:
+        """Iniciar el pool de procesos y el bucle de la cola"""
+        if self.started:
+            return
+        self._executor = self._create_executor()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wake = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._run())
+        logger.info("Worker de trabajos iniciado", extra={"worker_id": self.worker_id})
+
+    async def stop(self) -> None:
+        """Detener el bucle, esperar los trabajos en curso y liberar el resto"""
+        if not self.started:
+            return
+        self._loop_task.cancel()
+        await asyncio.gather(self._loop_task, return_exceptions=True)
+        self._loop_task = None
+
+        if self._running:
+            _, pending = await asyncio.wait(self._running, timeout=SHUTDOWN_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+        # Trabajos interrumpidos vuelven a la cola para otro proceso
+        try:
+            async with AsyncSessionLocal() as db:
+                await queue.release_worker(db, self.worker_id)
+        except Exception:
+            logger.exception("Error liberando trabajos del worker")
+        logger.info("Worker de trabajos detenido", extra={"worker_id": self.worker_id})
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn: los hijos no heredan conexiones ni el event loop del padre
+        return ProcessPoolExecutor(max_workers=self.process_workers, mp_context=get_context("spawn"))
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Descartar un pool (terminando sus procesos) y crear otro"""
+        if self._executor is not executor:
+            return  # Otro trabajo ya lo reemplazó
+        # shutdown() no detiene un hijo ocupado: terminarlo explícitamente.
+        # Las demás tareas del pool fallan con BrokenProcessPool y se reintentan
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        self._executor = self._create_executor()
+
+    async def run_in_process(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Ejecutar una función CPU-intensiva en el pool de procesos"""
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, func, *args),
+                timeout=settings.JOB_TASK_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            # Un hijo que no termina (p. ej. pdfium en un bucle) ocuparía su
+            # proceso para siempre: se descarta el pool
+            logger.error("Tarea del pool de procesos sin respuesta, recreando el pool")
+            self._replace_executor(executor)
+            raise TaskTimeout(f"Sin respuesta en {settings.JOB_TASK_TIMEOUT_SECONDS} s")
+        except BrokenProcessPool:
+            # Un hijo murió (p. ej. sin memoria con un PDF malformado): el
+            # pool queda inutilizable, se reemplaza y el trabajo se reintenta
+            if self._executor is executor:
+                logger.error("Pool de procesos caído, recreando")
+                self._replace_executor(executor)
+            raise
+
+    async def _run(self) -> None:
+        next_recovery = 0.0
+        while True:
+            await self._slots.acquire()
+            try:
+                if time.monotonic() >= next_recovery:
+                    async with AsyncSessionLocal() as db:
+                        released = await queue.release_stale(db)
+                    if released:
+                        logger.warning("Trabajos huérfanos devueltos a la cola", extra={"released": released})
+                    next_recovery = time.monotonic() + settings.JOB_LOCK_TIMEOUT_SECONDS / 2
+
+                # Limpiar el aviso antes de consultar: un notify() posterior
+                # a la consulta no se pierde
+                self._wake.clear()
+                async with AsyncSessionLocal() as db:
+                    job = await queue.claim_next(db, self.worker_id, self.handlers)
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            except Exception:
+                self._slots.release()
+                logger.exception("Error consultando la cola de trabajos")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if job is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, job: Job) -> None:
+        started = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                try:
+                    result = await self.handlers[job.kind](self, db, job)
+                except (JobSkipped, MissingDependency) as e:
+                    await db.rollback()
+                    await queue.mark_skipped(db, job, str(e))
+                    logger.info("Trabajo omitido", extra={"job_id": job.id, "kind": job.kind, "reason": str(e)})
+                except Exception as e:
+                    await db.rollback()
+                    await queue.mark_failed(db, job, f"{type(e).__name__}: {e}")
+                    logger.warning(
+                        "Trabajo fallido",
+                        extra={"job_id": job.id, "kind": job.kind, "attempt": job.attempts, "error": str(e)}
+                    )
+                else:
+                    await queue.mark_succeeded(db, job, result)
+                    logger.info(
+                        "Trabajo completado",
+                        extra={
+                            "job_id": job.id,
+                            "kind": job.kind,
+                            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                        }
+                    )
+        except Exception:
+            logger.exception("Error registrando resultado de trabajo", extra={"job_id": job.id})
+        finally:
+            self._slots.release()
+
+
+job_worker = JobWorker(
+    HANDLERS,
+    concurrency=settings.JOB_CONCURRENCY,
+    process_workers=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS
+)
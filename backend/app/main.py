@@ -1,23 +1,72 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import hmac
+import logging
 import uvicorn
 
 from app.core.config import settings
-from app.database.connection import create_tables
+from app.core.health import readiness_checker
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.serialization import FastJSONResponse
+from app.database.connection import async_engine, create_tables
+from app.database.pool_metrics import pool_stats, run_pool_liveness_probe
+from app.database.schema import check_schema_version
+from app.core.security import dummy_verify_password_async, password_hasher
+from app.auth.dependencies import get_current_admin_user
+from app.auth.email_filter import run_email_filter_refresh
 from app.auth.router import router as auth_router
+from app.documents.router import router as documents_router
+from app.users.router import router as users_router
+from app.departments.router import router as departments_router
+from app.documents.resumable import run_upload_cleanup
+from app.jobs.worker import job_worker
+from app.users.cache import UserSnapshot
+from app.users.counters import run_department_reconciliation
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀 Iniciando Intranet Municipal API...")
-    create_tables()
-    print("✅ Tablas de base de datos creadas/verificadas")
+    logger.info("Iniciando Intranet Municipal API")
+    if settings.AUTO_CREATE_TABLES:
+        create_tables()
+    elif settings.SCHEMA_CHECK_ENABLED:
+        await check_schema_version()
+    upload_cleanup = asyncio.create_task(run_upload_cleanup())
+    reconciliation = None
+    if settings.DEPARTMENT_COUNT_RECONCILE_INTERVAL_SECONDS > 0:
+        reconciliation = asyncio.create_task(run_department_reconciliation())
+    # El hash ficticio de passlib se genera en la primera verificación: no en un login
+    await dummy_verify_password_async()
+    email_filter_refresh = None
+    if settings.EMAIL_FILTER_ENABLED:
+        email_filter_refresh = asyncio.create_task(run_email_filter_refresh())
+    liveness_probe = None
+    if not settings.DB_POOL_PRE_PING and settings.DB_POOL_LIVENESS_PROBE_SECONDS > 0:
+        liveness_probe = asyncio.create_task(run_pool_liveness_probe())
+    if settings.JOBS_ENABLED:
+        await job_worker.start()
     yield
     # Shutdown
-    print("👋 Cerrando Intranet Municipal API...")
+    logger.info("Cerrando Intranet Municipal API")
+    upload_cleanup.cancel()
+    if reconciliation is not None:
+        reconciliation.cancel()
+    if email_filter_refresh is not None:
+        email_filter_refresh.cancel()
+    if liveness_probe is not None:
+        liveness_probe.cancel()
+    await job_worker.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    shutdown_logging()
 
 
 # Crear instancia de FastAPI
@@ -27,6 +76,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -58,9 +108,22 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", "*"]
 )
 
+# Métricas HTTP (el último agregado envuelve a los demás: mide también CORS)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Rutas de autenticación
 app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
 
+# Rutas de usuarios
+app.include_router(users_router, prefix="/api/users", tags=["Users"])
+
+# Rutas de departamentos
+app.include_router(departments_router, prefix="/api/departments", tags=["Departments"])
+
+# Rutas de documentos
+app.include_router(documents_router, prefix="/api/documents", tags=["Documents"])
+
 
 @app.get("/")
 async def root():
@@ -75,7 +138,7 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """Endpoint de verificación de salud"""
+    """Endpoint de verificación de salud (liveness: el proceso responde)"""
     return {
         "status": "healthy",
         "service": "Intranet Municipal API",
@@ -83,6 +146,37 @@ async def health_check():
     }
 
 
+@app.get("/api/health/ready")
+async def readiness_check():
+    """
+    Disponibilidad (readiness): base de datos, directorio de uploads y
+    espacio en disco, con latencia por dependencia. 503 si alguna falla.
+    """
+    report = await readiness_checker.check()
+    return FastJSONResponse(
+        report.to_dict(),
+        status_code=status.HTTP_200_OK if report.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@app.get("/api/pool-stats")
+async def get_pool_stats(current_user: UserSnapshot = Depends(get_current_admin_user)):
+    """Métricas del pool de conexiones de este proceso (solo admin)"""
+    return pool_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Métricas de este proceso en formato de texto de Prometheus"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No autorizado")
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -0,0 +1,52 @@
+# scripts/import_users.py
+"""
+Importar usuarios desde un archivo CSV.
+
+Uso: python app/scripts/import_users.py usuarios.csv [--dry-run]
+
+Columnas: email, password, first_name, last_name, phone, department_code, role
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Asegurar imports correctos (directorio backend/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.database.connection import AsyncSessionLocal
+from app.users.importer import InvalidImportFile, UserImporter
+
+CHUNK_SIZE = 65536
+
+
+async def read_chunks(path: str):
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def import_users(path: str, dry_run: bool) -> int:
+    mode = " (modo de prueba)" if dry_run else ""
+    print(f"👥 Importando usuarios desde {path}{mode}...")
+    async with AsyncSessionLocal() as db:
+        try:
+            report = await UserImporter(db, dry_run=dry_run).run(read_chunks(path))
+        except InvalidImportFile as e:
+            print(f"❌ Archivo inválido: {e}")
+            return 1
+
+    for error in report.errors:
+        print(f"⚠️  Línea {error.line} ({error.email or 'sin email'}): {'; '.join(error.errors)}")
+    if report.truncated:
+        print("⚠️  Se alcanzó el máximo de filas por archivo; el resto no se procesó")
+    print(f"✅ Filas: {report.total} | válidas: {report.valid} | creadas: {report.created} | con errores: {report.failed}")
+    return 0 if not report.errors else 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importar usuarios desde CSV")
+    parser.add_argument("path", help="Archivo CSV")
+    parser.add_argument("--dry-run", action="store_true", help="Solo validar, sin crear usuarios")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(import_users(args.path, args.dry_run)))
@@ -2,22 +2,30 @@
 import sys
 import os
 
-# Asegurar imports correctos
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Asegurar imports correctos (directorio backend/)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(BACKEND_DIR)
 
-from app.database.connection import engine, Base
-from app.users.models import User
-from app.database.models import Department
+from alembic import command
+from alembic.config import Config
+
+from app.database.connection import engine, Base, import_models
 
 def init_database():
     """Solo recrear tablas sin datos"""
+    import_models()
+
     print("🗑️  Eliminando tablas existentes...")
     Base.metadata.drop_all(engine)
     
     print("🏗️  Creando tablas...")
     Base.metadata.create_all(engine)
     
+    # Las tablas ya corresponden a la última migración
+    print("🏷️  Marcando el esquema con la última migración...")
+    command.stamp(Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
+    
     print("✅ Base de datos inicializada correctamente")
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    init_database()
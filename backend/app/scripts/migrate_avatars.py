@@ -0,0 +1,74 @@
+# scripts/migrate_avatars.py
+"""
+Mover los avatares guardados en `users.avatar` (Text) al almacén de
+archivos (`UPLOAD_DIR/avatars`).
+
+- Requiere la columna `users.avatar_sha256` (`alembic upgrade head`).
+- Los avatares en base64 (data URL `data:image/...;base64,...` o base64
+  plano) se normalizan, se guardan como archivo y se vacía la columna.
+- Los valores que no son imágenes (p. ej. URLs externas) se informan y
+  se dejan como están.
+
+Uso: python app/scripts/migrate_avatars.py [--dry-run]
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import os
+import sys
+
+# Asegurar imports correctos (directorio backend/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import select, update
+
+from app.database.connection import SessionLocal
+from app.users.avatars import InvalidAvatar, avatar_store
+from app.users.models import User
+
+
+def decode_avatar(value: str) -> bytes:
+    """Bytes de un avatar en base64 (con o sin prefijo data URL)"""
+    if value.startswith("data:"):
+        value = value.partition(",")[2]
+    return base64.b64decode(value, validate=True)
+
+
+def migrate(dry_run: bool):
+    db = SessionLocal()
+    migrated = skipped = 0
+    try:
+        rows = db.execute(
+            select(User.id, User.avatar).where(User.avatar.is_not(None), User.avatar != "")
+        ).all()
+        print(f"🔎 {len(rows)} usuarios con avatar en la fila")
+
+        for user_id, value in rows:
+            try:
+                data = decode_avatar(value.strip())
+                avatar_sha256 = asyncio.run(avatar_store.save(data)) if not dry_run else None
+            except (binascii.Error, ValueError, InvalidAvatar):
+                print(f"⚠️  {user_id}: el valor no es una imagen en base64, se omite")
+                skipped += 1
+                continue
+
+            if not dry_run:
+                db.execute(
+                    update(User)
+                    .where(User.id == user_id)
+                    .values(avatar_sha256=avatar_sha256, avatar=None)
+                )
+                db.commit()
+            migrated += 1
+    finally:
+        db.close()
+
+    print(f"✅ Migrados: {migrated}, omitidos: {skipped}{' (dry run)' if dry_run else ''}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrar avatares desde users.avatar a archivos")
+    parser.add_argument("--dry-run", action="store_true", help="Solo informar, sin escribir")
+    args = parser.parse_args()
+    migrate(args.dry_run)
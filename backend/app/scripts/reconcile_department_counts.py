@@ -0,0 +1,25 @@
+# scripts/reconcile_department_counts.py
+"""
+Recalcular `departments.user_count` (usuarios activos) desde la tabla users.
+
+Uso: python app/scripts/reconcile_department_counts.py
+"""
+import os
+import sys
+
+# Asegurar imports correctos (directorio backend/)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.database.connection import engine
+from app.users.counters import reconcile_statement
+
+
+def reconcile():
+    print("🔢 Reconciliando contadores de usuarios por departamento...")
+    with engine.begin() as connection:
+        result = connection.execute(reconcile_statement())
+    print(f"✅ Departamentos corregidos: {result.rowcount}")
+
+
+if __name__ == "__main__":
+    reconcile()
@@ -0,0 +1,120 @@
+# backend/app/users/avatars.py
+from pathlib import Path
+from typing import List
+import hashlib
+import io
+import os
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+# Formato de almacenamiento: imágenes re-codificadas, sin metadatos EXIF
+AVATAR_FORMAT = "WEBP"
+AVATAR_MEDIA_TYPE = "image/webp"
+
+
+class InvalidAvatar(Exception):
+    """El archivo no es una imagen válida"""
+
+
+class AvatarProcessingUnavailable(Exception):
+    """Pillow no está instalado"""
+
+
+def _image_module():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise AvatarProcessingUnavailable()
+    return Image, ImageOps
+
+
+class AvatarStore:
+    """
+    Avatares bajo `UPLOAD_DIR/avatars/`, direccionados por SHA-256.
+
+    Al subirse, la imagen se normaliza (orientación EXIF, lado máximo
+    AVATAR_MAX_DIMENSION, WebP) y se guarda una vez por contenido. Los
+    tamaños menores se generan en el primer pedido y quedan en disco.
+    """
+
+    def __init__(self, upload_dir: str, sizes: List[int]):
+        self.root = Path(upload_dir) / "avatars"
+        self.sizes = sorted(sizes)
+
+    def path(self, sha256: str, size: int) -> Path:
+        """Ruta de un avatar en un tamaño dado"""
+        return self.root / sha256[:2] / f"{sha256}-{size}.webp"
+
+    def snap_size(self, requested: int) -> int:
+        """Tamaño servido más cercano por encima del pedido"""
+        for size in self.sizes:
+            if size >= requested:
+                return size
+        return self.sizes[-1]
+
+    def _encode(self, image) -> bytes:
+        buffer = io.BytesIO()
+        image.save(buffer, format=AVATAR_FORMAT, quality=85, method=4)
+        return buffer.getvalue()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{uuid.uuid4()}.tmp")
+        with open(temp, "wb") as output:
+            output.write(data)
+        os.replace(temp, path)
+
+    def _save(self, data: bytes) -> str:
+        Image, ImageOps = _image_module()
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()  # Open solo lee el encabezado: aquí falla una imagen truncada o corrupta
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((settings.AVATAR_MAX_DIMENSION, settings.AVATAR_MAX_DIMENSION))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+        except (OSError, ValueError, Image.DecompressionBombError):
+            raise InvalidAvatar()
+
+        encoded = self._encode(image)
+        sha256 = hashlib.sha256(encoded).hexdigest()
+        original = self.path(sha256, self.sizes[-1])
+        if not original.exists():
+            self._write(original, encoded)
+        return sha256
+
+    def _variant(self, sha256: str, size: int) -> Path:
+        path = self.path(sha256, size)
+        if path.exists():
+            return path
+
+        Image, _ = _image_module()
+        with Image.open(self.path(sha256, self.sizes[-1])) as image:
+            image.thumbnail((size, size))
+            self._write(path, self._encode(image))
+        return path
+
+    def _delete(self, sha256: str) -> None:
+        for size in self.sizes:
+            self.path(sha256, size).unlink(missing_ok=True)
+
+    async def save(self, data: bytes) -> str:
+        """Normalizar y guardar una imagen; retorna su hash"""
+        return await run_in_threadpool(self._save, data)
+
+    async def variant(self, sha256: str, size: int) -> Path:
+        """
+        Ruta del avatar en el tamaño pedido (ajustado a AVATAR_SIZES),
+        generándolo si aún no existe. FileNotFoundError si no hay avatar.
+        """
+        return await run_in_threadpool(self._variant, sha256, self.snap_size(size))
+
+    async def delete(self, sha256: str) -> None:
+        """Eliminar un avatar y sus tamaños generados"""
+        await run_in_threadpool(self._delete, sha256)
+
+
+avatar_store = AvatarStore(settings.UPLOAD_DIR, settings.AVATAR_SIZES)
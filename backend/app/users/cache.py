@@ -0,0 +1,151 @@
+# backend/app/users/cache.py
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.core.serialization import dumps
+from app.users.models import User, UserRole, avatar_url
+
+
+class UserSnapshot:
+    """
+    Copia inmutable de los campos públicos de un usuario.
+
+    Se usa en el camino caliente de autenticación en lugar de la fila ORM,
+    para poder reutilizarla entre requests sin tocar la base de datos.
+    """
+
+    FIELDS = (
+        "id",
+        "email",
+        "first_name",
+        "last_name",
+        "phone",
+        "avatar_sha256",
+        "department_id",
+        "department_name",
+        "role",
+        "is_active",
+        "last_login",
+        "created_at",
+        "updated_at",
+    )
+
+    # `_dict` y `_json`: serialización calculada una sola vez por snapshot
+    __slots__ = FIELDS + ("_dict", "_json")
+
+    id: str
+    email: str
+    first_name: str
+    last_name: str
+    phone: Optional[str]
+    avatar_sha256: Optional[str]
+    department_id: str
+    department_name: str
+    role: UserRole
+    is_active: bool
+    last_login: Optional[datetime]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            object.__setattr__(self, name, fields[name])
+        object.__setattr__(self, "_dict", None)
+        object.__setattr__(self, "_json", None)
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        """Crear snapshot desde una fila ORM"""
+        return cls(**{name: getattr(user, name) for name in cls.FIELDS})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UserSnapshot es inmutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("UserSnapshot es inmutable")
+
+    def __repr__(self):
+        return f"<UserSnapshot {self.email}>"
+
+    @property
+    def full_name(self) -> str:
+        """Nombre completo del usuario"""
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def initials(self) -> str:
+        """Iniciales del usuario"""
+        return f"{self.first_name[0]}{self.last_name[0]}".upper()
+
+    def to_dict(self) -> dict:
+        """Convertir a diccionario (mismo formato que User.to_dict)"""
+        if self._dict is None:
+            object.__setattr__(self, "_dict", self._build_dict())
+        return dict(self._dict)
+
+    def to_json(self) -> bytes:
+        """JSON de `to_dict`, serializado una vez y reutilizado entre requests"""
+        if self._json is None:
+            if self._dict is None:
+                object.__setattr__(self, "_dict", self._build_dict())
+            object.__setattr__(self, "_json", dumps(self._dict))
+        return self._json
+
+    def _build_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "firstName": self.first_name,
+            "lastName": self.last_name,
+            "fullName": self.full_name,
+            "initials": self.initials,
+            "phone": self.phone,
+            "avatar": avatar_url(self.id, self.avatar_sha256),
+            "departmentId": self.department_id,
+            "departmentName": self.department_name,
+            "role": self.role.value if self.role else "user",
+            "isActive": self.is_active,
+            "lastLogin": self.last_login.isoformat() if self.last_login else None,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+# Cache de snapshots por id de usuario. El TTL acota cuánto tarda en
+# rechazarse una cuenta desactivada por una escritura sin invalidación.
+user_cache: TTLCache[UserSnapshot] = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    default_ttl=settings.USER_CACHE_TTL_SECONDS
+)
+register_cache("user", user_cache)
+
+
+async def get_user_snapshot(db: AsyncSession, user_id: str) -> Optional[UserSnapshot]:
+    """Obtener snapshot del usuario (read-through: cache y luego base de datos)"""
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+
+    return cache_user(user)
+
+
+def cache_user(user: User) -> UserSnapshot:
+    """Guardar (o refrescar) el snapshot de un usuario recién escrito"""
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.set(user.id, snapshot)
+    return snapshot
+
+
+def invalidate_user(user_id: str) -> None:
+    """Invalidar snapshot tras cualquier escritura sobre el usuario"""
+    user_cache.delete(user_id)
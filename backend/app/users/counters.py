@@ -0,0 +1,57 @@
+# backend/app/users/counters.py
+"""
+Reconciliación de `Department.user_count`.
+
+El contador se mantiene incrementalmente por eventos (ver el final de
+`app/users/models.py`); esta reconciliación corrige cualquier desvío
+(escrituras masivas o SQL manual) con un único UPDATE que solo toca los
+departamentos cuyo contador no coincide.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import Update, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.connection import AsyncSessionLocal
+from app.database.models import Department
+from app.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_statement() -> Update:
+    """UPDATE que recalcula los contadores desviados"""
+    active_users = (
+        select(func.count(User.id))
+        .where(User.department_id == Department.id, User.is_active.is_(True))
+        .correlate(Department)
+        .scalar_subquery()
+    )
+    return (
+        update(Department)
+        .where(Department.user_count != active_users)
+        .values(user_count=active_users)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_department_counts(db: AsyncSession) -> int:
+    """Recalcular contadores desviados; retorna cuántos departamentos se corrigieron"""
+    result = await db.execute(reconcile_statement())
+    await db.commit()
+    return result.rowcount
+
+
+async def run_department_reconciliation() -> None:
+    """Tarea periódica de reconciliación de contadores (lifespan)"""
+    while True:
+        await asyncio.sleep(settings.DEPARTMENT_COUNT_RECONCILE_INTERVAL_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                fixed = await reconcile_department_counts(db)
+            if fixed:
+                logger.warning("Contadores de usuarios corregidos", extra={"departments": fixed})
+        except Exception:
+            logger.exception("Error reconciliando contadores de departamentos")
@@ -0,0 +1,346 @@
+# backend/app/users/importer.py
+"""
+Importación masiva de usuarios desde CSV.
+
+El archivo se lee a medida que llega (sin cargarlo completo en memoria) y
+se procesa por lotes de `USER_IMPORT_BATCH_SIZE` filas: cada fila se valida
+con `UserImportRow` (incluido el dominio institucional del email), las
+contraseñas del lote se encriptan en paralelo en un pool de procesos y los
+usuarios válidos se insertan con un único INSERT multi-fila por lote. Las
+filas rechazadas quedan en el reporte con su número de línea.
+
+Columnas: email, password, first_name, last_name, phone, department_code, role
+(phone y role son opcionales).
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+import asyncio
+import codecs
+import csv
+import logging
+import os
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.email_filter import known_email_filter
+from app.core.config import settings
+from app.core.security import hash_passwords
+from app.database.models import Department
+from app.departments.service import department_directory
+from app.users.models import User
+from app.users.schemas import UserImportRow
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = ("email", "password", "first_name", "last_name", "phone", "department_code", "role")
+REQUIRED_COLUMNS = {"email", "password", "first_name", "last_name", "department_code"}
+
+
+class InvalidImportFile(Exception):
+    """CSV ilegible o sin las columnas requeridas"""
+
+
+class DepartmentRef(NamedTuple):
+    """Datos del departamento usados por la importación (sin instancias ORM)"""
+    id: str
+    name: str
+    is_active: bool
+
+
+@dataclass
+class RowError:
+    """Fila rechazada"""
+    line: int
+    email: Optional[str]
+    errors: List[str]
+
+    def to_dict(self) -> dict:
+        return {"line": self.line, "email": self.email, "errors": self.errors}
+
+
+@dataclass
+class ImportReport:
+    """Resultado de una importación"""
+    dry_run: bool
+    total: int = 0  # Filas de datos leídas
+    valid: int = 0  # Filas que pasaron todas las validaciones
+    created: int = 0  # Usuarios insertados (0 en modo de prueba)
+    truncated: bool = False  # Se alcanzó USER_IMPORT_MAX_ROWS
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def to_dict(self) -> dict:
+        return {
+            "dryRun": self.dry_run,
+            "total": self.total,
+            "valid": self.valid,
+            "created": self.created,
+            "failed": self.failed,
+            "truncated": self.truncated,
+            "errors": [error.to_dict() for error in self.errors],
+        }
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Registros CSV (número de línea, valores) a partir de fragmentos de bytes.
+
+    Un registro termina en un salto de línea fuera de comillas; los campos
+    entre comillas pueden contener saltos de línea.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""  # Texto después del último salto de línea recibido
+    record: List[str] = []  # Líneas físicas del registro en curso
+    quotes = 0
+    line_number = 0
+    record_line = 0
+
+    def parse(text: str) -> Optional[List[str]]:
+        if not text.strip():
+            return None
+        try:
+            return next(csv.reader([text]), [])
+        except csv.Error as e:
+            raise InvalidImportFile(f"Línea {record_line}: {e}")
+
+    async def lines() -> AsyncIterator[str]:
+        nonlocal pending
+        try:
+            async for chunk in chunks:
+                pieces = (pending + decoder.decode(chunk)).split("\n")
+                pending = pieces.pop()
+                for piece in pieces:
+                    yield piece + "\n"
+            pending += decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise InvalidImportFile("El archivo debe estar codificado en UTF-8")
+        if pending:
+            yield pending
+
+    async for line in lines():
+        line_number += 1
+        if not record:
+            record_line = line_number
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            values = parse("".join(record))
+            record, quotes = [], 0
+            if values is not None:
+                yield record_line, values
+
+    if record:
+        values = parse("".join(record))
+        if values is not None:
+            yield record_line, values
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+class UserImporter:
+    """Importación de un archivo CSV de usuarios (una instancia por archivo)"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        dry_run: bool = False,
+        batch_size: int = settings.USER_IMPORT_BATCH_SIZE,
+        max_rows: int = settings.USER_IMPORT_MAX_ROWS,
+        hash_workers: int = settings.USER_IMPORT_HASH_WORKERS
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+        self.report = ImportReport(dry_run=dry_run)
+        self._departments: Dict[str, DepartmentRef] = {}
+        self._seen: Dict[str, int] = {}  # email -> línea donde apareció primero
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> ImportReport:
+        """Procesar el archivo completo y retornar el reporte"""
+        result = await self.db.execute(
+            select(Department.code, Department.id, Department.name, Department.is_active)
+        )
+        self._departments = {
+            code.upper(): DepartmentRef(id=id_, name=name, is_active=is_active)
+            for code, id_, name, is_active in result.all()
+        }
+
+        header: Optional[Dict[str, int]] = None
+        batch: List[Tuple[int, UserImportRow]] = []
+        try:
+            async for line, values in iter_csv_records(chunks):
+                if header is None:
+                    header = self._parse_header(values)
+                    continue
+                if self.report.total >= self.max_rows:
+                    self.report.truncated = True
+                    break
+                self.report.total += 1
+
+                row = self._validate(line, header, values)
+                if row is not None:
+                    batch.append((line, row))
+                if len(batch) >= self.batch_size:
+                    await self._process_batch(batch)
+                    batch = []
+
+            if header is None:
+                raise InvalidImportFile("El archivo está vacío")
+            if batch:
+                await self._process_batch(batch)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+
+        self.report.errors.sort(key=lambda error: error.line)
+        if self.report.created:
+            # Los contadores de usuarios cambiaron
+            department_directory.invalidate()
+        logger.info(
+            "Importación de usuarios finalizada",
+            extra={
+                "dry_run": self.report.dry_run,
+                "total": self.report.total,
+                "users_created": self.report.created,
+                "failed": self.report.failed,
+            }
+        )
+        return self.report
+
+    def _parse_header(self, values: List[str]) -> Dict[str, int]:
+        header = {value.strip().lower(): index for index, value in enumerate(values)}
+        missing = REQUIRED_COLUMNS - header.keys()
+        if missing:
+            raise InvalidImportFile(f"Faltan columnas: {', '.join(sorted(missing))}")
+        return {name: header[name] for name in IMPORT_COLUMNS if name in header}
+
+    def _reject(self, line: int, email: Optional[str], errors: List[str]) -> None:
+        self.report.errors.append(RowError(line=line, email=email, errors=errors))
+
+    def _validate(self, line: int, header: Dict[str, int], values: List[str]) -> Optional[UserImportRow]:
+        data = {
+            name: values[index].strip()
+            for name, index in header.items()
+            if index < len(values)
+        }
+        email = data.get("email") or None
+        try:
+            row = UserImportRow(**data)
+        except ValidationError as e:
+            self._reject(line, email, _validation_messages(e))
+            return None
+
+        department = self._departments.get(row.department_code)
+        if department is None:
+            self._reject(line, row.email, ["department_code: Departamento no encontrado"])
+            return None
+        if not department.is_active:
+            self._reject(line, row.email, ["department_code: Departamento inactivo"])
+            return None
+
+        first_line = self._seen.setdefault(row.email, line)
+        if first_line != line:
+            self._reject(line, row.email, [f"email: Duplicado en el archivo (línea {first_line})"])
+            return None
+        return row
+
+    async def _process_batch(self, batch: List[Tuple[int, UserImportRow]]) -> None:
+        emails = [row.email for _, row in batch]
+        result = await self.db.execute(select(User.email).where(User.email.in_(emails)))
+        existing = set(result.scalars().all())
+
+        accepted = []
+        for line, row in batch:
+            if row.email in existing:
+                self._reject(line, row.email, ["email: Ya existe un usuario con este email"])
+            else:
+                accepted.append((line, row))
+        self.report.valid += len(accepted)
+        if self.report.dry_run or not accepted:
+            return
+
+        password_hashes = await self._hash_passwords([row.password for _, row in accepted])
+        values = [
+            self._user_values(row, password_hash)
+            for (_, row), password_hash in zip(accepted, password_hashes)
+        ]
+
+        try:
+            await self.db.execute(insert(User), values)
+            inserted = values
+        except IntegrityError:
+            # Un email se creó entre la verificación y el INSERT: fila por fila
+            await self.db.rollback()
+            inserted = await self._insert_one_by_one(accepted, values)
+
+        # El INSERT masivo no dispara los eventos del modelo: contadores aquí
+        for department_id, count in Counter(value["department_id"] for value in inserted).items():
+            await self.db.execute(
+                update(Department)
+                .where(Department.id == department_id)
+                .values(user_count=Department.user_count + count)
+            )
+        await self.db.commit()
+        self.report.created += len(inserted)
+        for value in inserted:
+            known_email_filter.add(value["email"])
+
+    async def _insert_one_by_one(
+        self,
+        accepted: List[Tuple[int, UserImportRow]],
+        values: List[dict]
+    ) -> List[dict]:
+        inserted = []
+        for (line, row), value in zip(accepted, values):
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(User), [value])
+                inserted.append(value)
+            except IntegrityError:
+                self.report.valid -= 1
+                self._reject(line, row.email, ["email: Ya existe un usuario con este email"])
+        return inserted
+
+    def _user_values(self, row: UserImportRow, password_hash: str) -> dict:
+        department = self._departments[row.department_code]
+        return {
+            "email": row.email,
+            "password_hash": password_hash,
+            "first_name": row.first_name,
+            "last_name": row.last_name,
+            "phone": row.phone,
+            "department_id": department.id,
+            "department_name": department.name,
+            "role": row.role,
+            "is_active": True,
+        }
+
+    async def _hash_passwords(self, passwords: List[str]) -> List[str]:
+        """bcrypt del lote repartido en bloques contiguos entre los procesos"""
+        if self._executor is None:
+            # spawn: los hijos no heredan conexiones ni el event loop del padre
+            self._executor = ProcessPoolExecutor(max_workers=self.hash_workers, mp_context=get_context("spawn"))
+
+        size = -(-len(passwords) // self.hash_workers)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, hash_passwords, passwords[start:start + size])
+            for start in range(0, len(passwords), size)
+        ))
+        return [password_hash for chunk in results for password_hash in chunk]
@@ -1,10 +1,21 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Text, Index, ForeignKey, event, select, update
 from sqlalchemy.dialects.mysql import CHAR
+from sqlalchemy.orm import column_property, deferred
+from sqlalchemy.orm.attributes import get_history
 from datetime import datetime
+from typing import Optional
 import uuid
 import enum
 
 from app.database.connection import Base
+from app.database.models import Department
+
+
+def avatar_url(user_id: str, avatar_sha256: Optional[str]) -> Optional[str]:
+    """URL del avatar; el hash en la query cambia la URL al reemplazar la imagen"""
+    if not avatar_sha256:
+        return None
+    return f"/api/users/{user_id}/avatar?v={avatar_sha256[:16]}"
 
 
 class UserRole(str, enum.Enum):
@@ -27,19 +38,27 @@ class User(Base):
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     phone = Column(String(20), nullable=True)
-    avatar = Column(Text, nullable=True)
+    avatar = deferred(Column(Text, nullable=True))  # Legado: imagen en la fila (ver app/scripts/migrate_avatars.py)
+    avatar_sha256 = Column(CHAR(64), nullable=True)  # Avatar almacenado en UPLOAD_DIR/avatars
     
     # Información organizacional
-    department_id = Column(String(100), nullable=False)
-    department_name = Column(String(100), nullable=False)
+    # active_history: el valor anterior se carga al modificarlo (contador de usuarios)
+    department_id = column_property(Column(CHAR(36), ForeignKey("departments.id"), nullable=False), active_history=True)
+    department_name = Column(String(100), nullable=False)  # Copia de Department.name (se mantiene por eventos)
     role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
     
     # Estado y metadatos
-    is_active = Column(Boolean, default=True, nullable=False)
+    is_active = column_property(Column(Boolean, default=True, nullable=False), active_history=True)
     last_login = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        # Paginación por cursor (más recientes primero), global y por departamento
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_department_created_at_id", "department_id", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<User {self.email}>"
     
@@ -63,7 +82,7 @@ class User(Base):
             "fullName": self.full_name,
             "initials": self.initials,
             "phone": self.phone,
-            "avatar": self.avatar,
+            "avatar": avatar_url(self.id, self.avatar_sha256),
             "departmentId": self.department_id,
             "departmentName": self.department_name,
             "role": self.role.value if self.role else "user",
@@ -71,4 +90,84 @@ class User(Base):
             "lastLogin": self.last_login.isoformat() if self.last_login else None,
             "createdAt": self.created_at.isoformat() if self.created_at else None,
             "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+        }
+
+
+# Datos de departamento denormalizados
+#
+# `department_name` se completa desde el departamento al asignarlo, y
+# `Department.user_count` (usuarios activos) se ajusta con un UPDATE
+# relativo en la misma transacción que la escritura del usuario, de modo
+# que escrituras concurrentes no pisan el contador. Los INSERT/UPDATE
+# masivos (Core) no disparan estos eventos y deben ajustar el contador
+# por su cuenta; `app/users/counters.py` reconcilia cualquier desvío.
+
+def _change_user_count(connection, department_id: Optional[str], delta: int) -> None:
+    if department_id and delta:
+        connection.execute(
+            update(Department)
+            .where(Department.id == department_id)
+            .values(user_count=Department.user_count + delta)
+        )
+
+
+def _fill_department_name(connection, target: "User") -> None:
+    name = connection.execute(
+        select(Department.name).where(Department.id == target.department_id)
+    ).scalar_one_or_none()
+    if name is not None:
+        target.department_name = name
+
+
+def _previous(target: "User", attribute: str):
+    """Valor de un atributo antes de los cambios pendientes del flush"""
+    history = get_history(target, attribute)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+
+@event.listens_for(User, "before_insert")
+def _user_before_insert(mapper, connection, target: "User") -> None:
+    if target.department_id and not target.department_name:
+        _fill_department_name(connection, target)
+
+
+@event.listens_for(User, "before_update")
+def _user_before_update(mapper, connection, target: "User") -> None:
+    if get_history(target, "department_id").has_changes() and not get_history(target, "department_name").has_changes():
+        _fill_department_name(connection, target)
+
+
+@event.listens_for(User, "after_insert")
+def _user_after_insert(mapper, connection, target: "User") -> None:
+    if target.is_active is not False:
+        _change_user_count(connection, target.department_id, +1)
+
+
+@event.listens_for(User, "after_update")
+def _user_after_update(mapper, connection, target: "User") -> None:
+    old_department, new_department = _previous(target, "department_id"), target.department_id
+    was_active, is_active = bool(_previous(target, "is_active")), bool(target.is_active)
+    if (old_department, was_active) == (new_department, is_active):
+        return
+    if was_active:
+        _change_user_count(connection, old_department, -1)
+    if is_active:
+        _change_user_count(connection, new_department, +1)
+
+
+@event.listens_for(User, "after_delete")
+def _user_after_delete(mapper, connection, target: "User") -> None:
+    if _previous(target, "is_active"):
+        _change_user_count(connection, _previous(target, "department_id"), -1)
+
+
+@event.listens_for(Department, "after_update")
+def _department_after_update(mapper, connection, target: Department) -> None:
+    if get_history(target, "name").has_changes():
+        connection.execute(
+            update(User)
+            .where(User.department_id == target.id)
+            .values(department_name=target.name)
+        )
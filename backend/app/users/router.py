@@ -0,0 +1,182 @@
+# backend/app/users/router.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import logging
+
+from app.auth.dependencies import get_current_admin_user, get_current_user
+from app.core.config import settings
+from app.core.pagination import InvalidCursor, InvalidFields
+from app.database.connection import get_async_database
+from app.documents.multipart import MultipartError
+from app.documents.responses import BlobFileResponse, etag_for, if_none_match, not_modified
+from app.users.avatars import AVATAR_MEDIA_TYPE, AvatarProcessingUnavailable, InvalidAvatar, avatar_store
+from app.users.cache import UserSnapshot, get_user_snapshot
+from app.users.importer import InvalidImportFile, UserImporter
+from app.users.service import USER_LIST_FIELDS, AvatarTooLarge, UserService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("")
+async def list_users(
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (`nextCursor`)"),
+    pageSize: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma"),
+    departmentId: Optional[str] = Query(None),
+    isActive: Optional[bool] = Query(None),
+    current_user: UserSnapshot = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Listar usuarios (solo admin), más recientes primero.
+    Paginación por cursor: pasar `nextCursor` de la respuesta para la página siguiente.
+    """
+    try:
+        selected = USER_LIST_FIELDS.parse(fields)
+        users, next_cursor = await UserService.list_users(
+            db=db,
+            fields=selected,
+            limit=pageSize,
+            cursor=cursor,
+            department_id=departmentId,
+            is_active=isActive
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    except InvalidFields as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return {
+        "results": users,
+        "pageSize": pageSize,
+        "nextCursor": next_cursor,
+        "hasMore": next_cursor is not None
+    }
+
+
+@router.post("/import")
+async def import_users(
+    request: Request,
+    dryRun: bool = Query(False, description="Solo validar, sin crear usuarios"),
+    current_user: UserSnapshot = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Importar usuarios desde un CSV (solo admin, multipart/form-data con `file`).
+
+    Columnas: email, password, first_name, last_name, phone, department_code, role.
+    Retorna un reporte con las filas rechazadas y sus errores; las filas
+    válidas se crean aunque otras fallen.
+    """
+    importer = UserImporter(db, dry_run=dryRun)
+    try:
+        report = await importer.run(UserService.iter_import_upload(request))
+    except (MultipartError, InvalidImportFile) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    logger.info(
+        "Usuarios importados",
+        extra={"admin_id": current_user.id, "users_created": report.created, "failed": report.failed}
+    )
+    return report.to_dict()
+
+
+@router.put("/me/avatar")
+async def upload_avatar(
+    request: Request,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Subir o reemplazar el avatar del usuario actual (multipart/form-data con `file`)"""
+    try:
+        data = await UserService.read_avatar_upload(request)
+        await UserService.set_avatar(db=db, user_id=current_user.id, data=data)
+    except AvatarTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"La imagen supera el máximo de {settings.AVATAR_MAX_FILE_SIZE} bytes"
+        )
+    except (MultipartError, InvalidAvatar):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Se requiere una imagen válida en el campo `file`"
+        )
+    except AvatarProcessingUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Procesamiento de imágenes no disponible"
+        )
+
+    user = await get_user_snapshot(db, current_user.id)
+    return {
+        "avatar": user.to_dict()["avatar"],
+        "success": True
+    }
+
+
+@router.delete("/me/avatar")
+async def delete_avatar(
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """Quitar el avatar del usuario actual"""
+    await UserService.set_avatar(db=db, user_id=current_user.id, data=None)
+    return {
+        "message": "Avatar eliminado",
+        "success": True
+    }
+
+
+@router.get("/{user_id}/avatar")
+async def get_avatar(
+    user_id: str,
+    request: Request,
+    size: int = Query(128, ge=1, le=1024, description="Lado en píxeles (se ajusta a los tamaños disponibles)"),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_database)
+):
+    """
+    Avatar de un usuario en WebP.
+    ETag por contenido y tamaño (304 con If-None-Match); la URL de `to_dict`
+    incluye una versión, por lo que puede cachearse en el cliente.
+    """
+    user = await get_user_snapshot(db, user_id)
+    if user is None or not user.avatar_sha256:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Avatar no encontrado"
+        )
+
+    served_size = avatar_store.snap_size(size)
+    etag = etag_for(f"{user.avatar_sha256}-{served_size}")
+    cache_headers = {"Cache-Control": "private, max-age=86400"}
+    if if_none_match(request.headers, etag):
+        return not_modified(etag, cache_headers)
+
+    try:
+        path = await avatar_store.variant(user.avatar_sha256, served_size)
+    except FileNotFoundError:
+        logger.error("Archivo de avatar faltante", extra={"user_id": user_id})
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Avatar no encontrado"
+        )
+    except AvatarProcessingUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Procesamiento de imágenes no disponible"
+        )
+
+    return BlobFileResponse(path, media_type=AVATAR_MEDIA_TYPE, headers={"ETag": etag, **cache_headers})
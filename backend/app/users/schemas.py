@@ -0,0 +1,37 @@
+from pydantic import BaseModel, EmailStr, Field, validator
+from typing import Optional
+
+from app.auth.schemas import validate_institutional_email
+from app.users.models import UserRole
+
+
+class UserImportRow(BaseModel):
+    """Fila del CSV de importación masiva de usuarios"""
+    email: EmailStr = Field(..., description="Email institucional")
+    password: str = Field(..., min_length=6, description="Contraseña inicial")
+    first_name: str = Field(..., min_length=1, max_length=100)
+    last_name: str = Field(..., min_length=1, max_length=100)
+    phone: Optional[str] = Field(default=None, max_length=20)
+    department_code: str = Field(..., min_length=1, max_length=10, description="Código del departamento")
+    role: UserRole = UserRole.USER
+
+    @validator('email')
+    def validate_email_domain(cls, v):
+        """Validar que sea email institucional"""
+        return validate_institutional_email(v)
+
+    @validator('phone', pre=True)
+    def empty_phone_as_none(cls, v):
+        """Celda vacía = sin teléfono"""
+        return v.strip() or None if isinstance(v, str) else v
+
+    @validator('role', pre=True)
+    def normalize_role(cls, v):
+        """Celda vacía = rol por defecto; acepta mayúsculas"""
+        if isinstance(v, str):
+            return v.strip().lower() or UserRole.USER
+        return v
+
+    @validator('department_code')
+    def normalize_department_code(cls, v):
+        return v.strip().upper()
@@ -0,0 +1,141 @@
+# backend/app/users/service.py
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.pagination import FieldSelection, ListField, column_field, datetime_field, paginate
+from app.documents.multipart import MultipartError, iter_multipart
+from app.users.avatars import avatar_store
+from app.users.cache import invalidate_user
+from app.users.models import User, avatar_url
+
+logger = logging.getLogger(__name__)
+
+
+class AvatarTooLarge(Exception):
+    """La imagen supera AVATAR_MAX_FILE_SIZE"""
+
+# Campos disponibles en el listado de usuarios (mismos nombres que `User.to_dict`)
+USER_LIST_FIELDS = FieldSelection(
+    fields={
+        "id": column_field(User.id),
+        "email": column_field(User.email),
+        "firstName": column_field(User.first_name),
+        "lastName": column_field(User.last_name),
+        "fullName": ListField((User.first_name, User.last_name), lambda user: user.full_name),
+        "initials": ListField((User.first_name, User.last_name), lambda user: user.initials),
+        "phone": column_field(User.phone),
+        "avatar": ListField((User.avatar_sha256,), lambda user: avatar_url(user.id, user.avatar_sha256)),
+        "departmentId": column_field(User.department_id),
+        "departmentName": column_field(User.department_name),
+        "role": ListField((User.role,), lambda user: user.role.value if user.role else "user"),
+        "isActive": column_field(User.is_active),
+        "lastLogin": datetime_field(User.last_login),
+        "createdAt": datetime_field(User.created_at),
+        "updatedAt": datetime_field(User.updated_at),
+    },
+    default=[
+        "id", "email", "firstName", "lastName", "fullName", "initials", "phone", "avatar",
+        "departmentId", "departmentName", "role", "isActive", "lastLogin",
+        "createdAt", "updatedAt",
+    ],
+    required=[User.id, User.created_at]
+)
+
+
+class UserService:
+
+    @staticmethod
+    async def list_users(
+        db: AsyncSession,
+        fields: List[str],
+        limit: int,
+        cursor: Optional[str] = None,
+        department_id: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Listar usuarios (más recientes primero) paginando por cursor.
+        Retorna los usuarios serializados y el cursor de la página siguiente.
+        """
+        statement = select(User).options(USER_LIST_FIELDS.load_options(fields))
+        if department_id is not None:
+            statement = statement.where(User.department_id == department_id)
+        if is_active is not None:
+            statement = statement.where(User.is_active == is_active)
+
+        users, next_cursor = await paginate(db, statement, User, limit=limit, cursor=cursor)
+        return [USER_LIST_FIELDS.serialize(user, fields) for user in users], next_cursor
+
+    @staticmethod
+    async def read_avatar_upload(request: Request) -> bytes:
+        """Leer la imagen de un upload multipart (campo `file`) con tamaño acotado"""
+        data = bytearray()
+        received = False
+        is_file = False
+        async for kind, payload in iter_multipart(request):
+            if kind == "begin":
+                is_file = payload.is_file
+                if is_file:
+                    if received:
+                        raise MultipartError("Solo se admite un archivo por request")
+                    received = True
+            elif kind == "data" and is_file:
+                data.extend(payload)
+                if len(data) > settings.AVATAR_MAX_FILE_SIZE:
+                    raise AvatarTooLarge()
+
+        if not received:
+            raise MultipartError("No se recibió ningún archivo")
+        return bytes(data)
+
+    @staticmethod
+    async def iter_import_upload(request: Request) -> AsyncIterator[bytes]:
+        """Fragmentos del CSV de un upload multipart (campo `file`) a medida que llegan"""
+        received = False
+        is_file = False
+        async for kind, payload in iter_multipart(request):
+            if kind == "begin":
+                is_file = payload.is_file
+                if is_file:
+                    if received:
+                        raise MultipartError("Solo se admite un archivo por request")
+                    received = True
+            elif kind == "data" and is_file:
+                yield payload
+
+        if not received:
+            raise MultipartError("No se recibió ningún archivo")
+
+    @staticmethod
+    async def set_avatar(db: AsyncSession, user_id: str, data: Optional[bytes]) -> Optional[str]:
+        """
+        Reemplazar (o quitar, con `data=None`) el avatar de un usuario.
+        Retorna el hash del avatar nuevo.
+        """
+        avatar_sha256 = await avatar_store.save(data) if data is not None else None
+
+        result = await db.execute(select(User.avatar_sha256).where(User.id == user_id))
+        previous = result.scalar_one_or_none()
+
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(avatar_sha256=avatar_sha256, avatar=None, updated_at=datetime.utcnow())
+        )
+        await db.commit()
+        invalidate_user(user_id)
+
+        # La imagen anterior se borra solo si ningún otro usuario la usa
+        if previous and previous != avatar_sha256:
+            result = await db.execute(select(func.count()).where(User.avatar_sha256 == previous))
+            if result.scalar_one() == 0:
+                await avatar_store.delete(previous)
+
+        logger.info("Avatar actualizado", extra={"user_id": user_id, "removed": avatar_sha256 is None})
+        return avatar_sha256
@@ -0,0 +1,73 @@
+# backend/benchmarks/bench_auth_me.py
+"""
+Benchmark de throughput concurrente de /api/auth/me.
+
+Uso (con el servidor corriendo, p. ej. `python run_server.py`):
+
+    python benchmarks/bench_auth_me.py --url http://localhost:8000 \\
+        --email admin@municipalidad.gob.cl --password 123456 \\
+        --concurrency 50 --requests 2000
+
+Para comparar antes/después, ejecutar el mismo comando contra cada
+versión del servidor con la misma base de datos.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_benchmark(url: str, email: str, password: str, concurrency: int, total: int) -> dict:
+    async with httpx.AsyncClient(base_url=url, timeout=30.0) as client:
+        response = await client.post("/api/auth/login", json={"email": email, "password": password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        latencies = []
+        errors = 0
+        remaining = iter(range(total))
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                result = await client.get("/api/auth/me", headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if result.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrente de /api/auth/me")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@municipalidad.gob.cl")
+    parser.add_argument("--password", default="123456")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.url, args.email, args.password, args.concurrency, args.requests))
+    for key, value in result.items():
+        print(f"{key:>12}: {value}")
+
+
+if __name__ == "__main__":
+    main()
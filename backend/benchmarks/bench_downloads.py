@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_downloads.py
+"""
+Benchmark de descargas concurrentes de documentos grandes.
+
+Uso (con el servidor de `python run_server.py` corriendo):
+
+    python benchmarks/bench_downloads.py --url http://localhost:8000 \\
+        --size-mb 40 --concurrency 20 --downloads 100
+
+Sube un archivo aleatorio del tamaño indicado (o usa --document-id) y
+mide el throughput de descargas completas, de descargas por rango
+(Range: 1MB) y de revalidaciones con If-None-Match (304).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+
+async def timed_downloads(client, url, headers, concurrency, total):
+    remaining = iter(range(total))
+    transferred = 0
+    statuses = {}
+
+    async def worker():
+        nonlocal transferred
+        for _ in remaining:
+            async with client.stream("GET", url, headers=headers) as response:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                async for chunk in response.aiter_raw():
+                    transferred += len(chunk)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "downloads": total,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(total / elapsed, 1),
+        "MB_per_s": round(transferred / elapsed / 1048576, 1),
+        "statuses": statuses,
+    }
+
+
+async def run_benchmark(args) -> None:
+    async with httpx.AsyncClient(base_url=args.url, timeout=120.0) as client:
+        response = await client.post("/api/auth/login", json={"email": args.email, "password": args.password})
+        response.raise_for_status()
+        auth = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        document_id = args.document_id
+        if document_id is None:
+            payload = os.urandom(args.size_mb * 1048576)
+            response = await client.post(
+                "/api/documents",
+                headers=auth,
+                files={"file": ("benchmark.pdf", payload, "application/pdf")},
+                data={"title": "Benchmark descargas"}
+            )
+            response.raise_for_status()
+            document_id = response.json()["id"]
+
+        url = f"/api/documents/{document_id}/download"
+        head = await client.head(url, headers=auth)
+        etag = head.headers["etag"]
+
+        scenarios = {
+            "completa": auth,
+            "rango 1MB": {**auth, "Range": "bytes=0-1048575", "If-Range": etag},
+            "304": {**auth, "If-None-Match": etag},
+        }
+        for name, headers in scenarios.items():
+            result = await timed_downloads(client, url, headers, args.concurrency, args.downloads)
+            print(f"{name:>10}: {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de descargas concurrentes")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@municipalidad.gob.cl")
+    parser.add_argument("--password", default="123456")
+    parser.add_argument("--document-id", default=None)
+    parser.add_argument("--size-mb", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--downloads", type=int, default=100)
+    asyncio.run(run_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
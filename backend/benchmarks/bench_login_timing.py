@@ -0,0 +1,107 @@
+# backend/benchmarks/bench_login_timing.py
+"""
+Benchmark de tiempos de /api/auth/login por camino de rechazo.
+
+Uso (con el servidor corriendo con `RATE_LIMIT_ENABLED=False`, para que
+el rate limiting de login no corte la medición):
+
+    python benchmarks/bench_login_timing.py --url http://localhost:8000 \\
+        --email admin@municipalidad.gob.cl --requests 30
+
+Mide, secuencialmente, tres caminos:
+- email institucional no registrado (rechazado por el filtro de emails),
+- email registrado con contraseña incorrecta (bcrypt real),
+- email registrado con la contraseña correcta (`--password`, opcional).
+
+Los dos primeros deben tener la misma distribución: si difieren, la
+latencia revela qué emails existen. Con `--filter` mide además en proceso
+el costo de una consulta al filtro de Bloom.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def measure(client: httpx.AsyncClient, label: str, email_factory, password: str, requests: int, expected: int):
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.post("/api/auth/login", json={"email": email_factory(), "password": password})
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != expected:
+            raise SystemExit(f"{label}: se esperaba {expected} y se obtuvo {response.status_code} ({response.text[:120]})")
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{label:<40} mediana {statistics.median(latencies):8.1f} ms | "
+        f"p95 {p95:8.1f} ms | desv. {statistics.pstdev(latencies):6.1f} ms"
+    )
+    return statistics.median(latencies)
+
+
+def measure_filter(emails: int, lookups: int) -> None:
+    """Costo en proceso de una consulta al filtro (sin red ni base de datos)"""
+    for name, value in {
+        "DB_HOST": "localhost", "DB_NAME": "bench", "DB_USER": "bench",
+        "DB_PASSWORD": "bench", "SECRET_KEY": "bench",
+    }.items():
+        os.environ.setdefault(name, value)
+    from app.auth.email_filter import BloomFilter
+    from app.core.config import settings
+
+    bloom = BloomFilter(max(settings.EMAIL_FILTER_MIN_CAPACITY, emails * 2), settings.EMAIL_FILTER_FALSE_POSITIVE_RATE)
+    for number in range(emails):
+        bloom.add(f"usuario{number}@municipalidad.gob.cl")
+
+    probes = [f"desconocido{number}@municipalidad.gob.cl" for number in range(lookups)]
+    started = time.perf_counter()
+    false_positives = sum(probe in bloom for probe in probes)
+    per_lookup_us = (time.perf_counter() - started) / lookups * 1_000_000
+    print(
+        f"\nFiltro con {emails} emails: {len(bloom._bits) / 1024:.0f} KiB, {per_lookup_us:.2f} µs/consulta, "
+        f"falsos positivos {false_positives / lookups:.2%}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Tiempos de login por camino de rechazo")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True, help="Email de un usuario activo")
+    parser.add_argument("--password", help="Contraseña correcta (mide también el login exitoso)")
+    parser.add_argument("--requests", type=int, default=30, help="Requests por camino")
+    parser.add_argument("--filter", action="store_true", help="Medir también el filtro de Bloom en proceso")
+    parser.add_argument("--filter-emails", type=int, default=100000)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=30.0) as client:
+        # Calentamiento: conexión y hash ficticio
+        await client.post("/api/auth/login", json={"email": args.email, "password": "calentamiento"})
+
+        unknown = await measure(
+            client, "Email no registrado",
+            lambda: f"bench-{uuid.uuid4().hex[:12]}@municipalidad.gob.cl", "incorrecta", args.requests, 401
+        )
+        wrong = await measure(
+            client, "Email registrado, contraseña incorrecta",
+            lambda: args.email, "incorrecta", args.requests, 401
+        )
+        if args.password:
+            await measure(client, "Login exitoso", lambda: args.email, args.password, args.requests, 200)
+
+    print(f"\nDiferencia de medianas entre rechazos: {abs(unknown - wrong):.1f} ms ({abs(unknown - wrong) / wrong:.1%})")
+
+    if args.filter:
+        measure_filter(args.filter_emails, 100000)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
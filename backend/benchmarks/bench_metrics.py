@@ -0,0 +1,87 @@
+# backend/benchmarks/bench_metrics.py
+"""
+Micro-benchmark del costo por request de `MetricsMiddleware`.
+
+Uso:
+
+    python benchmarks/bench_metrics.py --requests 20000
+
+Llama, en proceso y sin red, a una aplicación FastAPI mínima (un endpoint
+con parámetro de ruta) directamente por ASGI, con y sin el middleware, y
+mide además el costo de generar /metrics con las series resultantes.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Valores mínimos para poder importar la configuración sin `.env`
+for name, value in {
+    "DB_HOST": "localhost", "DB_NAME": "bench", "DB_USER": "bench",
+    "DB_PASSWORD": "bench", "SECRET_KEY": "bench",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi import FastAPI
+
+from app.core.metrics import MetricsMiddleware, registry
+
+
+def make_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(label: str, app, requests: int) -> float:
+    for number in range(200):  # Calentamiento
+        await call(app, f"/api/items/{number}")
+    started = time.perf_counter()
+    for number in range(requests):
+        await call(app, f"/api/items/{number}")
+    per_request_us = (time.perf_counter() - started) / requests * 1_000_000
+    print(f"{label:<20} {per_request_us:8.1f} µs/request")
+    return per_request_us
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Costo por request del middleware de métricas")
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    without = await measure("Sin métricas", make_app(False), args.requests)
+    with_metrics = await measure("Con métricas", make_app(True), args.requests)
+    print(f"\nCosto del middleware: {with_metrics - without:.1f} µs/request ({(with_metrics - without) / without:.1%})")
+
+    started = time.perf_counter()
+    body = registry.render()
+    print(f"Render de /metrics: {(time.perf_counter() - started) * 1000:.2f} ms ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
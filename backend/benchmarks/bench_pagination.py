@@ -0,0 +1,159 @@
+# backend/benchmarks/bench_pagination.py
+"""
+Benchmark de latencia por profundidad de página en /api/users.
+
+Uso (con el servidor de `python run_server.py` corriendo):
+
+    python benchmarks/bench_pagination.py --url http://localhost:8000 \\
+        --email admin@municipalidad.gob.cl --password 123456 \\
+        --seed 100000 --page-size 50
+
+`--seed N` inserta N usuarios sintéticos directamente en la base de datos
+configurada en `.env` (usar solo en una base de pruebas). El script recorre
+el listado completo siguiendo `nextCursor` y reporta la latencia de las
+páginas por tramo de profundidad: con paginación por cursor debe ser
+plana. Con `--compare-offset` mide además la consulta equivalente con
+OFFSET a las mismas profundidades, como referencia.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed_users(total: int, batch_size: int = 5000) -> None:
+    from sqlalchemy import insert, select
+    from app.database.connection import SessionLocal
+    from app.users.models import User, UserRole
+    from app.database.models import Department
+
+    db = SessionLocal()
+    try:
+        department = db.execute(select(Department)).scalars().first()
+        if department is None:
+            raise SystemExit("Se requiere al menos un departamento (python app/scripts/init_db.py)")
+
+        started = datetime.utcnow() - timedelta(seconds=total)
+        for offset in range(0, total, batch_size):
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "email": f"bench-{uuid.uuid4().hex}@municipalidad.gob.cl",
+                    "password_hash": "x",
+                    "first_name": "Bench",
+                    "last_name": str(number),
+                    "avatar": "x" * 2048,
+                    "department_id": department.id,
+                    "department_name": department.name,
+                    "role": UserRole.USER,
+                    "is_active": True,
+                    "created_at": started + timedelta(seconds=number),
+                    "updated_at": started + timedelta(seconds=number),
+                }
+                for number in range(offset, min(offset + batch_size, total))
+            ]
+            db.execute(insert(User), rows)
+            db.commit()
+            print(f"  {min(offset + batch_size, total)}/{total} usuarios insertados")
+    finally:
+        db.close()
+
+
+def offset_latency(depths, page_size: int, repeats: int = 3) -> dict:
+    from sqlalchemy import select
+    from app.database.connection import SessionLocal
+    from app.users.models import User
+    from app.users.service import USER_LIST_FIELDS
+
+    db = SessionLocal()
+    results = {}
+    try:
+        for depth in depths:
+            statement = (
+                select(User)
+                .options(USER_LIST_FIELDS.load_options(USER_LIST_FIELDS.default))
+                .order_by(User.created_at.desc(), User.id.desc())
+                .offset(depth * page_size)
+                .limit(page_size)
+            )
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                db.execute(statement).scalars().all()
+                timings.append(time.perf_counter() - started)
+            results[depth] = round(statistics.median(timings) * 1000, 2)
+    finally:
+        db.close()
+    return results
+
+
+async def walk_pages(url: str, email: str, password: str, page_size: int, max_pages: int) -> list:
+    async with httpx.AsyncClient(base_url=url, timeout=30.0) as client:
+        response = await client.post("/api/auth/login", json={"email": email, "password": password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        latencies = []
+        cursor = None
+        while len(latencies) < max_pages:
+            params = {"pageSize": page_size}
+            if cursor:
+                params["cursor"] = cursor
+            started = time.perf_counter()
+            result = await client.get("/api/users", headers=headers, params=params)
+            latencies.append(time.perf_counter() - started)
+            result.raise_for_status()
+            cursor = result.json()["nextCursor"]
+            if cursor is None:
+                break
+        return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de paginación por cursor según profundidad")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@municipalidad.gob.cl")
+    parser.add_argument("--password", default="123456")
+    parser.add_argument("--seed", type=int, default=0, help="Usuarios sintéticos a insertar antes de medir")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--max-pages", type=int, default=100000)
+    parser.add_argument("--buckets", type=int, default=10, help="Tramos de profundidad del reporte")
+    parser.add_argument("--compare-offset", action="store_true", help="Medir también OFFSET a las mismas profundidades")
+    args = parser.parse_args()
+
+    if args.seed:
+        print(f"Insertando {args.seed} usuarios...")
+        seed_users(args.seed)
+
+    latencies = asyncio.run(walk_pages(args.url, args.email, args.password, args.page_size, args.max_pages))
+    pages = len(latencies)
+    bucket_size = max(1, pages // args.buckets)
+
+    print(f"\nPáginas recorridas: {pages} (pageSize={args.page_size})")
+    print(f"{'páginas':>17} {'p50 ms':>8} {'p95 ms':>8}")
+    depths = []
+    for start in range(0, pages, bucket_size):
+        bucket = sorted(latencies[start:start + bucket_size])
+        depths.append(start)
+        print(
+            f"{start:>8}-{start + len(bucket) - 1:<8} "
+            f"{statistics.median(bucket) * 1000:>8.2f} "
+            f"{bucket[max(0, int(len(bucket) * 0.95) - 1)] * 1000:>8.2f}"
+        )
+
+    if args.compare_offset:
+        print("\nOFFSET equivalente (consulta directa, mediana de 3):")
+        for depth, latency_ms in offset_latency(depths, args.page_size).items():
+            print(f"  página {depth:>8}: {latency_ms:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Micro-benchmark del costo de serialización por request de /api/auth/me.
+
+Uso:
+
+    python benchmarks/bench_serialization.py --iterations 100000
+
+Compara, en proceso y sin red ni base de datos, el camino anterior
+(`UserResponse(**user.to_dict())` validado por `response_model` y
+codificado con `json.dumps`) contra el actual (JSON del snapshot
+serializado una vez y reutilizado), además del costo de la primera
+serialización de un snapshot recién cargado.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Valores mínimos para poder importar la configuración sin `.env`
+for name, value in {
+    "DB_HOST": "localhost", "DB_NAME": "bench", "DB_USER": "bench",
+    "DB_PASSWORD": "bench", "SECRET_KEY": "bench",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import _prepare_response_content
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.auth.schemas import UserResponse
+from app.core.serialization import PreEncodedJSONResponse, dumps, orjson
+from app.users.cache import UserSnapshot
+from app.users.models import UserRole
+
+
+def make_snapshot() -> UserSnapshot:
+    now = datetime.utcnow()
+    return UserSnapshot(
+        id="6b067542-d252-4bc4-ac5a-4b67f9e6c8a5",
+        email="jefa.finanzas@municipalidad.gob.cl",
+        first_name="María José",
+        last_name="Pérez Soto",
+        phone="+56 9 1234 5678",
+        avatar_sha256="e3d7a554979d3dd4751fb84d958ae0841badac7b0affb079e75ae9bbf4fb0293",
+        department_id="1f0c2d43-9a77-4c3b-9f0e-5d1c6a2b7e11",
+        department_name="Finanzas",
+        role=UserRole.MANAGER,
+        is_active=True,
+        last_login=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def previous_path(snapshot: UserSnapshot, adapter: TypeAdapter) -> bytes:
+    """dict -> UserResponse -> validación de response_model -> dict -> json.dumps"""
+    model = UserResponse(**snapshot.to_dict())
+    content = _prepare_response_content(model, exclude_unset=False)
+    validated = adapter.validate_python(content)
+    payload = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return JSONResponse(payload).body
+
+
+def current_path(snapshot: UserSnapshot) -> bytes:
+    """JSON cacheado en el snapshot"""
+    return PreEncodedJSONResponse(snapshot.to_json()).body
+
+
+def first_request_path() -> bytes:
+    """Snapshot recién cargado (cache frío): construir y serializar una vez"""
+    return make_snapshot().to_json()
+
+
+def measure(label: str, func, iterations: int) -> float:
+    for _ in range(min(1000, iterations)):
+        func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call_us = (time.perf_counter() - started) / iterations * 1_000_000
+    print(f"{label:<42} {per_call_us:>9.2f} µs/request")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de serialización de /api/auth/me")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    snapshot = make_snapshot()
+    adapter = TypeAdapter(UserResponse)
+
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'json (stdlib)'}")
+    print(f"Tamaño del payload: {len(snapshot.to_json())} bytes\n")
+
+    previous = measure("Anterior (Pydantic + response_model + json)", lambda: previous_path(snapshot, adapter), args.iterations)
+    cold = measure("Actual, snapshot nuevo (to_dict + orjson)", first_request_path, args.iterations)
+    current = measure("Actual, snapshot cacheado", lambda: current_path(snapshot), args.iterations)
+
+    print(f"\nMejora por request: {previous / current:.1f}x (cacheado), {previous / cold:.1f}x (cache frío)")
+    print(f"Serialización de ejemplo: {dumps(snapshot.to_dict())[:80].decode()}...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# backend/benchmarks/bench_startup.py
+"""
+Tiempo de arranque de la API.
+
+Uso:
+
+    python benchmarks/bench_startup.py --runs 5 --compare-create-tables \\
+        --email admin@municipalidad.gob.cl --password 123456
+
+Mide, en procesos nuevos con la configuración de `.env`:
+- importación de `app.main` (con `--import-profile`, los módulos que más
+  tardan según `python -X importtime`),
+- arranque de uvicorn hasta la primera respuesta de `/api/health`
+  (importación + lifespan),
+- latencia de la primera request y, con `--email/--password`, de la
+  primera lectura del directorio de departamentos (primera consulta a la
+  base de datos del proceso, tras un login no medido).
+
+Con `--compare-create-tables` repite el arranque con `AUTO_CREATE_TABLES=True`
+(el comportamiento anterior: DDL en cada inicio) como referencia.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def import_profile(env: dict, top: int) -> None:
+    """Módulos con mayor tiempo acumulado de importación"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self [us] | cumulative | módulo"
+        _, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), module.strip()))
+    print("\nMódulos con mayor tiempo de importación (acumulado):")
+    for cumulative_us, module in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+def measure_boot(env: dict, timeout: float, credentials: Optional[dict]) -> dict:
+    """Arrancar uvicorn y medir hasta la primera respuesta"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit(f"El servidor terminó al iniciar:\n{process.stderr.read().decode()[-2000:]}")
+                if time.perf_counter() - started > timeout:
+                    raise SystemExit("Tiempo de espera agotado")
+                try:
+                    before = time.perf_counter()
+                    response = client.get("/api/health")
+                    if response.status_code == 200:
+                        ready = time.perf_counter()
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+
+            result = {"ready": (ready - started) * 1000, "first": (ready - before) * 1000}
+            if credentials:
+                token = client.post("/api/auth/login", json=credentials).json()["access_token"]
+                before = time.perf_counter()
+                client.get("/api/departments", headers={"Authorization": f"Bearer {token}"}).raise_for_status()
+                result["db"] = (time.perf_counter() - before) * 1000
+            return result
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(label: str, values) -> None:
+    values = list(values)
+    print(f"{label:<46} mediana {statistics.median(values):8.1f} ms | mín {min(values):8.1f} ms")
+
+
+def run_boot(label: str, env: dict, runs: int, timeout: float, credentials: Optional[dict]) -> None:
+    results = [measure_boot(env, timeout, credentials) for _ in range(runs)]
+    print(f"\n{label}")
+    summarize("  Inicio del proceso → primera respuesta", (r["ready"] for r in results))
+    summarize("  Primera request (/api/health)", (r["first"] for r in results))
+    if credentials:
+        summarize("  Primera lectura de /api/departments", (r["db"] for r in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de la API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--import-profile", type=int, default=0, metavar="N", help="Mostrar los N módulos más lentos")
+    parser.add_argument("--compare-create-tables", action="store_true")
+    parser.add_argument("--email", help="Usuario para medir la primera consulta a la base de datos")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+    credentials = {"email": args.email, "password": args.password} if args.email else None
+
+    env = dict(os.environ, AUTO_CREATE_TABLES="False", JOBS_ENABLED=os.environ.get("JOBS_ENABLED", "False"))
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    summarize("Importación de app.main", imports)
+    if args.import_profile:
+        import_profile(env, args.import_profile)
+
+    run_boot("Arranque con verificación de versión del esquema", env, args.runs, args.timeout, credentials)
+    if args.compare_create_tables:
+        run_boot("Arranque con AUTO_CREATE_TABLES=True (anterior)", dict(env, AUTO_CREATE_TABLES="True"), args.runs, args.timeout, credentials)
+
+
+if __name__ == "__main__":
+    main()
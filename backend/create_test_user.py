@@ -6,20 +6,17 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from sqlalchemy.orm import sessionmaker
-from app.database.connection import engine, Base
+from app.database.connection import engine
 from app.users.models import User, UserRole
 from app.database.models import Department
 from app.core.security import get_password_hash
+from app.scripts.init_db import init_database
 
 def recreate_database():
     """Recrear todas las tablas - ELIMINA TODOS LOS DATOS"""
-    print("🗑️  Eliminando tablas existentes...")
-    Base.metadata.drop_all(engine)
-    
-    print("🏗️  Creando tablas con estructura actualizada...")
-    Base.metadata.create_all(engine)
-    
-    print("✅ Base de datos recreada exitosamente")
+    # Igual que scripts/init_db.py: el esquema queda marcado con la última
+    # migración, que la API verifica al iniciar
+    init_database()
 
 def create_test_data():
     """Crear datos de prueba"""
@@ -99,6 +96,8 @@ def create_test_data():
             }
         ]
         
+        # department_name y Department.user_count se mantienen por eventos
+        # del modelo User al hacer flush
         for user_data in users:
             department = user_data.pop("department")
             password = user_data.pop("password")
@@ -107,17 +106,12 @@ def create_test_data():
                 **user_data,
                 password_hash=get_password_hash(password),
                 department_id=department.id,
-                department_name=department.name,
                 is_active=True
             )
             
             db.add(user)
             print(f"   👤 Usuario creado: {user.email} ({user.role.value})")
         
-        # Incrementar contador de usuarios en departamentos
-        for dept in created_departments:
-            dept.user_count = len([u for u in users if u["department"] == dept])
-        
         db.commit()
         
         print("\n✅ Datos de prueba creados exitosamente!")
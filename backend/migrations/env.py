@@ -0,0 +1,60 @@
+# backend/migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.config import settings
+from app.database.connection import Base, engine, import_models
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# Registrar todos los modelos en Base.metadata (para --autogenerate)
+import_models()
+target_metadata = Base.metadata
+
+# SQLite (sustituto local) no soporta ALTER TABLE completo: modo batch
+render_as_batch = settings.DB_DIALECT == "sqlite"
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Ignorar en --autogenerate los objetos de búsqueda propios de cada motor"""
+    if type_ == "table" and name.startswith("document_search_fts"):
+        return False  # Tabla FTS5 de SQLite y sus tablas internas
+    if type_ == "index" and name == "ft_document_search" and settings.DB_DIALECT != "mysql":
+        return False  # Índice FULLTEXT: solo MySQL
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Generar el SQL sin conectarse (alembic upgrade head --sql)"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=render_as_batch,
+            include_object=include_object,
+            compare_type=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
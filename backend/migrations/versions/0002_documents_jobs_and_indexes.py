@@ -0,0 +1,192 @@
+"""Documentos, trabajos, rate limiting, avatares en archivos e índices de paginación
+
+- Tablas document_blobs, documents, document_search (FULLTEXT en MySQL,
+  FTS5 en SQLite), jobs y rate_limit_counters.
+- users.avatar_sha256 (los avatares base64 existentes se mueven a archivos
+  con `python app/scripts/migrate_avatars.py` después de esta migración).
+- users.department_id pasa a CHAR(36) con clave foránea a departments.
+- Índices (created_at, id) para paginación por cursor.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índice de búsqueda en SQLite (sustituto local): tabla FTS5 mantenida por triggers
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS document_search_fts USING fts5(
+        title, department_name, body,
+        content='document_search', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS document_search_ai AFTER INSERT ON document_search BEGIN
+        INSERT INTO document_search_fts(rowid, title, department_name, body)
+        VALUES (new.id, new.title, new.department_name, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS document_search_ad AFTER DELETE ON document_search BEGIN
+        INSERT INTO document_search_fts(document_search_fts, rowid, title, department_name, body)
+        VALUES ('delete', old.id, old.title, old.department_name, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS document_search_au AFTER UPDATE ON document_search BEGIN
+        INSERT INTO document_search_fts(document_search_fts, rowid, title, department_name, body)
+        VALUES ('delete', old.id, old.title, old.department_name, old.body);
+        INSERT INTO document_search_fts(rowid, title, department_name, body)
+        VALUES (new.id, new.title, new.department_name, new.body);
+    END""",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.create_table(
+        'document_blobs',
+        sa.Column('sha256', mysql.CHAR(length=64), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+
+    # users.department_id: CHAR(36) con clave foránea (antes VARCHAR(100) sin FK)
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('avatar_sha256', mysql.CHAR(length=64), nullable=True))
+        batch_op.alter_column(
+            'department_id',
+            existing_type=sa.String(length=100),
+            type_=mysql.CHAR(length=36),
+            existing_nullable=False
+        )
+        batch_op.create_foreign_key('fk_users_department_id_departments', 'departments', ['department_id'], ['id'])
+        batch_op.create_index('ix_users_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_users_department_created_at_id', ['department_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('departments', schema=None) as batch_op:
+        batch_op.create_index('ix_departments_created_at_id', ['created_at', 'id'], unique=False)
+
+    op.create_table(
+        'documents',
+        sa.Column('id', mysql.CHAR(length=36), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', mysql.CHAR(length=64), nullable=False),
+        sa.Column('department_id', mysql.CHAR(length=36), nullable=False),
+        sa.Column('department_name', sa.String(length=100), nullable=False),
+        sa.Column('uploaded_by', mysql.CHAR(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['department_id'], ['departments.id']),
+        sa.ForeignKeyConstraint(['sha256'], ['document_blobs.sha256']),
+        sa.ForeignKeyConstraint(['uploaded_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_documents_created_at_id', 'documents', ['created_at', 'id'], unique=False)
+    op.create_index('ix_documents_department_created_at_id', 'documents', ['department_id', 'created_at', 'id'], unique=False)
+    op.create_index(op.f('ix_documents_department_id'), 'documents', ['department_id'], unique=False)
+    op.create_index(op.f('ix_documents_sha256'), 'documents', ['sha256'], unique=False)
+    op.create_index(op.f('ix_documents_uploaded_by'), 'documents', ['uploaded_by'], unique=False)
+
+    op.create_table(
+        'document_search',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('document_id', mysql.CHAR(length=36), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('department_name', sa.String(length=100), nullable=False),
+        sa.Column('body', sa.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('document_id'),
+    )
+    if dialect == 'mysql':
+        op.create_index('ft_document_search', 'document_search', ['title', 'department_name', 'body'], unique=False, mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('document_id', mysql.CHAR(length=36), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('result', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_jobs_document_id'), 'jobs', ['document_id'], unique=False)
+    op.create_index('ix_jobs_status_run_after', 'jobs', ['status', 'run_after'], unique=False)
+
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(length=320), nullable=False),
+        sa.Column('window', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key', 'window'),
+    )
+    op.create_index(op.f('ix_rate_limit_counters_expires_at'), 'rate_limit_counters', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.drop_index(op.f('ix_rate_limit_counters_expires_at'), table_name='rate_limit_counters')
+    op.drop_table('rate_limit_counters')
+
+    op.drop_index('ix_jobs_status_run_after', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_document_id'), table_name='jobs')
+    op.drop_table('jobs')
+
+    if dialect == 'mysql':
+        op.drop_index('ft_document_search', table_name='document_search')
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS document_search_fts")
+    op.drop_table('document_search')
+
+    op.drop_index(op.f('ix_documents_uploaded_by'), table_name='documents')
+    op.drop_index(op.f('ix_documents_sha256'), table_name='documents')
+    op.drop_index(op.f('ix_documents_department_id'), table_name='documents')
+    op.drop_index('ix_documents_department_created_at_id', table_name='documents')
+    op.drop_index('ix_documents_created_at_id', table_name='documents')
+    op.drop_table('documents')
+
+    with op.batch_alter_table('departments', schema=None) as batch_op:
+        batch_op.drop_index('ix_departments_created_at_id')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_department_created_at_id')
+        batch_op.drop_index('ix_users_created_at_id')
+        batch_op.drop_constraint('fk_users_department_id_departments', type_='foreignkey')
+        batch_op.alter_column(
+            'department_id',
+            existing_type=mysql.CHAR(length=36),
+            type_=sa.String(length=100),
+            existing_nullable=False
+        )
+        batch_op.drop_column('avatar_sha256')
+
+    op.drop_table('document_blobs')
@@ -0,0 +1,175 @@
+# backend/run_production.py
+"""
+Servidor de producción: varios procesos uvicorn sobre un mismo socket.
+
+Uso: python run_production.py [--workers N] [--host 0.0.0.0] [--port 8000]
+
+- La aplicación se importa una sola vez en el proceso maestro antes de
+  crear los workers con fork: los módulos importados se comparten
+  copy-on-write y cada worker arranca sin volver a importarlos.
+- Event loop uvloop y parser HTTP httptools cuando están instalados
+  (incluidos en uvicorn[standard]).
+- SIGTERM / SIGINT: los workers dejan de aceptar conexiones y esperan las
+  requests en curso (p. ej. uploads) hasta SERVER_GRACEFUL_TIMEOUT_SECONDS;
+  pasado ese plazo (más un margen) el maestro los termina.
+- Un worker que termina inesperadamente se reemplaza.
+- El pool de conexiones de cada worker se dimensiona con
+  DB_CONNECTION_BUDGET / workers (ver `pool_limits`).
+
+Para desarrollo usar `python run_server.py` (un proceso, con recarga).
+"""
+import argparse
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+from app.core.config import settings
+
+# Margen sobre el drenaje de los workers antes de forzar su término
+KILL_MARGIN_SECONDS = 5
+# Código de salida de un worker cuyo lifespan falló (p. ej. esquema atrasado)
+STARTUP_FAILURE_EXIT_CODE = 3
+# Un worker que muere antes de esto se reinicia con espera (evita bucles de caídas)
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+
+def create_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """Proceso maestro: crea, vigila y detiene los workers"""
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: Dict[int, float] = {}  # pid -> instante de inicio
+        self.stopping = False
+        self.failed = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.children[pid] = time.monotonic()
+
+    def _run_worker(self) -> None:
+        # Hijo: uvicorn instala sus propios manejadores de señales
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGALRM):
+            signal.signal(signum, signal.SIG_DFL)
+        code = 1
+        try:
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.sock])
+            code = 0 if server.started else STARTUP_FAILURE_EXIT_CODE
+        finally:
+            os._exit(code)
+
+    def _handle_stop(self, signum, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        print(f"🛑 Deteniendo {len(self.children)} workers (drenando requests en curso)...", flush=True)
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        signal.alarm(settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + KILL_MARGIN_SECONDS)
+
+    def _handle_alarm(self, signum, frame) -> None:
+        for pid in list(self.children):
+            print(f"⚠️  Worker {pid} no terminó a tiempo, forzando término", flush=True)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGALRM, self._handle_alarm)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            if os.waitstatus_to_exitcode(status) == STARTUP_FAILURE_EXIT_CODE:
+                # No tiene sentido reintentar: detener el resto y salir con error
+                print(f"❌ Worker {pid} no pudo iniciar la aplicación", flush=True)
+                self.failed = True
+                self._handle_stop(signal.SIGTERM, None)
+                continue
+
+            print(f"⚠️  Worker {pid} terminó (código {os.waitstatus_to_exitcode(status)}), reemplazando", flush=True)
+            if time.monotonic() - started < MIN_WORKER_LIFETIME_SECONDS:
+                time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+            if not self.stopping:
+                self.spawn()
+
+        signal.alarm(0)
+        if self.failed:
+            return 1
+        print("✅ Servidor detenido", flush=True)
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de producción (varios workers)")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS, help="0 = número de CPUs")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    # Antes de importar la app: el pool de cada worker se dimensiona con esto
+    settings.SERVER_WORKERS = workers
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    # Precarga: importar la aplicación en el maestro (compartida con los workers)
+    from app.database.connection import pool_limits
+    from app.main import app
+
+    pool_size, max_overflow = pool_limits()
+    print("🚀 Iniciando Intranet Municipal API (producción)")
+    print(f"🌐 http://{args.host}:{args.port} | workers: {workers} | loop: {loop} | http: {http}")
+    print(f"🗄️  Pool por worker: {pool_size} + {max_overflow} conexiones")
+
+    config = uvicorn.Config(
+        app,
+        loop=loop,
+        http=http,
+        lifespan="on",
+        log_config=None,  # El logging lo configura app.core.logging_config
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        backlog=settings.SERVER_BACKLOG,
+        server_header=False,
+    )
+    sock = create_socket(args.host, args.port, settings.SERVER_BACKLOG)
+    return PreforkServer(config, sock, workers).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
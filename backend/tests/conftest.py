@@ -0,0 +1,80 @@
+# backend/tests/conftest.py
+"""
+Fixtures de las pruebas de endpoints.
+
+La configuración se define antes de importar la aplicación: SQLite en un
+directorio temporal como sustituto de MySQL, uploads en el mismo
+directorio y sin worker de trabajos ni rate limiting. El logging de la
+aplicación queda activo (setup_logging), igual que en producción.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_TEST_DIR = tempfile.mkdtemp(prefix="intranet-tests-")
+os.environ.update({
+    "DB_DIALECT": "sqlite",
+    "SQLITE_PATH": os.path.join(_TEST_DIR, "test.db"),
+    "DB_HOST": "localhost",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "SECRET_KEY": "test-secret-key",
+    "DEBUG": "False",
+    "UPLOAD_DIR": os.path.join(_TEST_DIR, "uploads"),
+    "AUTO_CREATE_TABLES": "True",
+    "JOBS_ENABLED": "False",
+    "RATE_LIMIT_ENABLED": "False",
+    "EMAIL_FILTER_ENABLED": "False",
+    "USER_IMPORT_HASH_WORKERS": "1",
+    "LOG_LEVEL": "INFO",  # Los registros INFO se construyen: detecta claves `extra` inválidas
+})
+
+ADMIN_EMAIL = "admin@municipalidad.gob.cl"
+ADMIN_PASSWORD = "admin123"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.database.connection import SessionLocal, create_tables
+    from app.main import app
+
+    create_tables()
+    from app.core.security import get_password_hash
+    from app.database.models import Department
+    from app.users.models import User, UserRole
+
+    db = SessionLocal()
+    try:
+        department = Department(name="Administración", code="ADM")
+        db.add(department)
+        db.flush()
+        db.add(User(
+            email=ADMIN_EMAIL,
+            password_hash=get_password_hash(ADMIN_PASSWORD),
+            first_name="Admin",
+            last_name="Municipal",
+            department_id=department.id,
+            department_name=department.name,
+            role=UserRole.ADMIN
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,22 @@
+# backend/tests/test_auth.py
+import pytest
+from pydantic import ValidationError
+
+from app.auth.schemas import LoginRequest, validate_institutional_email
+
+
+def test_login_email_is_lowercased():
+    # EmailStr normaliza el dominio antes del validador; la parte local se pasa a minúsculas al final
+    assert LoginRequest(email="Juan.Perez@municipalidad.gob.cl", password="123456").email == "juan.perez@municipalidad.gob.cl"
+    assert LoginRequest(email="juan@MUNICIPALIDAD.GOB.CL", password="123456").email == "juan@municipalidad.gob.cl"
+
+
+def test_login_rejects_non_institutional_domain():
+    with pytest.raises(ValidationError):
+        LoginRequest(email="juan@gmail.com", password="123456")
+
+
+def test_domain_is_checked_before_lowercasing():
+    assert validate_institutional_email("Juan@admin.cl") == "juan@admin.cl"
+    with pytest.raises(ValueError):
+        validate_institutional_email("juan@ADMIN.CL")
@@ -0,0 +1,60 @@
+# backend/tests/test_departments.py
+
+
+def _department_id(client, headers, code: str) -> str:
+    response = client.get("/api/departments", headers=headers)
+    assert response.status_code == 200, response.text
+    return next(department["id"] for department in response.json()["departments"] if department["code"] == code)
+
+
+def _rename(client, headers, department_id: str, name: str) -> None:
+    response = client.put(f"/api/departments/{department_id}", headers=headers, json={"name": name})
+    assert response.status_code == 200, response.text
+
+
+def test_rename_propagates_to_users_documents_and_search(client, admin_headers):
+    department_id = _department_id(client, admin_headers, "ADM")
+    upload = client.post(
+        "/api/documents", headers=admin_headers,
+        files={"file": ("ordenanza.txt", b"ordenanza municipal", "text/plain")}
+    )
+    assert upload.status_code == 201, upload.text
+    original = upload.json()["departmentName"]
+
+    _rename(client, admin_headers, department_id, "Alcaldía")
+    try:
+        me = client.get("/api/auth/me", headers=admin_headers)
+        assert me.json()["departmentName"] == "Alcaldía"
+
+        listed = client.get("/api/documents", headers=admin_headers, params={"departmentId": department_id})
+        assert {document["departmentName"] for document in listed.json()["results"]} == {"Alcaldía"}
+
+        found = client.get("/api/documents/search", headers=admin_headers, params={"q": "Alcaldía"})
+        assert upload.json()["id"] in {hit["document"]["id"] for hit in found.json()["results"]}
+    finally:
+        _rename(client, admin_headers, department_id, original)
+
+
+def test_rename_by_another_worker_clears_user_cache_on_directory_reload(client, admin_headers):
+    from app.database.connection import SessionLocal
+    from app.database.models import Department
+    from app.departments.service import department_directory
+
+    department_id = _department_id(client, admin_headers, "ADM")
+    original = client.get("/api/auth/me", headers=admin_headers).json()["departmentName"]  # snapshot en cache
+
+    # Otro worker renombra: este proceso no vacía su cache en el PUT
+    db = SessionLocal()
+    try:
+        db.get(Department, department_id).name = "Secretaría Municipal"
+        db.commit()
+    finally:
+        db.close()
+    assert client.get("/api/auth/me", headers=admin_headers).json()["departmentName"] == original
+
+    try:
+        department_directory.invalidate()  # Siguiente verificación de la huella
+        _department_id(client, admin_headers, "ADM")
+        assert client.get("/api/auth/me", headers=admin_headers).json()["departmentName"] == "Secretaría Municipal"
+    finally:
+        _rename(client, admin_headers, department_id, original)
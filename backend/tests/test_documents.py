@@ -0,0 +1,314 @@
+# backend/tests/test_documents.py
+import pytest
+
+
+def test_batch_upload_creates_documents(client, admin_headers):
+    files = [
+        ("files", ("informe.txt", b"contenido del informe", "text/plain")),
+        ("files", ("acta.txt", b"contenido del acta", "text/plain")),
+    ]
+    response = client.post("/api/documents/batch", headers=admin_headers, files=files)
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["created"] == 2
+    assert body["failed"] == 0
+    assert [result["status"] for result in body["results"]] == ["created", "created"]
+
+
+def test_batch_upload_without_files_is_rejected(client, admin_headers):
+    response = client.post("/api/documents/batch", headers=admin_headers, data={"title": "sin archivo"})
+
+    assert response.status_code == 400
+
+
+def _truncated_body(boundary: str) -> bytes:
+    # Parte de archivo sin el delimitador de cierre (cliente desconectado)
+    return (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="cortado.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + b"contenido incompleto"
+
+
+def _leftover_temp_files():
+    from app.documents.storage import document_storage
+    return list(document_storage.temp_dir.glob("*.part"))
+
+
+def test_truncated_upload_is_rejected_without_leaking_temp_file(client, admin_headers):
+    boundary = "limite-prueba"
+    for path in ("/api/documents", "/api/documents/batch"):
+        response = client.post(
+            path,
+            headers={**admin_headers, "Content-Type": f"multipart/form-data; boundary={boundary}"},
+            content=_truncated_body(boundary)
+        )
+
+        assert response.status_code == 400, (path, response.text)
+        assert _leftover_temp_files() == []
+
+
+CONTENT = b"0123456789abcdefghij"
+
+
+def _upload(client, headers, content=CONTENT, filename="rango.txt"):
+    response = client.post("/api/documents", headers=headers, files={"file": (filename, content, "text/plain")})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_download_ranges(client, admin_headers):
+    document = _upload(client, admin_headers)
+    url = f"/api/documents/{document['id']}/download"
+
+    partial = client.get(url, headers={**admin_headers, "Range": "bytes=2-5"})
+    assert partial.status_code == 206
+    assert partial.content == CONTENT[2:6]
+    assert partial.headers["content-range"] == f"bytes 2-5/{len(CONTENT)}"
+
+    unsatisfiable = client.get(url, headers={**admin_headers, "Range": "bytes=100-200"})
+    assert unsatisfiable.status_code == 416
+
+    stale = client.get(url, headers={**admin_headers, "Range": "bytes=2-5", "If-Range": '"otro"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+
+def _zerocopy_call(path, request_headers):
+    import asyncio
+
+    from app.documents.responses import ZEROCOPY_EXTENSION, BlobFileResponse
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in request_headers.items()],
+        "extensions": {ZEROCOPY_EXTENSION: {}},
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    response = BlobFileResponse(path, media_type="text/plain", headers={"ETag": '"abc"'})
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+def test_zerocopy_single_range(tmp_path):
+    path = tmp_path / "blob"
+    path.write_bytes(CONTENT)
+
+    start, body = _zerocopy_call(path, {"Range": "bytes=-4", "If-Range": '"abc"'})
+    assert start["status"] == 206
+    assert (body["offset"], body["count"]) == (len(CONTENT) - 4, 4)
+
+    start, body = _zerocopy_call(path, {})
+    assert start["status"] == 200
+    assert (body["offset"], body["count"]) == (0, len(CONTENT))
+
+
+def test_parse_single_range():
+    from app.documents.responses import parse_single_range
+
+    assert parse_single_range("bytes=0-0", 10) == (0, 1)
+    assert parse_single_range("bytes=5-", 10) == (5, 10)
+    assert parse_single_range("bytes=8-100", 10) == (8, 10)
+    assert parse_single_range("bytes=-3", 10) == (7, 10)
+    assert parse_single_range("bytes=0-1,4-5", 10) is None
+    assert parse_single_range("bytes=10-", 10) is None
+    assert parse_single_range("items=0-1", 10) is None
+    assert parse_single_range("bytes=a-b", 10) is None
+
+
+def _create_session(client, headers, content: bytes):
+    response = client.post(
+        "/api/documents/uploads",
+        headers=headers,
+        json={"filename": "reanudable.txt", "contentType": "text/plain", "size": len(content)}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _send_chunk(client, headers, session_id: str, offset: int, chunk: bytes):
+    return client.patch(
+        f"/api/documents/uploads/{session_id}",
+        headers={**headers, "Upload-Offset": str(offset)},
+        content=chunk
+    )
+
+
+def test_resumable_upload_completes_once(client, admin_headers):
+    content = b"contenido enviado en dos chunks"
+    session_id = _create_session(client, admin_headers, content)
+
+    # Chunks fuera de orden
+    assert _send_chunk(client, admin_headers, session_id, 10, content[10:]).status_code == 204
+    assert client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers).status_code == 409
+    assert _send_chunk(client, admin_headers, session_id, 0, content[:10]).status_code == 204
+
+    response = client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers)
+    assert response.status_code == 201, response.text
+    document_id = response.json()["id"]
+
+    again = client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers)
+    assert again.status_code == 404
+
+    download = client.get(f"/api/documents/{document_id}/download", headers=admin_headers)
+    assert download.content == content
+
+
+def test_resumable_complete_while_completing_is_rejected(client, admin_headers):
+    import asyncio
+
+    from app.documents.resumable import resumable_uploads
+
+    content = b"finalizaciones concurrentes"
+    session_id = _create_session(client, admin_headers, content)
+    assert _send_chunk(client, admin_headers, session_id, 0, content).status_code == 204
+    user_id = resumable_uploads._read(resumable_uploads._session_dir(session_id)).user_id
+
+    # Una primera finalización en curso (marcada, documento aún sin registrar)
+    asyncio.run(resumable_uploads.finalize(session_id, user_id))
+    response = client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers)
+    assert response.status_code == 409
+    assert _send_chunk(client, admin_headers, session_id, 0, content).status_code == 409
+
+    asyncio.run(resumable_uploads.release(session_id, user_id))
+    assert client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers).status_code == 201
+
+
+def test_resumable_sessions_per_user_are_limited(client, admin_headers, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RESUMABLE_MAX_SESSIONS_PER_USER", 1)
+    session_id = _create_session(client, admin_headers, b"abc")
+
+    response = client.post(
+        "/api/documents/uploads",
+        headers=admin_headers,
+        json={"filename": "otro.txt", "contentType": "text/plain", "size": 3}
+    )
+    assert response.status_code == 429
+
+    assert client.delete(f"/api/documents/uploads/{session_id}", headers=admin_headers).status_code == 200
+
+
+def test_resumable_ranges_are_merged_and_limited(client, admin_headers, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "RESUMABLE_MAX_RANGES", 2)
+    session_id = _create_session(client, admin_headers, b"0123456789")
+
+    assert _send_chunk(client, admin_headers, session_id, 0, b"01").status_code == 204
+    assert _send_chunk(client, admin_headers, session_id, 2, b"23").status_code == 204  # contiguo: se fusiona
+    assert _send_chunk(client, admin_headers, session_id, 6, b"67").status_code == 204
+    assert _send_chunk(client, admin_headers, session_id, 9, b"9").status_code == 400  # tercer rango
+
+    state = client.get(f"/api/documents/uploads/{session_id}", headers=admin_headers).json()
+    assert state["received"] == [[0, 4], [6, 8]]
+
+    assert client.delete(f"/api/documents/uploads/{session_id}", headers=admin_headers).status_code == 200
+
+
+def test_resumable_complete_waits_for_active_writers(client, admin_headers):
+    from app.documents.resumable import UploadAlreadyCompleting, resumable_uploads
+
+    content = b"chunk en curso durante complete"
+    session_id = _create_session(client, admin_headers, content)
+    assert _send_chunk(client, admin_headers, session_id, 0, content).status_code == 204
+    session_dir = resumable_uploads._session_dir(session_id)
+    user_id = resumable_uploads._read(session_dir).user_id
+
+    # Un PATCH reenviando un rango sigue abierto: complete debe esperar
+    resumable_uploads._begin_write(session_dir, user_id, "escritor", 0)
+    response = client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers)
+    assert response.status_code == 409
+    resumable_uploads._end_write(session_dir, "escritor", 0, 0)
+
+    # Un lease tomado antes de finalizar no puede escribir después del hash
+    resumable_uploads._begin_write(session_dir, user_id, "tardio", 0)
+    session = resumable_uploads._read(session_dir)
+    session.leases.clear()  # lease vencido: ya no bloquea complete
+    resumable_uploads._write(session_dir, session)
+    resumable_uploads._set_completing(session_id, user_id, True)
+    with open(session_dir / "data", "r+b") as data:
+        with pytest.raises(UploadAlreadyCompleting):
+            resumable_uploads._write_at(session_dir, "tardio", data, 0, b"X")
+    assert (session_dir / "data").read_bytes() == content
+
+    # Tampoco se puede cancelar mientras se finaliza
+    assert client.delete(f"/api/documents/uploads/{session_id}", headers=admin_headers).status_code == 409
+
+    resumable_uploads._set_completing(session_id, user_id, False)
+    response = client.post(f"/api/documents/uploads/{session_id}/complete", headers=admin_headers)
+    assert response.status_code == 201, response.text
+
+
+def _documents_with_content(content: bytes) -> int:
+    import hashlib
+
+    from app.database.connection import SessionLocal
+    from app.documents.models import Document
+
+    db = SessionLocal()
+    try:
+        return db.query(Document).filter(Document.sha256 == hashlib.sha256(content).hexdigest()).count()
+    finally:
+        db.close()
+
+
+def test_failed_publish_does_not_commit_document(client, admin_headers, monkeypatch):
+    from app.documents.storage import document_storage
+
+    def no_space(stored):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(document_storage, "publish", no_space)
+    content = b"sin espacio para publicar"
+    response = client.post("/api/documents", headers=admin_headers, files={"file": ("lleno.txt", content, "text/plain")})
+
+    assert response.status_code == 500
+    assert _documents_with_content(content) == 0
+    assert _leftover_temp_files() == []
+
+
+def test_failed_commit_returns_published_blob(client, admin_headers, monkeypatch):
+    import hashlib
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.documents.storage import document_storage
+
+    async def failing_commit(self):
+        raise RuntimeError("commit fallido")
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    content = b"publicado antes de un commit fallido"
+    response = client.post("/api/documents", headers=admin_headers, files={"file": ("falla.txt", content, "text/plain")})
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert not document_storage.blob_exists(hashlib.sha256(content).hexdigest())
+    assert _documents_with_content(content) == 0
+    assert _leftover_temp_files() == []
+
+
+def test_publish_syncs_copies_received_while_blob_existed(tmp_path, monkeypatch):
+    from app.documents import storage
+    from app.documents.storage import DocumentStorage, StoredFile
+
+    synced = []
+    monkeypatch.setattr(storage.os, "fsync", lambda fd: synced.append(fd))
+    store = DocumentStorage(str(tmp_path))
+    temp_path = store.temp_dir / "copia.part"
+    temp_path.write_bytes(b"contenido")
+    stored = StoredFile(sha256="ab" * 32, size_bytes=9, temp_path=temp_path, durable=False)
+
+    assert store.publish(stored) is True
+    assert synced
+    assert store.blob_path(stored.sha256).read_bytes() == b"contenido"
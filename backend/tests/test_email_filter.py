@@ -0,0 +1,98 @@
+# backend/tests/test_email_filter.py
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.auth.email_filter import BloomFilter, KnownEmailFilter
+
+from tests.conftest import ADMIN_EMAIL, ADMIN_PASSWORD
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    emails = [f"usuario{number}@municipalidad.gob.cl" for number in range(1000)]
+    for email in emails:
+        bloom.add(email)
+
+    assert all(email in bloom for email in emails)
+    # Un valor nuevo cuyos bits ya estaban (falso positivo) no cuenta
+    assert 980 <= bloom.count <= 1000
+
+
+def test_bloom_filter_sizing_and_repeated_adds():
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    # m = -n ln p / (ln 2)^2, k = m / n ln 2
+    assert bloom.size == 9586
+    assert bloom.hash_count == 7
+
+    bloom.add("repetido@municipalidad.gob.cl")
+    assert not bloom.add("repetido@municipalidad.gob.cl")
+    assert bloom.count == 1
+
+    misses = sum(f"otro{number}@example.com" in bloom for number in range(2000))
+    assert misses < 20
+
+
+def _refresh(email_filter: KnownEmailFilter) -> int:
+    from app.core.config import settings
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{settings.SQLITE_PATH}")
+
+    async def run():
+        try:
+            async with AsyncSession(engine) as db:
+                return await email_filter.refresh(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_refresh_picks_up_late_committed_insert(client):
+    from app.core.security import get_password_hash
+    from app.database.connection import SessionLocal
+    from app.database.models import Department
+    from app.users.models import User
+
+    email_filter = KnownEmailFilter(false_positive_rate=0.01, min_capacity=100)
+    _refresh(email_filter)
+    assert email_filter.might_exist(ADMIN_EMAIL)
+
+    # created_at (flush) anterior al último usuario ya cargado, commit posterior
+    db = SessionLocal()
+    try:
+        newest = db.execute(select(func.max(User.created_at))).scalar_one()
+        department = db.execute(select(Department)).scalars().first()
+        db.add(User(
+            email="tardio@municipalidad.gob.cl",
+            password_hash=get_password_hash("clave123"),
+            first_name="Commit",
+            last_name="Tardío",
+            department_id=department.id,
+            created_at=newest - timedelta(seconds=30)
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    _refresh(email_filter)
+    assert email_filter.might_exist("tardio@municipalidad.gob.cl")
+
+
+def test_filter_miss_is_rechecked_in_database(client, monkeypatch):
+    from app.auth.email_filter import known_email_filter
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EMAIL_FILTER_ENABLED", True)
+    monkeypatch.setattr(known_email_filter, "_filter", BloomFilter(capacity=100, false_positive_rate=0.01))
+    credentials = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+
+    monkeypatch.setattr(settings, "EMAIL_FILTER_MISS_RECHECK_RATE", 0.0)
+    assert client.post("/api/auth/login", json=credentials).status_code == 401
+
+    # Al verificarse en la base el email vuelve al filtro
+    monkeypatch.setattr(settings, "EMAIL_FILTER_MISS_RECHECK_RATE", 1.0)
+    assert client.post("/api/auth/login", json=credentials).status_code == 200
+    assert known_email_filter.might_exist(ADMIN_EMAIL)
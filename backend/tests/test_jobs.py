@@ -0,0 +1,43 @@
+# backend/tests/test_jobs.py
+import asyncio
+import sys
+import time
+import types
+
+import pytest
+
+
+def test_process_task_timeout_replaces_pool(monkeypatch):
+    from app.core.config import settings
+    from app.jobs.worker import JobWorker, TaskTimeout
+
+    monkeypatch.setattr(settings, "JOB_TASK_TIMEOUT_SECONDS", 1.0)
+    worker = JobWorker({}, concurrency=1, process_workers=1, poll_interval=1.0)
+    worker._executor = worker._create_executor()
+    stuck = worker._executor
+
+    async def run():
+        with pytest.raises(TaskTimeout):
+            await worker.run_in_process(time.sleep, 60)
+        # El pool nuevo atiende las tareas siguientes
+        return await worker.run_in_process(abs, -7)
+
+    try:
+        assert asyncio.run(run()) == 7
+        assert worker._executor is not stuck
+        assert not any(process.is_alive() for process in (stuck._processes or {}).values())
+    finally:
+        worker._executor.shutdown(wait=True)
+
+
+def test_pdf_without_pages_has_no_thumbnail(monkeypatch, tmp_path):
+    from app.jobs.tasks import render_thumbnail
+
+    # pypdfium2 no es necesario para esta prueba: documento de cero páginas
+    fake = types.ModuleType("pypdfium2")
+    fake.PdfDocument = lambda path: []
+    monkeypatch.setitem(sys.modules, "pypdfium2", fake)
+
+    destination = tmp_path / "miniatura.png"
+    assert render_thumbnail(str(tmp_path / "vacio.pdf"), "application/pdf", str(destination), 64) is False
+    assert not destination.exists()
@@ -0,0 +1,21 @@
+# backend/tests/test_logging.py
+from logging.handlers import QueueHandler
+import io
+import logging
+
+from app.core.logging_config import setup_logging, shutdown_logging
+
+
+def test_records_after_shutdown_are_still_written():
+    setup_logging()
+    shutdown_logging()
+    root = logging.getLogger()
+    try:
+        assert not any(isinstance(handler, QueueHandler) for handler in root.handlers)
+        stream = io.StringIO()
+        for handler in root.handlers:
+            handler.setStream(stream)
+        logging.getLogger("app.tests").warning("Registro tras el cierre")
+        assert "Registro tras el cierre" in stream.getvalue()
+    finally:
+        setup_logging()
@@ -0,0 +1,63 @@
+# backend/tests/test_rate_limit.py
+import asyncio
+
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimit, RateLimiter
+
+RULE = RateLimit(scope="prueba", limit=5, window_seconds=60)
+
+
+def _limiter() -> RateLimiter:
+    return RateLimiter(MemoryRateLimitBackend(max_keys=100))
+
+
+def _hit(limiter: RateLimiter, now: float):
+    return asyncio.run(limiter.hit(RULE, "clave", now=now))
+
+
+def test_under_limit_is_allowed():
+    assert RateLimiter._retry_after(RULE, previous=0, current=4, offset=10.0) is None
+    # 6 anteriores con la mitad de la ventana solapada pesan 3: 3 + 1 < 5
+    assert RateLimiter._retry_after(RULE, previous=6, current=1, offset=30.0) is None
+
+
+def test_previous_window_is_weighted_by_overlap():
+    # 10 * 0.5 + 2 = 7 >= 5; baja de 5 cuando 10 * (1 - o/60) + 2 < 5, o > 42
+    assert RateLimiter._retry_after(RULE, previous=10, current=2, offset=30.0) == 13
+    # En o = 42 la estimación es exactamente 5: todavía bloqueado
+    assert RateLimiter._retry_after(RULE, previous=10, current=2, offset=42.0) == 1
+    assert RateLimiter._retry_after(RULE, previous=10, current=2, offset=43.0) is None
+
+
+def test_window_boundary():
+    # Al empezar la ventana la anterior pesa completa
+    assert RateLimiter._retry_after(RULE, previous=5, current=0, offset=0.0) == 1
+    assert RateLimiter._retry_after(RULE, previous=4, current=0, offset=0.0) is None
+
+
+def test_retry_after_when_current_window_is_full():
+    # 5 en la ventana actual: hay que pasar a la siguiente (55 s) y algo más
+    assert RateLimiter._retry_after(RULE, previous=0, current=5, offset=5.0) == 56
+    # Con más intentos de los permitidos la ventana actual debe pesar < 5/8
+    assert RateLimiter._retry_after(RULE, previous=0, current=8, offset=0.0) == 60 + 23
+
+
+def test_retry_after_is_exact_end_to_end():
+    limiter = _limiter()
+    for second in range(5):
+        assert _hit(limiter, 1000 * 60 + second) is None
+
+    now = 1000 * 60 + 5
+    retry_after = _hit(limiter, now)
+    assert retry_after is not None
+    assert _hit(limiter, now + retry_after - 1) is not None
+    assert _hit(limiter, now + retry_after) is None
+
+
+def test_rejected_attempts_are_not_counted():
+    limiter = _limiter()
+    for second in range(5):
+        _hit(limiter, second)
+    for second in range(5, 30):
+        assert _hit(limiter, second) is not None
+
+    assert asyncio.run(limiter.backend.counts("prueba:clave", 0)) == (0, 5)
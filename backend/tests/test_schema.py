@@ -0,0 +1,48 @@
+# backend/tests/test_schema.py
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import schema
+
+
+def _current_revisions(monkeypatch, path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setattr(schema, "async_engine", engine)
+
+    async def run():
+        try:
+            return await schema.current_revisions()
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_missing_version_table_means_no_migrations(monkeypatch, tmp_path):
+    path = str(tmp_path / "nueva.db")
+    sqlite3.connect(path).close()
+
+    assert _current_revisions(monkeypatch, path) is None
+
+
+def test_applied_revisions_are_read(monkeypatch, tmp_path):
+    path = str(tmp_path / "migrada.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)")
+        connection.execute("INSERT INTO alembic_version VALUES ('0002')")
+
+    assert _current_revisions(monkeypatch, path) == {"0002"}
+
+
+def test_other_errors_are_not_treated_as_unmigrated(monkeypatch, tmp_path):
+    # La tabla existe pero la consulta falla: el error se propaga
+    path = str(tmp_path / "rota.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE alembic_version (otra_columna INTEGER)")
+
+    with pytest.raises(DBAPIError):
+        _current_revisions(monkeypatch, path)
@@ -0,0 +1,114 @@
+# backend/tests/test_users.py
+from tests.conftest import ADMIN_EMAIL
+
+CSV_HEADER = "email,password,first_name,last_name,phone,department_code,role\n"
+
+
+def _import(client, headers, csv_text, dry_run=False):
+    return client.post(
+        "/api/users/import",
+        headers=headers,
+        params={"dryRun": str(dry_run).lower()},
+        files={"file": ("usuarios.csv", csv_text.encode("utf-8"), "text/csv")}
+    )
+
+
+def test_import_dry_run_validates_without_creating(client, admin_headers):
+    csv_text = CSV_HEADER + (
+        "prueba.seca@municipalidad.gob.cl,secreto1,Ana,Rojas,,adm,\n"
+        "fuera@gmail.com,secreto1,Luis,Soto,,ADM,\n"
+    )
+    response = _import(client, admin_headers, csv_text, dry_run=True)
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["dryRun"] is True
+    assert report["total"] == 2
+    assert report["valid"] == 1
+    assert report["created"] == 0
+    assert [error["line"] for error in report["errors"]] == [3]
+
+    listing = client.get("/api/users", headers=admin_headers, params={"pageSize": 100})
+    assert "prueba.seca@municipalidad.gob.cl" not in {user["email"] for user in listing.json()["results"]}
+
+
+def test_import_creates_users_and_reports_rejected_rows(client, admin_headers):
+    csv_text = CSV_HEADER + (
+        "nueva.jefa@municipalidad.gob.cl,secreto1,María,Pérez,+56 9 1111 2222,ADM,manager\n"
+        f"{ADMIN_EMAIL},secreto1,Otra,Persona,,ADM,\n"
+        "sin.departamento@municipalidad.gob.cl,secreto1,Juan,Díaz,,NOEXISTE,\n"
+    )
+    response = _import(client, admin_headers, csv_text)
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["dryRun"] is False
+    assert report["created"] == 1
+    assert report["failed"] == 2
+
+    login = client.post("/api/auth/login", json={"email": "nueva.jefa@municipalidad.gob.cl", "password": "secreto1"})
+    assert login.status_code == 200, login.text
+
+
+def test_import_rejects_file_without_required_columns(client, admin_headers):
+    response = _import(client, admin_headers, "email,password\nx@municipalidad.gob.cl,secreto1\n")
+
+    assert response.status_code == 400
+
+
+def _png(size=(64, 64)) -> bytes:
+    import io
+
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "blue").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _put_avatar(client, headers, content: bytes):
+    return client.put("/api/users/me/avatar", headers=headers, files={"file": ("avatar.png", content, "image/png")})
+
+
+def test_avatar_upload_accepts_valid_image(client, admin_headers):
+    response = _put_avatar(client, admin_headers, _png())
+
+    assert response.status_code == 200, response.text
+    assert response.json()["avatar"]
+
+
+def test_avatar_upload_rejects_truncated_image(client, admin_headers):
+    import io
+    import os
+
+    from PIL import Image
+
+    # JPEG con encabezado válido (Image.open funciona) y datos de píxeles incompletos
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (256, 256), os.urandom(256 * 256 * 3)).save(buffer, format="JPEG")
+    content = buffer.getvalue()
+    response = _put_avatar(client, admin_headers, content[:len(content) // 2])
+
+    assert response.status_code == 400
+
+
+def test_avatar_upload_rejects_decompression_bomb(client, admin_headers, monkeypatch):
+    from PIL import Image
+
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+    response = _put_avatar(client, admin_headers, _png((100, 100)))
+
+    assert response.status_code == 400
+
+
+def test_avatar_decode_errors_while_resizing_are_rejected(client, admin_headers, monkeypatch):
+    from PIL import Image
+
+    def truncated(self, *args, **kwargs):
+        raise OSError("image file is truncated")
+
+    # Según la versión de Pillow los píxeles se decodifican recién al reducir
+    monkeypatch.setattr(Image.Image, "thumbnail", truncated)
+    response = _put_avatar(client, admin_headers, _png())
+
+    assert response.status_code == 400